@@ -1 +1,27 @@
-__version__ = '1.1.6'
\ No newline at end of file
+from importlib import import_module
+
+__version__ = '1.1.6'
+
+# Public names and their modules. Modules are imported on the first access to a name, so "import slric" does not
+# load NetworkX, NumPy or solvers until a function or class is used
+_exports = {
+    'lric': '.slric', 'lric_sweep': '.slric', 'lric_disk': '.slric', 'sric': '.slric', 'sric_disk': '.slric',
+    'graphsim': '.slric', 'graphsim_batch': '.slric', 'interdependence': '.slric', 'lric_async': '.slric',
+    'sric_async': '.slric', 'JobResult': '.methods.jobs', 'JobCancelled': '.methods.jobs',
+    'GraphQW': '.classes.GraphQW', 'CompactGraphQW': '.classes.CompactGraphQW',
+    'DiskGraphQW': '.classes.DiskGraphQW', 'InfluenceSession': '.classes.InfluenceSession',
+    'InfluenceCache': '.methods.cache', 'GraphCache': '.methods.cache', 'SampledLRIC': '.methods.lric',
+    'Profiler': '.methods.profiler', 'get_solver': '.methods.solvers',
+}
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError('module "%s" has no attribute "%s"' % (__name__, name))
+    value = getattr(import_module(_exports[name], __name__), name)
+    globals()[name] = value  # next accesses do not call __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
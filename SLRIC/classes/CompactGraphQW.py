@@ -0,0 +1,180 @@
+import numpy as np
+from .GraphQW import GraphQW, nx
+from ..methods.sparse_paths import CSR, graph_to_csr
+from ..methods import writers
+
+
+# Class "CompactGraphQW" is a graph with individual attributes stored in arrays (nodes are integer ids 0..n-1)
+class CompactGraphQW:
+    def __init__(self, g=None, q=None, dq=None, limcoal=None, dw=None, dtype='d'):
+        """
+        :param g: (Graph/DiGraph), input graph (NetworkX package)
+        :param q: quota (share of weighted in-degree)
+        :param dq: predefined fixed threshold value for each node
+        :param limcoal: maximal group size
+        :param dw: nodes size
+        :param dtype: type of edge weights (float64 or float32)
+        """
+        self.names = []  # node names (node id is a position in the list)
+        self.csr = CSR(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=dtype))
+        self._csc = None
+        self._index = None
+        self.attr = dict()  # node attributes (columns), missing values are NaN
+        self.coal = limcoal
+        if g is not None:
+            if not nx.is_directed(g):
+                g = nx.DiGraph(g)
+            m, self.names = graph_to_csr(g)
+            self.csr = CSR(m.indptr, m.indices, m.data.astype(dtype))
+            self.attr['indeg'] = self.in_degree()
+            self.set_quota(q, dq)
+            self.set_size(dw)
+
+    # Create graph with the same nodes and attributes and new edges
+    def with_edges(self, m):
+        """
+        :param m: CSR matrix
+        :return: CompactGraphQW
+        """
+        res = CompactGraphQW(dtype=self.csr.data.dtype)
+        res.names, res._index, res.coal = self.names, self._index, self.coal
+        res.attr = dict(self.attr)
+        res.csr = CSR(m.indptr, m.indices, m.data.astype(self.csr.data.dtype))
+        return res
+
+    # Create graph from list of edges (sources, targets, weights)
+    def from_edges(self, rows, cols, vals):
+        n = len(self)
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(rows, minlength=n))
+        return self.with_edges(CSR(indptr, cols[order], np.asarray(vals, dtype='d')[order]))
+
+    def __len__(self):
+        return len(self.names)
+
+    def number_of_edges(self):
+        return len(self.csr.indices)
+
+    def nodes(self):
+        return self.names
+
+    def is_directed(self):
+        return True
+
+    def index(self, node):
+        if self._index is None:
+            self._index = dict(zip(self.names, range(len(self.names))))
+        return self._index.get(node)
+
+    # Incoming edges stored by targets (CSC arrays), created once when needed
+    @property
+    def csc(self):
+        if self._csc is None:
+            rows = self.rows()
+            order = np.argsort(self.csr.indices, kind='stable')
+            indptr = np.zeros(len(self) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum(np.bincount(self.csr.indices, minlength=len(self)))
+            self._csc = CSR(indptr, rows[order], self.csr.data[order])
+        return self._csc
+
+    def rows(self):
+        return np.repeat(np.arange(len(self)), np.diff(self.csr.indptr))
+
+    def in_degree(self):
+        return np.bincount(self.csr.indices, weights=self.csr.data, minlength=len(self))
+
+    def out_degree(self):
+        return np.bincount(self.rows(), weights=self.csr.data, minlength=len(self))
+
+    # Incoming edges of node (in the format of NetworkX in_edges)
+    def in_links(self, node):
+        s, e = self.csc.indptr[node], self.csc.indptr[node + 1]
+        return [(src, node, {'weight': w}) for src, w in zip(self.csc.indices[s:e].tolist(),
+                                                             self.csc.data[s:e].tolist())]
+
+    # Graph of node and its incoming neighbors (GraphQW with integer nodes)
+    def neighborhood(self, node):
+        g = GraphQW()
+        nodes = set(self.csc.indices[self.csc.indptr[node]:self.csc.indptr[node + 1]].tolist()) | {node}
+        for src in self.csc.indices[self.csc.indptr[node]:self.csc.indptr[node + 1]].tolist():
+            s, e = self.csr.indptr[src], self.csr.indptr[src + 1]
+            for dst, w in zip(self.csr.indices[s:e].tolist(), self.csr.data[s:e].tolist()):
+                if dst in nodes:
+                    g.add_edge(src, dst, weight=w)
+        g.add_node(node, **self.node_attr(node))
+        return g
+
+    def node_attr(self, node):
+        return dict((name, col[node].item()) for name, col in self.attr.items() if not np.isnan(col[node]))
+
+    def set_size(self, dw):
+        if dw is None:
+            self.attr['size'] = self.out_degree()
+        else:
+            self.set_param('size', dw)
+
+    def set_quota(self, q, dq):
+        if dq is None:
+            self.attr['q'] = self.attr['indeg'] * q / 100
+        else:
+            self.set_param('q', dq)
+
+    def set_param(self, name, data):
+        if data is not None:
+            col = self.attr[name].copy() if name in self.attr else np.full(len(self), np.nan)
+            if isinstance(data, dict):
+                for node in data:
+                    if self.index(node) is not None:
+                        col[self.index(node)] = data[node]
+            elif isinstance(data, list):
+                if len(self) == len(data):
+                    col = np.array(data, dtype='d')
+            elif isinstance(data, float) or isinstance(data, int):
+                col = np.full(len(self), data, dtype='d')
+            self.attr[name] = col
+
+    def aggregate(self, name=''):
+        rows = self.rows()
+        mask = rows != self.csr.indices
+        pers = np.bincount(rows[mask], weights=self.attr['size'][self.csr.indices[mask]] * self.csr.data[mask],
+                           minlength=len(self))
+        s = pers.sum()
+        if s != 0:
+            pers /= s
+        pers = dict(zip(self.names, pers.tolist()))
+        self.set_param(name, pers)
+        return pers
+
+    def write_centrality(self, filename, separator=';', mode='a+', additional_attr=[], additional_headers=[],
+                         format=None):
+        """
+        Write SRIC/LRIC centrality to file (see GraphQW.write_centrality)
+        """
+        format = writers.get_format(filename, format)
+        names = [name for name in self.attr if name not in ['indeg', 'q', 'size']]
+        if format in ['csv', 'csv.gz']:
+            GraphQW.write(((node, self.node_attr(i)) for i, node in enumerate(self.names)), filename, separator, mode,
+                          1, additional_attr, additional_headers, compress=format == 'csv.gz')
+        else:
+            writers.write_columns(filename, self.names, dict((name, self.attr[name]) for name in names), format)
+
+    def write_edgelist(self, filename, separator=';', mode='a+', additional_attr=[], additional_headers=[],
+                       format=None, chunk_size=None):
+        """
+        Write edges to file by chunks (see GraphQW.write_edgelist)
+        """
+        with writers.edge_writer(filename, self.names, format, chunk_size, separator, mode,
+                                 additional_attr=additional_attr, additional_headers=additional_headers) as writer:
+            writer.write_block(self.rows(), self.csr.indices, self.csr.data)
+
+    # Convert to GraphQW (NetworkX)
+    def to_networkx(self):
+        g = GraphQW()
+        g.coal = self.coal
+        for i, node in enumerate(self.names):
+            g.add_node(node, **self.node_attr(i))
+        g.add_edges_from((self.names[i], self.names[j], {'weight': w}) for i, j, w in
+                         zip(self.rows().tolist(), self.csr.indices.tolist(), self.csr.data.tolist()))
+        return g
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+from .GraphQW import GraphQW
+from .CompactGraphQW import CompactGraphQW
+from ..methods import out_of_core as ooc
+
+
+# Class "DiskGraphQW" is a graph with edges in memory-mapped arrays on disk (nodes are integer ids 0..n-1).
+# Incoming edges are sorted by targets and split into partitions which fit into the memory budget
+class DiskGraphQW(CompactGraphQW):
+    def __init__(self, filename=None, q=None, dq=None, limcoal=None, dw=None, workdir=None, memory=2 ** 28,
+                 format=None, separator=';', edge_name='weight'):
+        """
+        :param filename: edge list (csv, csv.gz, npz, npy or parquet, see GraphQW.write_edgelist)
+        :param q: quota (share of weighted in-degree)
+        :param dq: predefined fixed threshold value for each node
+        :param limcoal: maximal group size
+        :param dw: nodes size
+        :param workdir: directory of memory-mapped arrays (by default a temporary directory removed by close())
+        :param memory: memory budget in bytes (size of partitions and of blocks of path composition)
+        :param format: file format (by default it is defined by file extension)
+        :param separator: column separator (text formats)
+        :param edge_name: edge attribute name (text formats)
+        """
+        super().__init__(limcoal=limcoal)
+        self.memory = memory
+        self.temporary = workdir is None
+        self.workdir = tempfile.mkdtemp() if workdir is None else workdir
+        self.partitions = []  # ranges of targets (first, last + 1) with incoming edges which fit into memory
+        self._degrees = None
+        if filename is not None:
+            try:
+                rec, self.names = ooc.read_records(filename, self.workdir, format, separator, edge_name, memory)
+                self._degrees = ooc.degrees(rec, len(self.names), memory)
+                self._csc, self.partitions = ooc.sort_edges(rec, len(self.names), 'dst', self.workdir, 'csc',
+                                                            memory)
+                self.attr['indeg'] = self.in_degree()
+                self.set_quota(q, dq)
+                self.set_size(dw)
+            except BaseException:
+                self.close()  # temporary directory is removed if the input cannot be read
+                raise
+
+    # Create graph with the same nodes and attributes and new edges (CSR arrays are not loaded into memory)
+    def with_edges(self, m):
+        res = DiskGraphQW(limcoal=self.coal, workdir=self.workdir, memory=self.memory)
+        res.temporary = self.temporary  # graphs share the directory
+        res.names, res._index = self.names, self._index
+        res.attr = dict(self.attr)
+        res.csr = m
+        return res
+
+    def number_of_edges(self):
+        return len(self.csc.indices) if self._csc is not None else len(self.csr.indices)
+
+    def in_degree(self):
+        return self._degrees[0]
+
+    def out_degree(self):
+        return self._degrees[1]
+
+    # Graph of node and its incoming neighbors (edges between neighbors are read from incoming edges)
+    def neighborhood(self, node):
+        g = GraphQW()
+        sources = self.csc.indices[self.csc.indptr[node]:self.csc.indptr[node + 1]].tolist()
+        nodes = set(sources)
+        for dst in [node] + [src for src in dict.fromkeys(sources) if src != node]:
+            s, e = self.csc.indptr[dst], self.csc.indptr[dst + 1]
+            for src, w in zip(self.csc.indices[s:e].tolist(), self.csc.data[s:e].tolist()):
+                if src in nodes:
+                    g.add_edge(src, dst, weight=w)
+        g.add_node(node, **self.node_attr(node))
+        return g
+
+    def aggregate(self, name=''):
+        pers = dict(zip(self.names, ooc.disk_aggregate(self.csr, self.attr['size'], self.memory).tolist()))
+        self.set_param(name, pers)
+        return pers
+
+    # Remove temporary directory with memory-mapped arrays
+    def close(self):
+        self._csc = None
+        if self.temporary and os.path.exists(self.workdir):
+            shutil.rmtree(self.workdir)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
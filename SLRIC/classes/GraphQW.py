@@ -1,5 +1,6 @@
 import networkx as nx
 import networkx.convert as convert
+from ..methods import writers
 
 
 # Class "GraphQW" is a NetworkX graph with generated individual attributes
@@ -78,7 +79,8 @@ class GraphQW(nx.DiGraph):
                 arr[el] /= s
         return arr
 
-    def write_centrality(self, filename, separator=';', mode='a+', additional_attr=[], additional_headers=[]):
+    def write_centrality(self, filename, separator=';', mode='a+', additional_attr=[], additional_headers=[],
+                         format=None):
         """
         Write SRIC/LRIC centrality to file
         :param filename: filename
@@ -86,11 +88,24 @@ class GraphQW(nx.DiGraph):
         :param mode: mode while opening a file. If not provided, it defaults to 'a' (append)
         :param additional_attr: list of additional parameters which will be appended to each line
         :param additional_headers: headers of additional parameters
+        :param format: 'csv', 'csv.gz' (gzip compressed), 'npz' or 'parquet' (one column per centrality).
+                       By default format is defined by file extension
         :return: None
         """
-        self.write(self.nodes(data=True), filename, separator, mode, 1, additional_attr, additional_headers)
+        format = writers.get_format(filename, format)
+        if format in ['csv', 'csv.gz']:
+            self.write(self.nodes(data=True), filename, separator, mode, 1, additional_attr, additional_headers,
+                       compress=format == 'csv.gz')
+        else:
+            nodes = list(self.nodes())
+            names = []
+            for node in nodes:
+                names.extend(attr for attr in self.nodes[node] if attr not in ['indeg', 'q', 'size'] + names)
+            columns = dict((attr, [self.nodes[node].get(attr, float('nan')) for node in nodes]) for attr in names)
+            writers.write_columns(filename, nodes, columns, format)
 
-    def write_edgelist(self, filename, separator=';', mode='a+', additional_attr=[], additional_headers=[]):
+    def write_edgelist(self, filename, separator=';', mode='a+', additional_attr=[], additional_headers=[],
+                       format=None, chunk_size=None, edge_name='weight'):
         """
         Write edges from SRIC/LRIC graph to file
         :param filename: filename
@@ -98,27 +113,39 @@ class GraphQW(nx.DiGraph):
         :param mode: mode while opening a file. If not provided, it defaults to 'a' (append)
         :param additional_attr: list of additional parameters which will be appended to each line
         :param additional_headers: headers of additional parameters
+        :param format: 'csv', 'csv.gz' (gzip compressed), 'npz', 'npy' (memory-mappable records src, dst, weight)
+                       or 'parquet'. By default format is defined by file extension
+        :param chunk_size: maximal number of rows written at once
+        :param edge_name: edge attribute written in binary formats
         :return:
         """
-        self.write(self.edges(data=True), filename, separator, mode, 0, additional_attr, additional_headers)
+        format = writers.get_format(filename, format)
+        if format in ['csv', 'csv.gz']:
+            self.write(self.edges(data=True), filename, separator, mode, 0, additional_attr, additional_headers,
+                       chunk_size or 1000, format == 'csv.gz')
+        else:
+            with writers.edge_writer(filename, list(self.nodes()), format, chunk_size) as writer:
+                writer.write_edges(self.edges(data=edge_name))
 
     @staticmethod
-    def write(row_dict, filename, separator=';', mode='a+', type_header=0, additional_attr=[], additional_headers=[]):
-        f = open(filename, mode)
-        lim = 1000
+    def write(row_dict, filename, separator=';', mode='a+', type_header=0, additional_attr=[], additional_headers=[],
+              lim=1000, compress=False):
         arr = []
         if type_header == 0:
             arr.append(separator.join(additional_headers+['From', 'To', 'Edge Type', 'Value']))
         elif type_header == 1:
             arr.append(separator.join(['Node', 'Centrality', 'Value']))
-        for row in row_dict:
-            for attr in row[-1]:
-                if attr not in ['indeg', 'q', 'size']:
-                    if len(row) == 3:
-                        arr.append(separator.join(additional_attr+[str(row[0]), str(row[1]), attr, str(row[2][attr])]))
-                    else:
-                        arr.append(separator.join(additional_attr+[str(row[0]), attr, str(row[1][attr])]))
-                    if len(arr) > lim:
-                        f.write('\n'.join(arr))
-                        arr = []
-        f.write('\n'.join(arr))
+        with writers.open_text(filename, mode, compress) as f:
+            for row in row_dict:
+                for attr in row[-1]:
+                    if attr not in ['indeg', 'q', 'size']:
+                        if len(row) == 3:
+                            arr.append(separator.join(additional_attr+[str(row[0]), str(row[1]), attr,
+                                                                       str(row[2][attr])]))
+                        else:
+                            arr.append(separator.join(additional_attr+[str(row[0]), attr, str(row[1][attr])]))
+                        if len(arr) > lim:
+                            f.write('\n'.join(arr) + '\n')
+                            arr = []
+            if len(arr) > 0:
+                f.write('\n'.join(arr) + '\n')
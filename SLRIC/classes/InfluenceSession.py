@@ -0,0 +1,210 @@
+from .GraphQW import GraphQW, nx
+from ..methods import direct_influence as di
+from ..methods import indirect_influence as ii
+from ..methods.solvers import get_solver
+
+
+# Class "InfluenceSession" keeps SRIC/LRIC centrality of a graph up to date under edge updates
+class InfluenceSession:
+    criteria = {'max': 2, 'maxmin': 1}  # path strength criterion of LRIC models
+
+    def __init__(self, graph, method='LRIC', q=50, dq=None, group_size=None, size=None, limpath=3, models='max',
+                 solver=None, cache=None, engine='auto'):
+        """
+        :param graph: (Graph/DiGraph), input graph (NetworkX package). The graph is copied
+        :param method: 'LRIC' or 'SRIC'
+        :param q: (float, optional), quota (share of weighted in-degree)
+        :param dq: (float/dict, optional), predefined fixed threshold value for each node
+        :param group_size: (int, optional), maximal group size. By default group_size = number of nodes - 1 (LRIC)
+                                            or 4 (SRIC)
+        :param size: (float/dict, optional), nodes size. By default node size is equal to weighted out-degree
+        :param limpath: (int, optional), maximal length of influence (LRIC)
+        :param models: (str/array, optional), LRIC models which are updated incrementally (max, maxmin)
+        :param solver: (str/Solver, optional), 0-1 solver for LRIC
+        :param cache: (InfluenceCache, optional), cache of LRIC direct influence
+        :param engine: (str, optional), SRIC engine
+        """
+        if isinstance(models, str):
+            models = [models]
+        for model in models:
+            if method == 'LRIC' and model not in self.criteria:
+                raise ValueError('Model "%s" cannot be updated incrementally' % model)
+        self.method, self.q, self.dq, self.size, self.limpath = method, q, dq, size, limpath
+        self.models = models if method == 'LRIC' else ['sric']
+        self.solver, self.cache, self.engine = get_solver(solver), cache, engine
+        self.group_size = group_size
+        if group_size is None:
+            group_size = len(graph) - 1 if method == 'LRIC' else 4
+        self.graph = GraphQW(nx.DiGraph(graph), q, dq, group_size, size)
+        self.direct = di.pairwise_inf(self.graph, method, solver=self.solver, cache=cache, engine=engine)
+        self.indirect, self.raw = dict(), dict()
+        for model in self.models:
+            if model == 'sric':
+                self.indirect[model] = self.direct
+            else:
+                self.indirect[model] = ii.indirect_paths(self.direct, limpath, 0, self.criteria[model])
+            self.raw[model] = dict((node, self.row_value(self.indirect[model], node)) for node in self.graph)
+
+    def add_edges(self, edges):
+        """
+        Add edges (or replace weights of existing edges)
+        :param edges: list of tuples (from, to) or (from, to, weight)
+        """
+        changes = []
+        for edge in edges:
+            w = edge[2] if len(edge) > 2 else 1
+            for node in edge[:2]:
+                if node not in self.graph:
+                    self.add_node(node)
+            self.graph.add_edge(edge[0], edge[1], weight=w)
+            changes.append((edge[0], edge[1]))
+        self.update(changes)
+
+    def remove_edges(self, edges):
+        """
+        :param edges: list of tuples (from, to)
+        """
+        changes = []
+        for edge in edges:
+            if self.graph.has_edge(edge[0], edge[1]):
+                self.graph.remove_edge(edge[0], edge[1])
+                changes.append((edge[0], edge[1]))
+        self.update(changes)
+
+    def update_weights(self, edges):
+        """
+        :param edges: list of tuples (from, to, weight) of existing edges
+        """
+        changes = []
+        for edge in edges:
+            if self.graph.has_edge(edge[0], edge[1]):
+                self.graph[edge[0]][edge[1]]['weight'] = edge[2]
+                changes.append((edge[0], edge[1]))
+        self.update(changes)
+
+    def add_node(self, node):
+        for g in [self.graph, self.direct] + list(self.indirect.values()):
+            g.add_node(node)
+        self.set_attr(node, 'indeg', 0)
+        self.set_attr(node, 'q', self.define_quota(node))
+        self.set_attr(node, 'size', self.define_size(node))
+        for model in self.models:
+            self.raw[model][node] = 0
+        if self.group_size is None and self.method == 'LRIC':
+            self.graph.coal = len(self.graph) - 1
+
+    # Recalculate node attributes, direct influence on affected targets and indirect influence of affected sources
+    def update(self, changes):
+        if len(changes) == 0:
+            return
+        size_delta = dict()
+        for node in set(edge[1] for edge in changes):
+            self.set_attr(node, 'indeg', self.graph.in_degree(node, weight='weight'))
+            self.set_attr(node, 'q', self.define_quota(node))
+        for node in set(edge[0] for edge in changes):
+            v = self.define_size(node)
+            if v != self.graph.nodes[node]['size']:
+                size_delta[node] = v - self.graph.nodes[node]['size']
+                self.set_attr(node, 'size', v)
+
+        targets = set(edge[1] for edge in changes)
+        if self.method == 'SRIC':  # edges between neighbors of a target define SRIC intensities
+            for edge in changes:
+                targets |= set(self.graph.successors(edge[0])) & set(self.graph.successors(edge[1]))
+        changed = []  # direct influence edges which are changed
+        for node in targets:
+            old = dict((edge[0], edge[2]) for edge in self.direct.in_edges(node, data='weight'))
+            new = dict()
+            if di.affected(self.graph, self.graph.nodes[node]):
+                new = di.individual_inf(self.graph, node, self.method, self.solver, self.cache, self.engine)
+            for node2 in set(old) | set(new):
+                if old.get(node2) != new.get(node2):
+                    changed.append((node2, node, old.get(node2, 0), new.get(node2, 0)))
+                    if node2 in new:
+                        self.direct.add_edge(node2, node, weight=new[node2])
+                    else:
+                        self.direct.remove_edge(node2, node)
+
+        for model in self.models:
+            if model == 'sric':
+                self.update_direct(model, changed, size_delta)
+            else:
+                self.update_paths(model, changed, size_delta)
+
+    # Recalculate aggregated influence of sources of changed edges and of nodes adjacent to resized targets (SRIC)
+    def update_direct(self, model, changed, size_delta):
+        raw, g = self.raw[model], self.direct
+        sources = set(edge[0] for edge in changed)
+        for node in size_delta:
+            sources.update(g.predecessors(node))
+        for node in sources:  # totals are recalculated (accumulated deltas would leave rounding errors)
+            raw[node] = self.row_value(g, node)
+
+    # Recalculate paths from sources within limpath hops of changed edges (LRIC)
+    def update_paths(self, model, changed, size_delta):
+        raw, g = self.raw[model], self.indirect[model]
+        sources = set(edge[0] for edge in changed)
+        frontier = set(sources)
+        for _ in range(self.limpath - 1):  # nodes which reach changed edges
+            frontier = set(node2 for node in frontier for node2 in self.direct.predecessors(node)) - sources
+            sources |= frontier
+        resized = set(node2 for node in size_delta if node in g for node2 in g.predecessors(node)) - sources
+        for node in resized:  # paths are the same, sizes of targets are changed
+            raw[node] = self.row_value(g, node)
+        for node in sources:
+            g.remove_edges_from(list(g.out_edges(node)))
+            row = bounded_paths(self.direct, node, self.limpath, self.criteria[model])
+            g.add_edges_from((node, node2, {'weight': w}) for node2, w in row.items())
+            raw[node] = self.row_value(g, node)
+
+    def row_value(self, g, node):
+        return sum(self.graph.nodes[node2]['size'] * attr['weight'] for node2, attr in g.adj[node].items()
+                   if node2 != node)
+
+    def define_quota(self, node):
+        if self.dq is None:
+            return self.graph.nodes[node]['indeg'] * self.q / 100
+        elif isinstance(self.dq, dict):
+            return self.dq.get(node)
+        return self.dq
+
+    def define_size(self, node):
+        if self.size is None:
+            return self.graph.out_degree(node, weight='weight')
+        elif isinstance(self.size, dict):
+            return self.size.get(node, self.graph.nodes[node].get('size', 0))
+        return self.size
+
+    def set_attr(self, node, name, value):
+        for g in [self.graph, self.direct] + list(self.indirect.values()):
+            if value is None:
+                g.nodes[node].pop(name, None)
+            else:
+                g.nodes[node][name] = value
+
+    def ranking(self, model=None):
+        """
+        :param model: LRIC model (by default the last model) or 'sric'
+        :return: nodes centrality (dictionary)
+        """
+        if model is None:
+            model = self.models[-1]
+        return GraphQW.normalize(dict(self.raw[model]))
+
+
+# Find strongest paths of length <= path_lim from 'node' [criterion: 1 (min), 2 (multiplication)]
+def bounded_paths(g, node, path_lim, criterion):
+    level = dict((node2, attr['weight']) for node2, attr in g.adj[node].items())  # paths of length 1
+    best = dict(level)
+    for _ in range(path_lim - 1):
+        nxt = dict()
+        for node2, w in level.items():
+            for node3, attr in g.adj[node2].items():
+                v = ii.define_weight(w, attr['weight'], criterion)
+                if v > nxt.get(node3, 0):
+                    nxt[node3] = v
+        for node3, v in nxt.items():
+            if v > best.get(node3, 0):
+                best[node3] = v
+        level = nxt
+    return best
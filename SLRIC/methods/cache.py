@@ -0,0 +1,152 @@
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+
+# LRU cache of direct influence for canonical neighborhoods (sorted weights, quota, group size)
+class InfluenceCache:
+    def __init__(self, maxsize=100000):
+        """
+        :param maxsize: maximal number of stored influence vectors
+        """
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(weights, quota, group_size):
+        """
+        :param weights: weights of incoming edges sorted in increasing order
+        :param quota: threshold of influence
+        :param group_size: maximal group size
+        :return: canonical key
+        """
+        return tuple(weights), quota, min(group_size, len(weights))
+
+    def get(self, key):
+        if key in self.data:
+            self.hits += 1
+            self.data.move_to_end(key)
+            return self.data[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)  # remove least recently used element
+
+    def clear(self):
+        self.data.clear()
+        self.hits, self.misses = 0, 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.data)}
+
+    def merge(self, stats):
+        self.hits += stats['hits']
+        self.misses += stats['misses']
+
+    def __len__(self):
+        return len(self.data)
+
+
+# Content-addressed cache of direct influence graphs on disk. A graph is stored as arrays of edges (sources, targets
+# and weights, nodes are canonical positions, see direct_influence.graph_key) in a .npz file named by the hash of the
+# input graph, quotas, group size, method and LRIC solver. Later calls and other processes with the same input load
+# the file instead of recalculating the graph. Least recently used files are removed if the total size exceeds maxsize
+class GraphCache:
+    def __init__(self, directory, maxsize=2 ** 30):
+        """
+        :param directory: cache directory (created if it does not exist, can be shared by several processes)
+        :param maxsize: maximal total size of stored graphs in bytes
+        """
+        self.directory = directory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        """
+        :param parts: arrays, strings and numbers which define the graph
+        :return: hexadecimal SHA-256 digest
+        """
+        h = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                h.update(repr((part.dtype.str, part.shape)).encode())
+                h.update(np.ascontiguousarray(part).tobytes())
+            else:
+                h.update(repr(part).encode())
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def filename(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key):
+        """
+        :param key: key of the graph
+        :return: arrays of sources, targets and weights of edges or None
+        """
+        filename = self.filename(key)
+        try:
+            with np.load(filename) as f:
+                edges = f['src'], f['dst'], f['weight']
+            os.utime(filename)  # modification time is the time of the last access
+        except (OSError, KeyError, ValueError):  # file is absent, removed by another process or incomplete
+            self.misses += 1
+            return None
+        self.hits += 1
+        return edges
+
+    def put(self, key, src, dst, weight):
+        src, dst = np.asarray(src), np.asarray(dst)
+        dtype = np.int32 if max(src.max(initial=0), dst.max(initial=0)) < 2 ** 31 else np.int64
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, src=np.asarray(src, dtype=dtype), dst=np.asarray(dst, dtype=dtype),
+                     weight=np.asarray(weight, dtype='d'))
+        os.replace(tmp, self.filename(key))  # readers never see a partially written file
+        self.evict()
+
+    # Remove least recently used files until the total size is at most maxsize
+    def evict(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(file[1] for file in files)
+        for _, size, path in sorted(files):
+            if total <= self.maxsize:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def size(self):
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith('.npz'))
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                os.remove(entry.path)
+        self.hits, self.misses = 0, 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': self.size()}
+
+    def __len__(self):
+        return sum(1 for entry in os.scandir(self.directory) if entry.name.endswith('.npz'))
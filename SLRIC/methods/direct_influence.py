@@ -1,29 +1,277 @@
-from math import ceil, isclose
+from bisect import bisect_left
+from math import ceil, comb, floor, isclose
 import numpy as np
-from classes.GraphQW import GraphQW
-from methods.sric import define_sric, generate_sric_matrix
-from methods.lric import find_lp
+from ..classes.GraphQW import GraphQW
+from ..classes.CompactGraphQW import CompactGraphQW
+from .sric import define_sric, count_sric, generate_sric_matrix
+from .lric import find_lp, sample_lp
+from .solvers import branch_and_bound, get_solver
+from .profiler import get_profiler
 
 
 # Calculation of SRIC and LRIC direct influence
-def pairwise_inf(g, method):
+def pairwise_inf(g, method, workers=None, chunk_size=None, solver=None, cache=None, engine='auto', profiler=None,
+                 approx=None, graph_cache=None):
+    """
+    :param g: (GraphQW) input graph with quotas and sizes
+    :param method: 'LRIC' or 'SRIC'
+    :param workers: (int, optional) number of worker processes. If None or 1, nodes are evaluated serially
+    :param chunk_size: (int, optional) number of target nodes sent to a worker at once.
+                                       By default nodes are split into 4 batches per worker
+    :param solver: (str/Solver, optional) 0-1 solver for LRIC: 'native' (default), 'glpk' or Solver instance.
+                                          Number of solver calls and time spent in them are stored in the solver
+    :param cache: (InfluenceCache, optional) cache of LRIC influence shared by nodes with the same neighborhood.
+                                             Worker processes use their own copies of the cache
+    :param engine: (str, optional) SRIC engine: 'enumerate' (all groups), 'count' (counting of groups)
+                                   or 'auto' (the cheapest one for each node)
+    :param profiler: (Profiler, optional) number of targets, solver calls and SRIC groups are counted
+    :param approx: (SampledLRIC, optional) LRIC on nodes with more than approx.min_degree incoming links is estimated
+                                           by sampled groups, confidence bounds are stored in approx.bounds
+    :param graph_cache: (GraphCache, optional) on-disk cache of direct influence graphs. The graph is loaded if a graph
+                                               with the same nodes, edges, quotas and group size was evaluated by the
+                                               same method and solver (the cache is not used with approx)
+    :return: (GraphQW/CompactGraphQW) direct influence graph
+    """
+    profiler = get_profiler(profiler)
+    solver = get_solver(solver)
+    if graph_cache is not None and approx is None:
+        key, order = graph_key(g, method, graph_cache, solver)
+        edges = graph_cache.get(key)
+        if edges is not None:  # edges are stored as canonical positions of nodes
+            if profiler:
+                profiler.count('graph_cache_hits', 1)
+            return direct_graph(g, order[edges[0]], order[edges[1]], edges[2])
+    if isinstance(g, CompactGraphQW):
+        q = g.attr['q']
+        targets = np.flatnonzero((g.attr['indeg'] >= q) & (q > 0)).tolist() if g.coal > 0 else []
+    else:
+        targets = [node[0] for node in g.nodes(data=True) if affected(g, node[1])]
+    counters = dict() if profiler else None
+    calls, time = solver.calls, solver.time
+    approximated = len(approx.bounds) if approx is not None else 0
+    if workers is None or workers <= 1 or len(targets) < 2:
+        results = []
+        for node in targets:
+            results.append(individual_inf(g, node, method, solver, cache, engine, counters, approx))
+            if not profiler.progress('direct', len(results), len(targets)):
+                break  # remaining nodes are not evaluated
+    else:
+        if chunk_size is None:
+            chunk_size = max(1, ceil(len(targets) / (workers * 4)))
+        batches = [targets[i:i + chunk_size] for i in range(0, len(targets), chunk_size)]
+        from concurrent.futures import ProcessPoolExecutor  # process pool is loaded if workers are used
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(g, solver, cache, engine, counters is not None, approx)) as executor:
+            try:
+                for batch, stats in executor.map(_batch_inf, batches, [method] * len(batches)):
+                    results.extend(batch)  # results are collected in the order of nodes
+                    solver.merge(stats[0])
+                    if cache is not None:
+                        cache.merge(stats[1])
+                    if counters is not None:
+                        for key in stats[2]:
+                            counters[key] = counters.get(key, 0) + stats[2][key]
+                    if approx is not None:
+                        approx.merge(stats[3])
+                    if not profiler.progress('direct', len(results), len(targets)):
+                        break
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)  # batches are not evaluated if calculation stops
+    rows, cols, vals = [], [], []
+    for node, inf_list in zip(targets, results):
+        for node2 in inf_list:  # add results
+            rows.append(node2)
+            cols.append(node)
+            vals.append(inf_list[node2])
+    dirgraph = direct_graph(g, rows, cols, vals, names=True)
+    if graph_cache is not None and approx is None and len(results) == len(targets):  # partial graphs are not stored
+        if not isinstance(g, CompactGraphQW):  # nodes are stored as canonical positions
+            index = dict(zip(g.nodes(), range(len(g))))
+            rows, cols = [index[node] for node in rows], [index[node] for node in cols]
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        graph_cache.put(key, rank[np.asarray(rows, dtype=np.int64)], rank[np.asarray(cols, dtype=np.int64)], vals)
+    if profiler:
+        profiler.count('targets', len(targets))
+        if approx is not None:
+            profiler.count('approx_targets', len(approx.bounds) - approximated)
+        if method == 'LRIC':
+            profiler.count('ilp_solves', solver.calls - calls)
+            profiler.count('solver_time', solver.time - time)
+        profiler.merge(counters)
+    return dirgraph
+
+
+# Create direct influence graph with nodes of g and edges (sources, targets, weights). If names is False, nodes of
+# edges are positions of nodes in g
+def direct_graph(g, rows, cols, vals, names=False):
+    if isinstance(g, CompactGraphQW):
+        return g.from_edges(rows, cols, vals)
+    if not names:
+        nodes = list(g.nodes())
+        rows, cols, vals = [nodes[i] for i in rows.tolist()], [nodes[i] for i in cols.tolist()], vals.tolist()
     dirgraph = GraphQW()
-    nodes_list = g.nodes(data=True)
-    dirgraph.add_nodes_from(nodes_list)  # copy list of nodes
-    for node in nodes_list:
-        if 'q' in node[1] and node[1]['indeg'] >= node[1]['q'] > 0 and g.coal > 0:  # node can be affected, quota is non-zero
-            inf_list = []
-            if method == 'LRIC':  # evaluate LRIC influence
-                inf_list = individual_lric(g.in_edges(node[0], data=True), node[1]['q'], g.coal)
-            elif method == 'SRIC':  # evaluate SRIC influence
-                inf_list = individual_sric(g, node[0], node[1]['q'], g.coal)
-            for node2 in inf_list:  # add results
-                dirgraph.add_edge(node2, node[0], weight=inf_list[node2])
+    dirgraph.add_nodes_from(g.nodes(data=True))  # copy list of nodes
+    for node2, node, weight in zip(rows, cols, vals):
+        dirgraph.add_edge(node2, node, weight=weight)
     return dirgraph
 
 
+# Key of direct influence graph in GraphCache. Nodes are sorted by their labels (repr) and edges by canonical
+# positions of their ends, so the key does not depend on the order of nodes and edges or on the graph class. LRIC keys
+# include the class of the solver, since solvers may choose different pivotal groups of equal weight
+def graph_key(g, method, graph_cache, solver=None):
+    """
+    :param g: (GraphQW/CompactGraphQW) input graph with quotas
+    :param method: 'LRIC' or 'SRIC'
+    :param graph_cache: (GraphCache) cache which defines the hash
+    :param solver: (Solver, optional) 0-1 solver for LRIC (not used by SRIC)
+    :return: key, positions of nodes of g in canonical order
+    """
+    names = list(g.nodes())
+    order = np.array(sorted(range(len(names)), key=lambda i: repr(names[i])), dtype=np.int64)
+    rank = np.empty(len(names), dtype=np.int64)  # canonical position of each node
+    rank[order] = np.arange(len(names))
+    if isinstance(g, CompactGraphQW):
+        src, dst, w = g.rows(), g.csr.indices, g.csr.data
+        q = np.asarray(g.attr['q'], dtype='d')
+    else:
+        index = dict(zip(names, range(len(names))))
+        edges = list(g.edges(data='weight'))
+        src = np.array([index[edge[0]] for edge in edges], dtype=np.int64)
+        dst = np.array([index[edge[1]] for edge in edges], dtype=np.int64)
+        w = np.array([edge[2] for edge in edges], dtype='d')
+        q = np.array([g.nodes[node]['q'] for node in names], dtype='d')
+    src, dst = rank[src], rank[dst]
+    edge_order = np.lexsort((dst, src))
+    solver = type(solver).__name__ if method == 'LRIC' and solver is not None else None
+    return graph_cache.key(method, solver, g.coal, [names[i] for i in order.tolist()], src[edge_order], dst[edge_order],
+                           np.asarray(w, dtype='d')[edge_order], q[order]), order
+
+
+# LRIC direct influence for a sequence of quotas. Neighbors of each node are sorted once and influence on a node is
+# reused if it cannot change between consecutive quotas
+def sweep_inf(g, quotas, solver=None, cache=None, skip=True, profiler=None):
+    """
+    :param g: (GraphQW) input graph with sizes, its quotas are replaced by each element of quotas
+    :param quotas: list of (q, dq) pairs passed to g.set_quota
+    :param solver: (str/Solver, optional) 0-1 solver: 'native' (default), 'glpk' or Solver instance
+    :param cache: (InfluenceCache, optional) cache of LRIC influence shared by nodes with the same neighborhood
+    :param skip: (bool, optional) if True, influence on a node is not evaluated again if no group of at most g.coal
+                                  neighbors has weight between its previous and current quota
+    :param profiler: (Profiler, optional) number of evaluated and reused targets and solver calls are counted
+    :return: generator of direct influence graphs (one per quota)
+    """
+    solver = get_solver(solver)
+    profiler = get_profiler(profiler)
+    links, weights = dict(), dict()
+    for node in g.nodes():  # canonical order of neighbors (ties keep the order of edges)
+        links[node] = sorted(g.in_edges(node, data=True), key=lambda link: link[2]['weight'])
+        weights[node] = [link[2]['weight'] for link in links[node]]
+    prev = dict()  # node: (quota, influence), quota is 0 if node is not affected
+    for q, dq in quotas:
+        for node in g.nodes():  # quotas of the previous element are not kept for nodes missing in dq
+            g.nodes[node].pop('q', None)
+        g.set_quota(q, dq)
+        calls, time, reused = solver.calls, solver.time, 0
+        dirgraph = GraphQW()
+        dirgraph.add_nodes_from(g.nodes(data=True))  # copy list of nodes
+        for node, attr in g.nodes(data=True):
+            quota = attr['q'] if affected(g, attr) else 0
+            if skip and node in prev and (prev[node][0] == quota or (prev[node][0] > 0 and quota > 0 and same_lric(
+                    weights[node], prev[node][0], quota, g.coal))):
+                inf_list = prev[node][1]
+                reused += 1
+            elif quota == 0:
+                inf_list = dict()
+            elif cache is None:
+                inf_list = individual_lric(links[node], quota, g.coal, solver)
+            else:
+                inf_list = cached_lric(links[node], quota, g.coal, cache, solver)
+            prev[node] = (quota, inf_list)
+            for node2 in inf_list:  # add results
+                dirgraph.add_edge(node2, node, weight=inf_list[node2])
+        if profiler:
+            profiler.count('targets', sum(1 for node in prev if prev[node][0] > 0))
+            profiler.count('reused_targets', reused)
+            profiler.count('ilp_solves', solver.calls - calls)
+            profiler.count('solver_time', solver.time - time)
+        yield dirgraph
+
+
+# Check if LRIC influence on a node is the same for quotas q1 and q2 (no group of at most group_size neighbors has
+# weight between the quotas)
+def same_lric(weights, q1, q2, group_size, max_nodes=10 ** 5):
+    """
+    :param weights: weights of incoming links in increasing order
+    :param q1, q2: positive quotas
+    :param group_size: maximal group size
+    :param max_nodes: maximal number of search nodes (False is returned after that)
+    """
+    low, high = min(q1, q2), max(q1, q2)
+    tol = 1e-8 * high  # comparisons of group weights with quotas are made with tolerance of isclose
+    low, high = low - tol, high + tol
+    k = bisect_left(weights, low)  # links weaker than both quotas
+    if k < len(weights) and weights[k] <= high:  # link becomes pivotal by itself
+        return False
+    s = sum(weights[:k])
+    if s < low:  # node is not affected by weak links
+        return True
+    if s <= high:
+        return False
+    if isclose(weights[0], weights[k - 1]):  # equal weights: influence depends on ceil(quota / weight)
+        return floor(high / weights[k - 1]) < ceil(low / weights[k - 1])
+    return branch_and_bound(weights[k - 1::-1], low, high + tol, min(group_size, k), max_nodes) is None
+
+
+# Check if node can be affected (quota is non-zero)
+def affected(g, attr):
+    return 'q' in attr and attr['indeg'] >= attr['q'] > 0 and g.coal > 0
+
+
+# Define SRIC/LRIC influence on 'node'
+def individual_inf(g, node, method, solver=None, cache=None, engine='auto', counters=None, approx=None):
+    inf_list = dict()
+    if isinstance(g, CompactGraphQW):
+        adj_links, q = g.in_links(node), g.attr['q'][node].item()
+    else:
+        adj_links, q = g.in_edges(node, data=True), g.nodes[node]['q']
+    if method == 'LRIC':  # evaluate LRIC influence
+        if approx is not None and approx.applies(len(adj_links)):
+            inf_list, approx.bounds[node] = approx_lric(adj_links, q, g.coal, approx)
+        elif cache is None:
+            inf_list = individual_lric(adj_links, q, g.coal, solver)
+        else:
+            inf_list = cached_lric(adj_links, q, g.coal, cache, solver)
+    elif method == 'SRIC':  # evaluate SRIC influence
+        inf_list = individual_sric(g.neighborhood(node) if isinstance(g, CompactGraphQW) else g, node, q, g.coal,
+                                   engine, counters)
+    return inf_list
+
+
+_worker_state = None  # graph, solver, cache, SRIC engine, counting flag and approximation shared by all batches
+
+
+def _init_worker(g, solver, cache, engine, counting=False, approx=None):
+    global _worker_state
+    _worker_state = (g, solver, cache, engine, counting, approx)
+
+
+def _batch_inf(batch, method):
+    g, solver, cache, engine, counting, approx = _worker_state
+    counters = dict() if counting else None
+    if approx is not None:
+        approx.bounds = dict()  # bounds of the batch are returned
+    before = [solver.stats(), cache.stats() if cache is not None else dict()]
+    res = [individual_inf(g, node, method, solver, cache, engine, counters, approx) for node in batch]
+    after = [solver.stats(), cache.stats() if cache is not None else dict()]
+    return res, [{key: after[i][key] - before[i][key] for key in after[i]} for i in range(2)] + [
+        counters, approx.stats() if approx is not None else dict()]
+
+
 # Define SRIC influence on 'node'
-def individual_sric(g, node, q, group_size):
+def individual_sric(g, node, q, group_size, engine='enumerate', counters=None):
     adj_links = g.in_edges(node, data=True)  # find all incoming edges to 'node'
     inf_list, nodes_id = dict(), dict()  # results of SRIC influence, nodes ID
     nodes_tuple, nodes_names = [], []  # adjacent nodes data (weight, SRIC influence, ID), nodes names
@@ -38,13 +286,16 @@ def individual_sric(g, node, q, group_size):
     if len(nodes_tuple) > 0 and (s >= q or isclose(s, q)):  # list is not empty and affects 'node'
         nodes_names.append(node)
         nodes_tuple = sorted(nodes_tuple)
-        partial_inf = define_sric(np.array(nodes_tuple, dtype='d'),
-                                  q,
-                                  min(group_size, len(nodes_tuple)),
-                                  generate_sric_matrix(g.subgraph(nodes_names),
-                                                       nodes_id, node,
-                                                       g.nodes(data=True)[node]['indeg'])
-                                  )  # calculate SRIC influence
+        n, group_size = len(nodes_tuple), min(group_size, len(nodes_tuple))
+        if engine == 'auto':  # compare number of groups with number of counting queries
+            engine = 'count' if n ** max(group_size - 2, 2) < comb(n, group_size) * group_size ** 2 else 'enumerate'
+        matr = generate_sric_matrix(g.subgraph(nodes_names), nodes_id, node, g.nodes(data=True)[node]['indeg'])
+        if engine == 'count':  # calculate SRIC influence
+            partial_inf = count_sric(np.array(nodes_tuple, dtype='d'), q, group_size, matr)
+            if counters is not None:
+                counters['counted_targets'] = counters.get('counted_targets', 0) + 1
+        else:
+            partial_inf = define_sric(np.array(nodes_tuple, dtype='d'), q, group_size, matr, counters)
         s = sum(partial_inf[:, 1])  # normalize SRIC influence
         for i in range(len(partial_inf)):
             if partial_inf[i, 1] > 0:
@@ -52,8 +303,42 @@ def individual_sric(g, node, q, group_size):
     return inf_list
 
 
+# Define approximate LRIC direct influence on 'node' (the exact method is used if groups are not searched)
+def approx_lric(adj_links, quota, group_size, approx):
+    """
+    :return: influence of neighbors (lower bounds) and maximal width of confidence intervals of their influence
+    """
+    links = sorted(adj_links, key=lambda link: link[2]['weight'])
+    weak = [link for link in links if link[2]['weight'] < quota]
+    w = np.array([link[2]['weight'] for link in weak], dtype='d')
+    s = w.sum()
+    if len(w) == 0 or s <= quota or isclose(s, quota) or isclose(w[0], w[-1]):
+        return individual_lric(adj_links, quota, group_size), 0.0
+    lower, upper = sample_lp(w, quota, group_size - 1, approx.samples, approx.generator(w))
+    inf_list = dict((link[0], 1) for link in links if link[2]['weight'] >= quota)
+    for link, value in zip(weak, lower.tolist()):
+        if value > 0:
+            inf_list[link[0]] = value
+    return inf_list, float((upper - lower).max())
+
+
+# Define LRIC direct influence on 'node' using cache of canonical neighborhoods
+def cached_lric(adj_links, quota, group_size, cache, solver=None):
+    links = sorted(adj_links, key=lambda link: link[2]['weight'])  # canonical order of neighbors
+    key = cache.key([link[2]['weight'] for link in links], quota, group_size)
+    partial_inf = cache.get(key)
+    if partial_inf is None:  # evaluate influence of neighbors by their positions
+        partial_inf = tuple(individual_lric([(i, None, link[2]) for i, link in enumerate(links)],
+                                            quota, group_size, solver).items())
+        cache.put(key, partial_inf)
+    inf_list = dict()
+    for i, value in partial_inf:
+        inf_list[links[i][0]] = value
+    return inf_list
+
+
 # Define LRIC direct influence on 'node'
-def individual_lric(adj_links, quota, group_size):
+def individual_lric(adj_links, quota, group_size, solver=None):
     inf_list = dict()  # results of LRIC influence
     nodes_tuple, nodes_names = [], []  # adjacent nodes (weight, ID1, min influence, quota, status, ID2), nodes names
     s = 0
@@ -88,7 +373,7 @@ def individual_lric(adj_links, quota, group_size):
                 partial_inf = zip([value] * len(nodes_tuple), nodes_tuple[:, 1])
             else:  # nodes weights are different
                 partial_inf = []
-                arr = find_lp(nodes_tuple, len(nodes_tuple) // 2, group_size - 1, dict())  # define LRIC for all nodes
+                arr = find_lp(nodes_tuple, len(nodes_tuple) // 2, group_size - 1, dict(), solver)  # define LRIC for all nodes
                 for elem in arr:
                     if not isclose(elem[4], -2):  # check if element is pivotal
                         partial_inf.append((elem[0] / (elem[0] + elem[3]), elem[1]))
@@ -1,9 +1,25 @@
 from math import isclose
-from classes.GraphQW import GraphQW, nx
+import operator
+import numpy as np
+from ..classes.GraphQW import GraphQW, nx
+from ..classes.CompactGraphQW import CompactGraphQW
+from . import sparse_paths as sp
+from .profiler import get_profiler
 
 
 # Calculate indirect influence by random walks (Personalized PageRank)
-def indirect_pagerank(g):
+def indirect_pagerank(g, batched=False, tol=1e-6, block_size=256, profiler=None):
+    """
+    :param g: direct influence graph
+    :param batched: if True, PageRank for all sources is computed by power iterations over blocks of sources
+    :param tol: convergence tolerance (batched mode)
+    :param block_size: number of sources processed at once (batched mode)
+    :param profiler: (Profiler, optional), PageRank runs (or iterations in batched mode) are counted
+    :return: graph of indirect influence
+    """
+    profiler = get_profiler(profiler)
+    if batched:
+        return batched_pagerank(g, tol, block_size, profiler=profiler)
     g_lric = GraphQW()  # Create Graph that stores information about indirect influence
     g_lric.add_nodes_from(g.nodes(data=True))  # Copy all nodes from initial graph
     nodes_degree = g.out_degree(weight='weight')  # Calculate out-degree for each node
@@ -23,6 +39,7 @@ def indirect_pagerank(g):
                             else:
                                 g1.add_edge(node2, node, weight=nodes_num - nodes_degree[node2] - 1)
                     lric_pr = nx.pagerank(g1, personalization=pers)  # calculate PageRank
+                    profiler.count('pagerank_runs')
                     for node2 in lric_pr:  # add results
                         if not isclose(lric_pr[node2], 0) and node != node2:
                             g_lric.add_edge(node, node2, weight=lric_pr[node2])
@@ -30,15 +47,190 @@ def indirect_pagerank(g):
     return g_lric
 
 
+# Calculate Personalized PageRank for all sources of each component at once
+def batched_pagerank(g, tol=1e-6, block_size=256, alpha=0.85, max_iter=100, profiler=None):
+    """
+    Equivalent of indirect_pagerank: edges 'node2 -> source' of weight 'nodes_num - degree - 1' are treated as
+    a rank-one correction of the transition matrix instead of being added to the graph
+    :param g: direct influence graph
+    :param tol: convergence tolerance (as in nx.pagerank)
+    :param block_size: number of personalization vectors iterated at once
+    :param alpha: damping parameter
+    :param max_iter: maximal number of iterations
+    :param profiler: (Profiler, optional), power iterations are counted
+    :return: graph of indirect influence
+    """
+    profiler = get_profiler(profiler)
+    g_lric = GraphQW()  # Create Graph that stores information about indirect influence
+    g_lric.add_nodes_from(g.nodes(data=True))  # Copy all nodes from initial graph
+    nodes_degree = g.out_degree(weight='weight')  # Calculate out-degree for each node
+    nodes_num = len(nodes_degree)  # Total number of nodes
+    for comp in nx.weakly_connected_components(g):  # consider each component individually
+        if len(comp) > 1:  # check if component contains more than 1 element
+            m, nodes = sp.graph_to_csr(g, list(comp))
+            n = len(nodes)
+            degree = np.array([nodes_degree[node] for node in nodes], dtype='d')
+            rows = np.repeat(np.arange(n), np.diff(m.indptr))
+            extra = nodes_num - degree - 1  # weight of synthetic edge 'node2 -> source'
+            row_sum = np.bincount(rows, weights=m.data, minlength=n) + extra
+            dangling = row_sum <= 0
+            row_sum[dangling] = 1
+            corr = np.where(dangling, 1, extra / row_sum)  # rank-one correction (probability to jump to source)
+            order = np.argsort(m.indices, kind='stable')  # in-edges grouped by target
+            src, dst = rows[order], m.indices[order]
+            w = m.data[order] / row_sum[src]
+            first = np.flatnonzero(np.concatenate(([True], dst[1:] != dst[:-1])))
+            sources = [i for i in range(n) if nodes_degree[nodes[i]] > 0]
+            for k in range(0, len(sources), block_size):
+                block = np.array(sources[k:k + block_size])
+                x = pagerank_block(block, n, src, dst[first], first, w, corr, alpha, tol, max_iter, profiler)
+                for i, node in enumerate(block):
+                    for j in np.flatnonzero(x[i]):  # add results
+                        if j != node:
+                            g_lric.add_edge(nodes[node], nodes[j], weight=x[i, j])
+    return g_lric
+
+
+# Power iteration for a block of personalization vectors (sources)
+def pagerank_block(sources, n, src, targets, first, w, corr, alpha, tol, max_iter, profiler=None):
+    x = np.full((len(sources), n), 1.0 / n)
+    active = np.arange(len(sources))  # sources that have not converged
+    for it in range(max_iter):
+        x_last = x[active]
+        x_new = np.zeros_like(x_last)
+        if len(first) > 0:
+            x_new[:, targets] = np.add.reduceat(x_last[:, src] * w, first, axis=1)
+        x_new *= alpha
+        x_new[np.arange(len(active)), sources[active]] += alpha * (x_last @ corr) + (1 - alpha)
+        err = np.absolute(x_new - x_last).sum(axis=1)
+        x[active] = x_new
+        active = active[err >= n * tol]
+        if len(active) == 0:
+            if profiler:
+                profiler.count('pagerank_iterations', it + 1)
+            return x
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+
 # Find all paths of length <= path_lim (fast multiplication implementation)
-def indirect_paths(g, path_lim, aggregation, criterion):
-    if path_lim == 1:  # path length is 1
+def indirect_paths(g, path_lim, aggregation, criterion, backend='networkx', matrix=False, block_size=2 ** 22,
+                   writer=None, pruning=None, profiler=None, workers=None):
+    """
+    :param g: direct influence graph
+    :param path_lim: maximal path length
+    :param aggregation: 0 (maxPath), 1 (sumPaths)
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication) or list of criteria. For a list, paths of all criteria
+                      are composed in one traversal and a list of graphs (one per criterion) is returned
+    :param backend: 'networkx' (graph traversal) or 'sparse' (semiring products over CSR arrays).
+                    CompactGraphQW is always processed by the sparse backend
+    :param matrix: if True, CSR matrix and list of nodes are returned instead of a graph (sparse backend).
+                   For a list of criteria, CSR values have a column per criterion
+    :param block_size: maximal number of intermediate path values kept in memory (sparse backend)
+    :param writer: (EdgeWriter, optional), if defined, edges of the last composition are written by blocks as soon
+                   as they are computed and are not kept in memory (sparse backend, None is returned)
+    :param pruning: (Pruning, optional), weak paths are dropped after each composition step
+    :param profiler: (Profiler, optional), number of edges created by each composition step is recorded
+    :param workers: (int, optional), number of worker processes which compute row blocks of each composition step
+                    (sparse backend). Operands are passed to workers through shared memory
+    :return: graph of indirect influence
+    """
+    profiler = get_profiler(profiler)
+    multiple = not np.isscalar(criterion)
+    if multiple and (pruning is not None or writer is not None):
+        raise ValueError('Several criteria cannot be evaluated with pruning or writer')
+    if writer is not None or isinstance(g, CompactGraphQW) or backend == 'sparse' or matrix:
+        if isinstance(g, CompactGraphQW):
+            m, nodes = g.csr, g.names
+        else:
+            m, nodes = sp.graph_to_csr(g, None if writer is None else writer.nodes)
+        if multiple:  # column of values for each criterion
+            m = sp.CSR(m.indptr, m.indices, np.repeat(m.data[:, None].astype('d'), len(criterion), axis=1))
+        if pruning is not None:
+            pruning.size = node_sizes(g, nodes)
+        pool = sp.BlockPool(workers) if workers is not None and workers > 1 and path_lim > 1 else None
+        try:
+            if writer is not None:
+                if writer.nodes is None:
+                    writer.nodes = nodes
+                return sp.semiring_paths(m, path_lim, aggregation, criterion, block_size, writer.write_block,
+                                         pruning, profiler, pool)
+            m = sp.semiring_paths(m, path_lim, aggregation, criterion, block_size, pruning=pruning,
+                                  profiler=profiler, pool=pool)
+        finally:
+            if pool is not None:
+                pool.close()
+        if matrix:
+            return m, nodes
+        if multiple:
+            columns = [sp.CSR(m.indptr, m.indices, m.data[:, i]) for i in range(len(criterion))]
+            if isinstance(g, CompactGraphQW):
+                return [g.with_edges(column) for column in columns]
+            return [sp.csr_to_graph(column, nodes, g) for column in columns]
+        if isinstance(g, CompactGraphQW):
+            return g.with_edges(m)
+        return sp.csr_to_graph(m, nodes, g)
+    if multiple:
+        return multi_paths([g] * len(criterion), path_lim, aggregation, criterion, profiler)
+    if path_lim == 1 or profiler.stopped:  # path length is 1 (or composition is stopped)
         return g
     else:  # find all paths
         if path_lim % 2 == 0:
-            return indirect_paths(compute_path(g, g, aggregation, criterion), path_lim // 2, aggregation, criterion)
+            res = compute_path(g, g, aggregation, criterion, pruning)
+            if profiler:
+                profiler.record('path_edges_created', res.number_of_edges() - g.number_of_edges())
+                profiler.progress('paths')
+            return indirect_paths(res, path_lim // 2, aggregation, criterion, pruning=pruning, profiler=profiler)
         else:
-            return compute_path(indirect_paths(g, path_lim - 1, aggregation, criterion), g, aggregation, criterion)
+            g0 = indirect_paths(g, path_lim - 1, aggregation, criterion, pruning=pruning, profiler=profiler)
+            if profiler.stopped:
+                return g0
+            res = compute_path(g0, g, aggregation, criterion, pruning)
+            if profiler:
+                profiler.record('path_edges_created', res.number_of_edges() - g0.number_of_edges())
+                profiler.progress('paths')
+            return res
+
+
+# Find all paths of length <= path_lim for several criteria in one traversal (list of graphs, one per criterion)
+def multi_paths(list_g, path_lim, aggregation, criteria, profiler=None):
+    if path_lim == 1 or (profiler and profiler.stopped):  # path length is 1 (or composition is stopped)
+        return list_g
+    else:  # find all paths
+        if path_lim % 2 == 0:
+            res = compute_paths(list_g, list_g, aggregation, criteria)
+            if profiler:
+                profiler.record('path_edges_created', res[0].number_of_edges() - list_g[0].number_of_edges())
+                profiler.progress('paths')
+            return multi_paths(res, path_lim // 2, aggregation, criteria, profiler)
+        else:
+            list_g0 = multi_paths(list_g, path_lim - 1, aggregation, criteria, profiler)
+            if profiler and profiler.stopped:
+                return list_g0
+            res = compute_paths(list_g0, list_g, aggregation, criteria)
+            if profiler:
+                profiler.record('path_edges_created', res[0].number_of_edges() - list_g0[0].number_of_edges())
+                profiler.progress('paths')
+            return res
+
+
+# Nodes size (by node id) for evaluation of pruned centrality mass
+def node_sizes(g, nodes):
+    if isinstance(g, CompactGraphQW):
+        return np.nan_to_num(g.attr['size'])
+    return np.array([g.nodes[node].get('size', 0) if node in g else 0 for node in nodes], dtype='d')
+
+
+# Drop weak paths from 'node'
+def prune_paths(g, node, pruning):
+    targets = list(g.adj[node])
+    w = np.array([g[node][node2]['weight'] for node2 in targets], dtype='d')
+    mass = np.array([g.nodes[node2].get('size', 0) if node2 != node else 0 for node2 in targets], dtype='d') * w
+    mask = pruning.keep(np.zeros(len(w), dtype=np.int64), w, mass)
+    g.remove_edges_from((node, targets[i]) for i in np.flatnonzero(~mask))
+
+
+# Path strength operators [criterion: 0 (sum), 1 (min), 2 (multiplication)]
+OPERATORS = {0: operator.add, 1: min, 2: operator.mul}
 
 
 # Evaluate path strength [criterion: 0 (sum), 1 (min), 2 (multiplication)]
@@ -65,7 +257,7 @@ def update_weight(g, node1, node2, v, name, criterion=0):
 
 
 # Aggregate paths using g0 and g1 [aggregation: 0 (maxPath), 1 (sumPaths)]
-def compute_path(g0, g1, aggregation, criterion):
+def compute_path(g0, g1, aggregation, criterion, pruning=None):
     g = g0.copy()
     g.add_nodes_from(g0.nodes(data=True))
     for node in g0.nodes():
@@ -80,9 +272,46 @@ def compute_path(g0, g1, aggregation, criterion):
                             g[node][node3]['weight'] += w
                     else:
                         g.add_edge(node, node3, weight=w)
+            if pruning is not None:
+                prune_paths(g, node, pruning)
     return g
 
 
+# Aggregate paths using graphs of several criteria at once (all graphs of a list have the same edges)
+def compute_paths(list_g0, list_g1, aggregation, criteria):
+    list_g = [g0.copy() for g0 in list_g0]
+    ops = [OPERATORS[criterion] for criterion in criteria]
+    layers = range(len(criteria))
+    for node, nbrs in list_g0[0].adj.items():
+        adjs = [g.adj[node] for g in list_g]
+        rows0 = [g0.adj[node] for g0 in list_g0]
+        new = [dict() for _ in layers]  # weights of new edges of node (added after its paths are composed)
+        for node2 in nbrs:
+            w0 = [row[node2]['weight'] for row in rows0]
+            rows1 = [g1.adj[node2] for g1 in list_g1]
+            for node3 in rows1[0]:  # node -> node2 -> node3
+                if node3 in adjs[0]:  # update edges
+                    for i in layers:
+                        w = ops[i](w0[i], rows1[i][node3]['weight'])  # path weight
+                        attr = adjs[i][node3]
+                        if aggregation != 0:
+                            attr['weight'] += w
+                        elif w > attr['weight']:
+                            attr['weight'] = w
+                else:  # new edges
+                    for i in layers:
+                        w = ops[i](w0[i], rows1[i][node3]['weight'])
+                        if node3 not in new[i]:
+                            new[i][node3] = w
+                        elif aggregation != 0:
+                            new[i][node3] += w
+                        elif w > new[i][node3]:
+                            new[i][node3] = w
+        for g, edges in zip(list_g, new):
+            g.add_edges_from((node, node3, {'weight': w}) for node3, w in edges.items())
+    return list_g
+
+
 # Update paths with more strengths
 def update_bipath(quality, list_g, list_g0, list_g1, node, nodes_list, criterion, name, index=0):
     for node2 in nodes_list:
@@ -105,31 +334,63 @@ def update_bipath(quality, list_g, list_g0, list_g1, node, nodes_list, criterion
 
 
 # Aggregate paths using multilayer g0 and g1
-def compute_bipath(list_g0, list_g1, quality, criterion, name):
+def compute_bipath(list_g0, list_g1, quality, criterion, name, adjacency=False):
     list_g = [list_g0[0].copy(), list_g1[1].copy()]
     list_g[0].add_nodes_from(list_g0[1].nodes())
     list_g[1].add_nodes_from(list_g1[0].nodes())
     nodes_list = list_g[0].nodes()
+    neighbors = list if adjacency else set  # order of adjacent nodes (set order depends on hashes of labels)
 
     for node in nodes_list:
         # do for adjacent nodes in g1 (influence layer)
-        list_g, quality = update_bipath(quality, list_g, list_g0, list_g1, node, set(list_g0[0].neighbors(node)), criterion, name, 0)
+        list_g, quality = update_bipath(quality, list_g, list_g0, list_g1, node, neighbors(list_g0[0].neighbors(node)), criterion, name, 0)
         # do for adjacent nodes in g1 (dependance layer)
-        list_g, quality = update_bipath(quality, list_g, list_g0, list_g1, node, set(list_g0[1].neighbors(node)), criterion, name, 1)
+        list_g, quality = update_bipath(quality, list_g, list_g0, list_g1, node, neighbors(list_g0[1].neighbors(node)), criterion, name, 1)
     return list_g, quality
 
 
 # Find all paths of length <= path_lim (fast multiplication implementation)
-def indirect_bipath(list_g, quality, path_lim, criterion=2, name='weight'):
+def indirect_bipath(list_g, quality, path_lim, criterion=2, name='weight', adjacency=False):
     if path_lim == 1:  # path length is 1
         return list_g, create_quality(list_g[0], list_g[1], quality, name)
     else:  # find all paths
         if path_lim % 2 == 0:
-            res = compute_bipath(list_g, list_g, quality, criterion, name)
-            return indirect_bipath(res[0], res[1], path_lim // 2, criterion, name)
+            res = compute_bipath(list_g, list_g, quality, criterion, name, adjacency)
+            return indirect_bipath(res[0], res[1], path_lim // 2, criterion, name, adjacency)
         else:
-            res = indirect_bipath(list_g, quality, path_lim - 1, criterion, name)
-            return compute_bipath(res[0], list_g, res[1], criterion, name)
+            res = indirect_bipath(list_g, quality, path_lim - 1, criterion, name, adjacency)
+            return compute_bipath(res[0], list_g, res[1], criterion, name, adjacency)
+
+
+# Find all bi-paths of length <= path_lim and their strengths (array version of create_quality and indirect_bipath)
+def indirect_bipath_arrays(inf_g, dep_g, path_lim, criterion=2, name='weight', block_size=2 ** 22, workers=None,
+                           adjacency=False):
+    """
+    :param inf_g: influence layer
+    :param dep_g: dependence layer
+    :param path_lim: maximal path length
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication)
+    :param name: edge attribute name
+    :param block_size: maximal number of paths processed at once
+    :param workers: (int, optional), number of worker processes which find paths of row blocks (layers are passed
+                    to workers through shared memory)
+    :param adjacency: if True, adjacent nodes are processed in adjacency order instead of the order of sets of
+                      indirect_bipath (the same as indirect_bipath with adjacency=True)
+    :return: quality graph (GraphQW)
+    """
+    nodes = list(inf_g.nodes()) + [node for node in dep_g.nodes() if node not in inf_g]
+    layers = [sp.graph_to_csr(inf_g, nodes, name)[0], sp.graph_to_csr(dep_g, nodes, name)[0]]
+    quality = sp.bipath_quality(layers[0], layers[1], (np.zeros(0, dtype=np.int64), np.zeros(0)))
+    pool = sp.BlockPool(workers) if workers is not None and workers > 1 and path_lim > 1 else None
+    try:
+        quality = sp.bipath_arrays(layers, quality, path_lim, criterion, nodes, block_size, pool, adjacency)[1]
+    finally:
+        if pool is not None:
+            pool.close()
+    n = len(nodes)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(quality[0] // n, minlength=n))
+    return sp.csr_to_graph(sp.CSR(indptr, quality[0] % n, quality[1]), nodes, inf_g, name)
 
 
 # Define current bi-path strengths
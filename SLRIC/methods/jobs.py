@@ -0,0 +1,86 @@
+import asyncio
+from collections import namedtuple
+from time import perf_counter
+from .profiler import Profiler
+
+# Result of a job: ranking, partial (True if the time budget ran out), interrupted stage (None if the result is
+# complete), progress of stages ({stage: (done, total)}) and profiling report
+JobResult = namedtuple('JobResult', ['ranking', 'partial', 'interrupted', 'progress', 'report'])
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# Profiler of a calculation running in an executor. Progress events are sent to the event loop, the calculation is
+# interrupted after a batch of nodes or a round of path composition if the job is cancelled, and evaluation of nodes
+# and path composition are stopped when the time budget runs out (the result is partial)
+class Job(Profiler):
+    def __init__(self, loop, callback=None, timeout=None, batch_size=100):
+        """
+        :param loop: event loop which receives events
+        :param callback: function callback(event) called in the event loop at the end of each stage (see Profiler)
+                         and after each batch of nodes or round of path composition (event is a dictionary with
+                         stage name, done, total and elapsed time)
+        :param timeout: time budget in seconds
+        :param batch_size: number of nodes between progress events and cancellation checks
+        """
+        super().__init__(memory=False, callback=None if callback is None else self.emit)
+        self.loop = loop
+        self.events = callback
+        self.batch_size = batch_size
+        self.start_time = perf_counter()
+        self.deadline = None if timeout is None else self.start_time + timeout
+        self.cancelled = False
+        self.interrupted = None  # stage which was running when the time budget ran out
+        self.status = dict()  # stage: (done, total)
+        self.reported = dict()  # stage: number of done nodes at the last event
+        self.rounds = 0  # completed rounds of path composition
+
+    def emit(self, event):
+        self.loop.call_soon_threadsafe(self.events, event)
+
+    @property
+    def stopped(self):
+        if self.interrupted is None and self.deadline is not None and perf_counter() > self.deadline:
+            self.interrupted = self._stack[-1][0] if len(self._stack) > 0 else 'job'
+        return self.interrupted is not None
+
+    def progress(self, stage, done=None, total=None):
+        if done is None:  # completed round of path composition
+            self.rounds += 1
+            done = self.rounds
+        self.status[stage] = (done, total)
+        if total is not None and done < total and done - self.reported.get(stage, 0) < self.batch_size:
+            return not self.stopped
+        self.reported[stage] = 0 if done == total else done  # stage can be repeated (e.g. for two layers)
+        if self.cancelled:
+            raise JobCancelled('Job is cancelled')
+        if self.events is not None:
+            self.emit({'stage': stage, 'done': done, 'total': total, 'elapsed': perf_counter() - self.start_time})
+        return not self.stopped
+
+    def result(self, ranking):
+        return JobResult(ranking, self.interrupted is not None, self.interrupted, dict(self.status), self.report())
+
+
+# Run func(job) in an executor, the job is cancelled if the coroutine is cancelled. The executor thread cannot be
+# interrupted, so it stops at the next progress check (after the current batch of nodes or round of path composition)
+# by JobCancelled. Events are passed to callback by call_soon_threadsafe, the result is partial if the time ran out
+async def run_job(func, callback=None, timeout=None, batch_size=100, executor=None):
+    """
+    :param func: function of the job (it receives the job as a profiler)
+    :param callback: function callback(event) called in the event loop (see Job)
+    :param timeout: time budget in seconds
+    :param batch_size: number of nodes between progress events and cancellation checks
+    :param executor: executor (by default the default executor of the event loop)
+    :return: (JobResult) result of the job
+    """
+    loop = asyncio.get_running_loop()
+    job = Job(loop, callback, timeout, batch_size)
+    try:
+        ranking = await loop.run_in_executor(executor, func, job)
+    except asyncio.CancelledError:
+        job.cancelled = True  # calculation stops after the current batch of nodes
+        raise
+    return job.result(ranking)
@@ -1,79 +1,87 @@
-from cvxopt import matrix,  glpk
-from math import floor, isclose
+from math import ceil, floor, isclose, log
+from zlib import crc32
 import numpy as np
 
 
+# Calculate LRIC value for all nodes starting from 'node' (nodes are visited in the order of next_element)
+def find_lp(arr, node, group_size, ex_list, solver=None):
+    if solver is None:
+        solver = ilp
+    while True:
+        if not (isclose(arr[node][4], -1) or isclose(arr[node][4], -2)):  # check if LRIC for 'node' is evaluated
+            evaluate_lp(arr, node, group_size, ex_list, solver)
+        if node == len(arr) - 1:
+            break
+        node = next_element(arr, node)  # calculate LRIC for the next node
+    return arr
+
+
 # Calculate LRIC value for 'node'
-def find_lp(arr, node, group_size, ex_list):
-    if isclose(arr[node][4], -1) or isclose(arr[node][4], -2):  # check if LRIC for 'node' is already evaluated
-        if node != len(arr) - 1:
-            arr = find_lp(arr, next_element(arr, node), group_size, ex_list)  # calculate LRIC for the next node
-    else:
-        check = (0, 0)
-        if node > 0:
-            check = check_neighbors(node - 1, -1, -1, node, arr)  # check left
-        if isclose(check[0], 0) and node < len(arr) - 1:
-            check = check_neighbors(node + 1, len(arr), 1, node, arr)  # check right
-        if isclose(check[0], 0):  # check if node is not considered
-            if node in ex_list:  # check if there are exceptions for node
-                ex = [True] * len(arr)
-                for el in ex_list[node]:
-                    ex[el] = False
-                sub_arr = arr[(arr[:, 5] != node) & (arr[:, 4] != -2) & ex]  # generate list of other group members
+def evaluate_lp(arr, node, group_size, ex_list, solver):
+    check = (0, 0)
+    if node > 0:
+        check = check_neighbors(node - 1, -1, -1, node, arr)  # check left
+    if isclose(check[0], 0) and node < len(arr) - 1:
+        check = check_neighbors(node + 1, len(arr), 1, node, arr)  # check right
+    if isclose(check[0], 0):  # check if node is not considered
+        mask = (arr[:, 5] != node) & (arr[:, 4] != -2)
+        if node in ex_list:  # check if there are exceptions for node
+            mask[ex_list[node]] = False
+        sub_arr = arr[mask]  # generate list of other group members
+        if len(sub_arr) > 0:  # check if there are other members
+            solution = solver(sub_arr[:, 0], arr[node][2], arr[node][3], group_size)  # solve 0-1 problem
+            if solution is None or isclose(sum(solution[:-1]), 0):  # no solution found
+                if isclose(arr[node][4], 0):
+                    arr[:node + 1, 4] = -2  # nodes are not pivotal
+                else:
+                    arr[node][4] = -1  # node is considered
             else:
-                sub_arr = arr[(arr[:, 5] != node) & (arr[:, 4] != -2)]
-            if len(sub_arr > 0):  # check if there are other members
-                solution = ilp(sub_arr[:, 0], arr[node][2], arr[node][3], group_size)  # solve 0-1 problem
-                if solution is None or isclose(sum(solution[:-1]),0):  # no solution found
-                    if isclose(arr[node][4], 0):
-                        for i in range(node + 1):
-                            arr[i][4] = -2  # nodes are not pivotal
-                    else:
-                        arr[node][4] = -1  # node is considered
+                members = np.flatnonzero(np.asarray(solution[:-1], dtype='d').ravel()).tolist()  # group members
+                f = 0
+                for i in members:
+                    f += solution[i]*sub_arr[i, 0]
+                if isclose(f, arr[node][3]) and isclose(arr[node][4], 0):  # solution - node is not pivotal
+                    arr[:node + 1, 4] = -2  # nodes are not pivotal
                 else:
-                    f = 0
-                    for i in range(len(solution)-1):
-                        f += solution[i]*sub_arr[i, 0]
-                    if isclose(f, arr[node][3]) and isclose(arr[node][4], 0):  # solution - node is not pivotal
-                        for i in range(node + 1):
-                            arr[i][4] = -2  # nodes are not pivotal
-                    else:
-                        arr[node][4] = -1  # node is considered
-                        arr[node][3] = f  # update node influence
-                        for i in range(len(solution)-1):  # update influence for other group members
-                            if isclose(solution[i], 1):
-                                v = f + arr[node][0] - sub_arr[i][0]
-                                if v < sub_arr[i][3]:
-                                    j = int(sub_arr[i][5])
-                                    arr[j][3] = v
-                                    arr[j][4] = 1
-                                    if j not in ex_list:  # add 'node' to exception list for j
-                                        ex_list[j] = []
-                                    ex_list[j].append(node)
-            elif arr[node][4] == 0:
-                arr[node][4] = -2  # node is not pivotal
+                    arr[node][4] = -1  # node is considered
+                    arr[node][3] = f  # update node influence
+                    for i in members:  # update influence for other group members
+                        if isclose(solution[i], 1):
+                            v = f + arr[node][0] - sub_arr[i][0]
+                            if v < sub_arr[i][3]:
+                                j = int(sub_arr[i][5])
+                                arr[j][3] = v
+                                arr[j][4] = 1
+                                if j not in ex_list:  # add 'node' to exception list for j
+                                    ex_list[j] = []
+                                ex_list[j].append(node)
+        elif arr[node][4] == 0:
+            arr[node][4] = -2  # node is not pivotal
+    else:
+        if isclose(check[0], -2):
+            arr[node][4] = -2  # node is not pivotal
         else:
-            if isclose(check[0], -2):
-                arr[node][4] = -2  # node is not pivotal
-            else:
-                arr[node][3] = check[1]  # node has the same influence as the other member
-                arr[node][4] = -1
-        if node != len(arr) - 1:
-            arr = find_lp(arr, next_element(arr, node), group_size, ex_list)  # calculate LRIC for the next node
-    return arr
+            arr[node][3] = check[1]  # node has the same influence as the other member
+            arr[node][4] = -1
 
 
-# Check if influence of node with the same weight has been already evaluated
+# Check if influence of node with the same weight has been already evaluated. Nodes are sorted by weight, so nodes
+# with the same weight (math.isclose) form a run which is scanned from 'start' in the direction of 'counter'
 def check_neighbors(start, end, counter, ind, arr):
-    check = (0, 0)  # tuple (node status, group weight)
-    for i in range(start, end, counter):
-        if isclose(arr[i][0], arr[ind][0]):  # check if node i has the same weight
-            if arr[i][4] < -0.5:  # check if node i has been evaluated
-                check = (arr[i][4], arr[i][3])
-                break
-        else:
-            break
-    return check
+    w = arr[ind][0]
+    if counter > 0:
+        end = min(end, int(np.searchsorted(arr[:, 0], w / (1 - 2e-9), side='right')))
+    else:
+        end = max(end, int(np.searchsorted(arr[:, 0], w * (1 - 2e-9), side='left')) - 1)
+    idx = np.arange(start, end, counter)
+    weights = arr[idx, 0]
+    same = np.abs(weights - w) <= 1e-9 * np.maximum(np.abs(weights), abs(w))  # isclose(arr[i][0], arr[ind][0])
+    run = len(same) if same.all() else int(np.argmin(same))  # nodes before the first node with other weight
+    evaluated = np.flatnonzero(arr[idx[:run], 4] < -0.5)  # nodes which have been evaluated
+    if len(evaluated) == 0:
+        return 0, 0  # tuple (node status, group weight)
+    i = idx[evaluated[0]]
+    return arr[i][4], arr[i][3]
 
 
 # Zero-One Linear Programming Solver
@@ -82,6 +90,7 @@ def ilp(weights, min_value, max_value, group_size):
     if sum_w < min_value:
         return None
     else:
+        from cvxopt import matrix, glpk  # GLPK is loaded on the first call
         weights = np.array(np.append(weights,[max_value]), dtype='d')
         c = matrix(weights, tc='d')
         G = matrix([list(-weights), list(weights), [1]*len(weights)], tc='d')
@@ -100,3 +109,83 @@ def next_element(arr, node):
     else:
         node += 1  # go right
     return node
+
+
+# Approximate LRIC for nodes with many neighbors (pivotal groups are searched in sampled orders of neighbors)
+class SampledLRIC:
+    def __init__(self, min_degree=1000, eps=0.05, delta=0.05, seed=0):
+        """
+        :param min_degree: nodes with more than min_degree incoming links are evaluated approximately
+        :param eps: with probability 1 - delta, less than eps of random orders of neighbors lead to a group
+                    which is lighter than the found one
+        :param delta: see eps (number of sampled orders is ceil(ln(1 / delta) / eps))
+        :param seed: random seed (orders of neighbors depend on the seed and weights only, so results do not
+                     depend on the number of worker processes)
+        """
+        self.min_degree = min_degree
+        self.samples = ceil(log(1 / delta) / eps)
+        self.seed = seed
+        self.bounds = dict()  # node: maximal width of confidence intervals of its neighbors' influence
+
+    def applies(self, degree):
+        return degree > self.min_degree
+
+    # Random generator for weights of neighbors of a node
+    def generator(self, w):
+        return np.random.default_rng([self.seed, crc32(w.tobytes())])
+
+    def stats(self):
+        return dict(self.bounds)
+
+    def merge(self, bounds):
+        self.bounds.update(bounds)
+
+
+# Lower and upper bounds of LRIC for sorted weights (groups of at most group_size other members are sampled)
+def sample_lp(w, quota, group_size, samples, rng):
+    """
+    :param w: weights of neighbors in increasing order (each weight is less than quota)
+    :param quota: threshold of influence
+    :param group_size: maximal number of other members of a group
+    :param samples: number of random orders of neighbors (the order of decreasing weights is added)
+    :param rng: random generator
+    :return: lower bounds (influence of the lightest found pivotal group) and upper bounds of influence
+    """
+    n = len(w)
+    ids = np.arange(n)
+    need = quota - w  # minimal weight of other members
+    upper = w / quota  # group weight is at least quota - w
+    best = np.full(n, np.inf)
+    top = np.cumsum(w[::-1])  # maximal weight of k members (neighbor itself is replaced by the next one)
+    k = min(group_size, n - 1)
+    if k > 0:
+        in_top = ids >= n - k
+        heaviest = np.where(in_top, top[min(k, n - 1)] - w, top[k - 1])
+        never = (heaviest < need) & ~np.isclose(heaviest, need, rtol=1e-9, atol=0)
+        orders = [ids[::-1]] + [rng.permutation(n) for _ in range(samples)]
+        for order in orders if not never.all() else []:
+            pos = np.empty(n, dtype=np.int64)
+            pos[order] = ids
+            prefix = np.concatenate(([0.0], np.cumsum(w[order])))
+            m = np.searchsorted(prefix, need) - 1  # the longest prefix lighter than need (without the neighbor)
+            m = np.where(m <= pos, m, np.maximum(pos, np.searchsorted(prefix, quota) - 2))
+            m = np.minimum(m, k - 1)  # the last member completes the group
+            inside = m > pos
+            s = np.where(inside, prefix[np.minimum(m + 1, n)] - w, prefix[m])
+            limit = np.where(inside, m + 1, m)
+            c = np.searchsorted(w, need - s)  # the lightest member which completes the group
+            while True:
+                bad = c < n
+                bad[bad] = (pos[c[bad]] < limit[bad]) | (c[bad] == ids[bad])  # member is already in the group
+                if not bad.any():
+                    break
+                c[bad] += 1
+            found = c < n
+            f = np.where(found, s + w[np.minimum(c, n - 1)], np.inf)
+            found &= (f < quota) & ~np.isclose(f, quota, rtol=1e-9, atol=0)
+            best = np.where(found & (f < best), f, best)
+        upper = np.where(never, 0, upper)
+    else:
+        upper = np.zeros(n)
+    lower = np.where(np.isfinite(best), w / (w + best), 0)
+    return lower, upper
@@ -1,4 +1,6 @@
-from math import isclose
+from math import ceil, isclose
+import numpy as np
+from .sparse_paths import CSR, graph_to_csr
 
 # Binary search for element "<weight'
 def search_low(left, right, tuples, weight):
@@ -9,21 +11,17 @@ def search_low(left, right, tuples, weight):
     :param weight: predefined value
     :return: index of array
     """
-    v = 0
-    if left == right:
-        if tuples[left][1] >= weight:
-            v = left - 1
-            if left == 0 and weight < 0:
-                v -= 1
-        else:
-            v = left
-    else:
+    while left < right:
         mid = left + (right - left) // 2
         if tuples[mid][1] >= weight:
-            v = search_low(left, mid, tuples, weight)  # search left
+            right = mid  # search left
         else:
-            v = search_low(mid + 1, right, tuples, weight)  # search right
-    return v
+            left = mid + 1  # search right
+    if tuples[left][1] >= weight:
+        if left == 0 and weight < 0:
+            return left - 2
+        return left - 1
+    return left
 
 
 # Binary search for element ">weight'
@@ -35,36 +33,28 @@ def search_high(left, right, tuples, weight):
     :param weight: predefined value
     :return: index of array
     """
-    v = 0
-    if left == right:
-        if tuples[left][1] > weight:
-            v = left
-        else:
-            v = left + 1
-    else:
+    while left < right:
         mid = left + (right - left) // 2
         if tuples[mid][1] > weight:
-            v = search_high(left, mid, tuples, weight)  # search left
+            right = mid  # search left
         else:
-            v = search_high(mid + 1, right, tuples, weight)  # search right
-    return v
+            left = mid + 1  # search right
+    if tuples[left][1] > weight:
+        return left
+    return left + 1
 
 
 # Binary search for element "=weight'
 def search_value(left, right, ord_keys, d, weight):
-    v = 0
-    if left == right:
-        if d[ord_keys[left]][0] != weight:
-            v = left
-        else:
-            v = left + 1
-    else:
+    while left < right:
         mid = left + (right - left) // 2
         if d[ord_keys[mid]][0] != weight:
-            v = search_value(left, mid, ord_keys, d, weight)  # search left
+            right = mid  # search left
         else:
-            v = search_value(mid + 1, right, ord_keys, d, weight)  # search right
-    return v
+            left = mid + 1  # search right
+    if d[ord_keys[left]][0] != weight:
+        return left
+    return left + 1
 
 
 # Find max edge value in a graph
@@ -160,15 +150,130 @@ def construct_sets(key, ord_keys, interval, min_bord, n, dkeys):
     return s
 
 
-# Ranking Distance
-def rank_dist(r1, r2, eps, method):
+# Interval bounds of sorted elements (arrays version of prepare_intervals)
+def interval_bounds(values, eps, method):
     """
-    :param r1: ranking 1 (dict)
-    :param r2:  ranking 2 (dict)
-    :param eps:  epsilon (measurement error)
-    :param method: method for interval construction (o - absolute, 1 - relative)
-    :return: ranking similarity
+    :param values: sorted array of element weights
+    :param eps: measurement error
+    :param method: method for interval construction
+    :return: low (index of the last lower element, -2 if there are no lower elements and the interval contains
+             negative values), high (index of the first upper element) and number of first elements with low = -2
+    """
+    min_v, max_v = define_interval(values, eps, method)
+    idx = np.arange(len(values))
+    # searches of prepare_intervals start from the previous bounds (they are not monotone for negative weights)
+    high = np.maximum.accumulate(np.searchsorted(values, max_v, side='right'))
+    low = np.minimum(np.searchsorted(values, min_v, side='left') - 1, np.maximum(idx - 1, 0))
+    low = np.maximum(np.maximum.accumulate(low + idx) - idx, -1)
+    low[(low == -1) & (min_v < 0)] = -2
+    min_bord = search_value(0, len(low) - 1, idx, low[:, None], -2) if len(values) > 0 else 0
+    return low, high, min_bord
+
+
+# Levels of merge sort tree: at level k blocks of 2^k consecutive elements of y are sorted (block id is in the key)
+def dominance_levels(y, base):
+    """
+    :param y: array of integer values in [0, base)
+    :param base: upper bound of values
+    :return: list of sorted keys (block id * base + value) for each level
     """
+    idx = np.arange(len(y))
+    levels, k = [], 0
+    while (1 << k) <= len(y):
+        levels.append(np.sort((idx >> k) * base + y))
+        k += 1
+    return levels
+
+
+# Count elements y[i] < c[j] with i < a[j] for each query j (the prefix is split into blocks of dominance_levels)
+def count_dominated(levels, base, a, c):
+    """
+    :param levels: output of dominance_levels
+    :param base: upper bound of values
+    :param a: array of prefix lengths
+    :param c: array of upper bounds of values (c <= base)
+    :return: array of counts
+    """
+    res = np.zeros(len(a), dtype=np.int64)
+    for k, level in enumerate(levels):
+        mask = (a >> k) & 1 == 1
+        block = (a[mask] >> k) - 1
+        query = block * base + c[mask]
+        order = np.argsort(query)  # sorted queries are searched faster
+        found = np.empty(len(query), dtype=np.int64)
+        found[order] = np.searchsorted(level, query[order])
+        res[mask] += found - (block << k)
+    return res
+
+
+# Sort ranking and define intervals of its elements
+def sorted_ranking(r, keys_id, eps, method):
+    """
+    :param r: ranking (dict)
+    :param keys_id: dictionary of all keys (key: id)
+    :param eps: measurement error
+    :param method: method for interval construction
+    :return: position of each key in the sorted ranking (-1 if the key does not appear), low and high bounds of
+             intervals (by position), number of first elements with low = -2
+    """
+    ids = np.array([keys_id[key] for key in r], dtype=np.int64)
+    values = np.array(list(r.values()), dtype='d')
+    order = np.argsort(values, kind='stable')
+    pos = np.full(len(keys_id), -1, dtype=np.int64)
+    pos[ids[order]] = np.arange(len(r))
+    low, high, min_bord = interval_bounds(values[order], eps, method)
+    return pos, low, high, min_bord
+
+
+# Lower/equivalence/upper bounds of each key: elements at positions [0, l) are lower, [l, h) are equivalent,
+# [h, n) are upper (l > h is possible for negative weights); lower_missing is True if keys which do not appear
+# in the ranking are lower than the key
+def key_bounds(pos, low, high, min_bord):
+    low, high = np.append(low, -2)[pos], np.append(high, min_bord)[pos]  # keys which do not appear have pos = -1
+    return np.maximum(0, low + 1), high, low != -2
+
+
+# Ranking Distance (sorted arrays of interval bounds, O(n log^2 n) time)
+def rank_dist_sorted(r1, r2, eps, method):
+    keys_id = dict(zip(r1.keys(), range(len(r1))))
+    for key in r2:
+        keys_id.setdefault(key, len(keys_id))
+    n, n1, n2 = len(keys_id), len(r1), len(r2)
+    pos1, low1, high1, min_bord1 = sorted_ranking(r1, keys_id, eps, method)
+    pos2, low2, high2, min_bord2 = sorted_ranking(r2, keys_id, eps, method)
+    l1, h1, lower1 = key_bounds(pos1, low1, high1, min_bord1)
+    l2, h2, lower2 = key_bounds(pos2, low2, high2, min_bord2)
+    e1, e2 = np.maximum(l1, h1), np.maximum(l2, h2)  # ends of equivalence ranges
+    common = (pos1 >= 0) & (pos2 >= 0)
+
+    # prefix counts of common keys and keys of one ranking by positions
+    at1, at2 = np.zeros(n1, dtype=bool), np.zeros(n2, dtype=bool)
+    at1[pos1[common]], at2[pos2[common]] = True, True
+    common1, common2 = np.append(0, np.cumsum(at1)), np.append(0, np.cumsum(at2))
+    only1, only2 = np.arange(n1 + 1) - common1, np.arange(n2 + 1) - common2
+
+    # numbers of common keys with position < a in r1 and position < c in r2 for pairs of bounds (a, c)
+    base = n2 + 1
+    levels = dominance_levels(pos2[common][np.argsort(pos1[common])], base)
+    a, c = np.concatenate((h1, l1, e1, l1, e1, l1)), np.concatenate((l2, h2, e2, e2, l2, l2))
+    d = count_dominated(levels, base, common1[a], c).reshape(6, n)
+
+    upper_lower = common2[l2] - d[0]  # upper in r1, lower in r2
+    lower_upper = common1[l1] - d[1]  # lower in r1, upper in r2
+    equiv = d[2] - d[3] - d[4] + d[5]  # equivalent in both rankings
+    upper_lower += np.where(lower2, only1[n1] - only1[h1], 0)  # keys of r1 which do not appear in r2
+    equiv += np.where(lower2, 0, only1[e1] - only1[l1])
+    lower_upper += np.where(lower1, only2[n2] - only2[h2], 0)  # keys of r2 which do not appear in r1
+    equiv += np.where(lower1, 0, only2[e2] - only2[l2])
+    equiv1 = e1 - l1 + np.where(lower1, 0, n - n1)
+    equiv2 = e2 - l2 + np.where(lower2, 0, n - n2)
+
+    v = int((2 * (upper_lower + lower_upper) + equiv1 + equiv2 - 2 * equiv).sum()) / 2
+    return v / (n * (n - 1))
+
+
+# Ranking Distance (sets of lower, equivalent and upper elements are constructed for each key, O(n^2) time)
+def rank_dist_sets(r1, r2, eps, method):
     v = 0
     keys = set(r1.keys()) | set(r2.keys())  # keys list
     k1 = keys - set(r2.keys())  # elements of r1 that doesn't appear in r2
@@ -193,15 +298,88 @@ def rank_dist(r1, r2, eps, method):
     return v
 
 
-# Topology Distance
-def top_dist(g1, g2, name='weight', topology_type=0):
+# Ranking Distance
+def rank_dist(r1, r2, eps, method, engine='sorted'):
     """
-    :param g1: graph 1
-    :param g2:  graph 2
-    :param name: compared edge attribute
-    :param topology_type: topology distance normalization method
-    :return: topology distance
+    :param r1: ranking 1 (dict)
+    :param r2:  ranking 2 (dict)
+    :param eps:  epsilon (measurement error)
+    :param method: method for interval construction (o - absolute, 1 - relative)
+    :param engine: 'sorted' (sorted arrays of interval bounds) or 'sets' (sets of elements for each key)
+    :return: ranking similarity
     """
+    if engine == 'sets':
+        return rank_dist_sets(r1, r2, eps, method)
+    return rank_dist_sorted(r1, r2, eps, method)
+
+
+# Convert graph to CSR arrays over a shared list of nodes (rows of nodes which do not appear in g are empty)
+def aligned_csr(g, nodes, nodes_id, name='weight'):
+    """
+    :param g: input graph (GraphQW or CompactGraphQW)
+    :param nodes: shared list of nodes
+    :param nodes_id: dictionary of shared nodes (node: id)
+    :param name: edge attribute name
+    :return: CSR matrix
+    """
+    if hasattr(g, 'csr'):  # CompactGraphQW, ids of its nodes are mapped to shared ids
+        ids = np.array([nodes_id[node] for node in g.names], dtype=np.int64)
+        rows = ids[g.rows()]
+        order = np.argsort(rows, kind='stable')
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(rows, minlength=len(nodes)))
+        return CSR(indptr, ids[g.csr.indices][order], g.csr.data[order].astype('d'))
+    return graph_to_csr(g, nodes, name)[0]
+
+
+# Topology Distance (edges of both graphs are compared by blocks of rows of CSR arrays)
+def top_dist_sparse(g1, g2, name='weight', topology_type=0, block_size=2 ** 22):
+    nodes_id = dict(zip(g1.nodes(), range(len(g1))))
+    for node in g2.nodes():
+        nodes_id.setdefault(node, len(nodes_id))
+    nodes, n = list(nodes_id), len(nodes_id)
+    in1, in2 = np.arange(n) < len(g1), np.zeros(n, dtype=bool)
+    in2[[nodes_id[node] for node in g2.nodes()]] = True
+    m1, m2 = aligned_csr(g1, nodes, nodes_id, name), aligned_csr(g2, nodes, nodes_id, name)
+    max_v = max([0] + [m.data.max() for m in [m1, m2] if len(m.data) > 0])  # find max value in a graph
+
+    # nodes which appear in one graph only (weighted degree)
+    rows1 = np.repeat(np.arange(n), np.diff(m1.indptr))
+    rows2 = np.repeat(np.arange(n), np.diff(m2.indptr))
+    degree1 = np.bincount(rows1, weights=m1.data, minlength=n) + np.bincount(m1.indices, weights=m1.data, minlength=n)
+    degree2 = np.bincount(rows2, weights=m2.data, minlength=n) + np.bincount(m2.indices, weights=m2.data, minlength=n)
+    v = float(degree1[in1 & ~in2].sum() + degree2[in2 & ~in1].sum())
+
+    # edges of nodes which appear in both graphs (L1 difference of rows), union of edges
+    num_edges = 0
+    cost = np.diff(m1.indptr) + np.diff(m2.indptr)
+    block_id = (np.cumsum(cost) - cost) // max(1, block_size)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(block_id)) + 1, [n])) if n > 0 else []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        s1, e1, s2, e2 = m1.indptr[start], m1.indptr[end], m2.indptr[start], m2.indptr[end]
+        key = np.concatenate(((rows1[s1:e1] - start) * n + m1.indices[s1:e1],
+                              (rows2[s2:e2] - start) * n + m2.indices[s2:e2]))
+        w = np.concatenate((m1.data[s1:e1], -m2.data[s2:e2]))
+        order = np.argsort(key, kind='stable')
+        key, w = key[order], w[order]
+        if len(key) == 0:
+            continue
+        first = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1])))
+        diff = np.add.reduceat(w, first)
+        single = np.diff(np.append(first, len(key))) == 1  # edge appears in one graph only
+        diff = np.where(single, np.where(order[first] >= e1 - s1, -diff, diff), np.abs(diff))
+        both = in1[key[first] // n + start] & in2[key[first] // n + start]
+        v += float(diff[both].sum())
+        num_edges += len(first)
+    v = float(v / max_v)
+    if topology_type == 0:
+        return v/n/n
+    else:
+        return v/num_edges/num_edges
+
+
+# Topology Distance (neighbors of each node are compared)
+def top_dist_neighbors(g1, g2, name='weight', topology_type=0):
     max_v = max_edge(g1, name, max_edge(g2, name, 0))  # find max value in a graph
     v = 0
     nodes_list = set(g1.nodes()) | set(g2.nodes())  # define nodes list in g1 or g2
@@ -229,3 +407,76 @@ def top_dist(g1, g2, name='weight', topology_type=0):
     else:
         num_edges = len(set(g1.edges()) | set(g2.edges()))
         return v/num_edges/num_edges
+
+
+# Topology Distance
+def top_dist(g1, g2, name='weight', topology_type=0, engine='sparse', block_size=2 ** 22):
+    """
+    :param g1: graph 1
+    :param g2:  graph 2
+    :param name: compared edge attribute
+    :param topology_type: topology distance normalization method
+    :param engine: 'sparse' (graphs are aligned on shared nodes and compared by blocks of rows of CSR arrays) or
+                   'neighbors' (neighbors of each node are compared). Undirected graphs are compared by neighbors.
+    :param block_size: maximal number of edges of both graphs compared at once (sparse engine)
+    :return: (float) topology distance
+    """
+    if engine == 'neighbors' or not (g1.is_directed() and g2.is_directed()):
+        return float(top_dist_neighbors(g1, g2, name, topology_type))
+    return top_dist_sparse(g1, g2, name, topology_type, block_size)
+
+
+# Topology and ranking distance between snapshots i and j
+def pair_dist(results, i, j, eps=0.05, method=1, name='weight', topology_type=0):
+    """
+    :param results: list of (ranking, graph) of snapshots
+    :param i: index of snapshot 1
+    :param j: index of snapshot 2
+    :param eps: measurement error
+    :param method: method for interval construction (0 - absolute, 1 - relative)
+    :param name: compared edge attribute
+    :param topology_type: topology distance normalization method
+    :return: topology distance, ranking distance
+    """
+    return (top_dist(results[i][1], results[j][1], name, topology_type),
+            rank_dist(results[i][0], results[j][0], eps, method))
+
+
+# Distances between pairs of snapshots (pairs are processed in batches by several processes)
+def pairwise_dist(results, pairs, eps=0.05, method=1, name='weight', topology_type=0, workers=None, chunk_size=None):
+    """
+    :param results: list of (ranking, graph) of snapshots
+    :param pairs: list of pairs of snapshot indices (i, j)
+    :param eps: measurement error
+    :param method: method for interval construction (0 - absolute, 1 - relative)
+    :param name: compared edge attribute
+    :param topology_type: topology distance normalization method
+    :param workers: number of worker processes (by default pairs are processed serially)
+    :param chunk_size: number of pairs in a batch sent to a worker process
+    :return: list of (topology distance, ranking distance) in the order of pairs
+    """
+    params = (eps, method, name, topology_type)
+    if workers is None or workers <= 1 or len(pairs) <= 1:
+        return [pair_dist(results, i, j, *params) for i, j in pairs]
+    if chunk_size is None:
+        chunk_size = max(1, ceil(len(pairs) / (workers * 4)))
+    batches = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+    from concurrent.futures import ProcessPoolExecutor  # process pool is loaded if workers are used
+    res = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(results, params)) as executor:
+        for batch in executor.map(_batch_dist, batches):
+            res.extend(batch)
+    return res
+
+
+_worker_state = None  # snapshots and distance parameters shared by all batches of a worker process
+
+
+def _init_worker(results, params):
+    global _worker_state
+    _worker_state = (results, params)
+
+
+def _batch_dist(batch):
+    results, params = _worker_state
+    return [pair_dist(results, i, j, *params) for i, j in batch]
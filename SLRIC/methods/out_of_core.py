@@ -0,0 +1,340 @@
+import os
+import zipfile
+import numpy as np
+from . import direct_influence as di
+from .sparse_paths import CSR, product_block
+from .solvers import get_solver
+from .profiler import get_profiler
+from .writers import EDGE_DTYPE, NpyStream, get_format, nodes_filename, open_text
+
+VALUE_SIZE = 64  # bytes of memory used by an intermediate path value during composition (keys, weights, order)
+MAX_BUCKETS = 64  # maximal number of partition files open at once while edges are sorted
+
+
+# Number of edge records processed at once for a given memory budget
+def chunk_edges(memory):
+    return max(1, memory // (4 * EDGE_DTYPE.itemsize))
+
+
+# Node ids of sources and targets (new nodes are appended to the list of nodes in the order of edges)
+def node_ids(src, dst, index, nodes):
+    ids = np.empty(2 * len(src), dtype=np.int64)
+    for i, name in enumerate(name for edge in zip(src, dst) for name in edge):
+        j = index.get(name)
+        if j is None:
+            j = index[name] = len(nodes)
+            nodes.append(name)
+        ids[i] = j
+    return ids[0::2], ids[1::2]
+
+
+# Read chunks of an array stored in .npy member of zip archive
+def npz_chunks(zf, name, chunk):
+    with zf.open(name + '.npy') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+        for start in range(0, shape[0], chunk):
+            count = min(chunk, shape[0] - start)
+            yield np.frombuffer(f.read(count * dtype.itemsize), dtype=dtype, count=count)
+
+
+# Read edge list by chunks [csv, csv.gz (the layout of write_edgelist), npz, npy, parquet]
+def edge_chunks(filename, nodes, format=None, chunk=2 ** 20, separator=';', edge_name='weight'):
+    """
+    :param filename: filename
+    :param nodes: list of nodes, filled while the file is read
+    :param format: file format (by default it is defined by file extension)
+    :param chunk: maximal number of edges in a chunk
+    :param separator: column separator (text formats)
+    :param edge_name: edge attribute name (rows of other attributes are skipped in text formats)
+    :return: generator of sources, targets (node ids) and weights
+    """
+    format = get_format(filename, format)
+    if format == 'npy':
+        rec = np.load(filename, mmap_mode='r')
+        nodes.extend(np.load(nodes_filename(filename)).tolist())
+        for start in range(0, len(rec), chunk):
+            yield rec['src'][start:start + chunk], rec['dst'][start:start + chunk], rec['weight'][start:start + chunk]
+    elif format == 'npz':
+        with zipfile.ZipFile(filename) as zf:
+            with zf.open('nodes.npy') as f:
+                nodes.extend(np.lib.format.read_array(f).tolist())
+            yield from zip(*[npz_chunks(zf, name, chunk) for name in EDGE_DTYPE.names])
+    elif format == 'parquet':
+        import pyarrow.parquet
+        index = dict()
+        for batch in pyarrow.parquet.ParquetFile(filename).iter_batches(batch_size=chunk):
+            yield node_ids(batch.column('src').to_pylist(), batch.column('dst').to_pylist(), index, nodes) + (
+                batch.column('weight').to_numpy(), )
+    elif format in ['csv', 'csv.gz']:
+        index = dict()
+        with open_text(filename, 'r', format == 'csv.gz') as f:
+            columns = None
+            src, dst, w = [], [], []
+            for line in f:
+                row = line.rstrip('\n').split(separator)
+                if 'From' in row and 'Value' in row:  # header (repeated if several graphs were appended)
+                    columns = [row.index(name) for name in ['From', 'To', 'Edge Type', 'Value']]
+                elif columns is not None and len(row) > max(columns) and row[columns[2]] == edge_name:
+                    src.append(row[columns[0]])
+                    dst.append(row[columns[1]])
+                    w.append(float(row[columns[3]]))
+                    if len(src) >= chunk:
+                        yield node_ids(src, dst, index, nodes) + (np.array(w, dtype='d'), )
+                        src, dst, w = [], [], []
+            if len(src) > 0:
+                yield node_ids(src, dst, index, nodes) + (np.array(w, dtype='d'), )
+    else:
+        raise ValueError('Unknown format "%s"' % format)
+
+
+# Read edge list into records of node ids (.npy files are memory-mapped, other formats are copied to workdir)
+def read_records(filename, workdir, format=None, separator=';', edge_name='weight', memory=2 ** 28):
+    """
+    :return: edge records (memory-mapped EDGE_DTYPE array) and list of nodes
+    """
+    nodes = []
+    if get_format(filename, format) == 'npy':
+        nodes.extend(np.load(nodes_filename(filename)).tolist())
+        return np.load(filename, mmap_mode='r'), nodes
+    path = os.path.join(workdir, 'edges.npy')
+    stream = NpyStream(path, EDGE_DTYPE)
+    try:
+        for src, dst, w in edge_chunks(filename, nodes, format, chunk_edges(memory), separator, edge_name):
+            rec = np.empty(len(src), dtype=EDGE_DTYPE)
+            rec['src'], rec['dst'], rec['weight'] = src, dst, w
+            stream.write(rec)
+    finally:
+        stream.close()
+    return np.load(path, mmap_mode='r'), nodes
+
+
+# Weighted in-degree and out-degree of nodes (edge records are processed by chunks)
+def degrees(rec, n, memory=2 ** 28):
+    indeg, outdeg = np.zeros(n), np.zeros(n)
+    chunk = chunk_edges(memory)
+    for start in range(0, len(rec), chunk):
+        part = rec[start:start + chunk]
+        indeg += np.bincount(part['dst'], weights=part['weight'], minlength=n)
+        outdeg += np.bincount(part['src'], weights=part['weight'], minlength=n)
+    return indeg, outdeg
+
+
+# Split rows into partitions of consecutive rows with at most max_edges edges (a larger row is a partition itself)
+def row_partitions(indptr, max_edges):
+    n = len(indptr) - 1
+    if n == 0:
+        return []
+    part_id = indptr[:-1] // max(1, max_edges)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(part_id)) + 1, [n]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+# Sort edge records on disk by sources or targets (bucket sort by partitions of rows which fit into memory)
+def sort_edges(rec, n, key, workdir, name, memory=2 ** 28, max_buckets=MAX_BUCKETS):
+    """
+    :param rec: edge records (EDGE_DTYPE array, can be memory-mapped)
+    :param n: number of nodes
+    :param key: 'src' (rows of CSR are sources) or 'dst' (rows are targets, incoming edges in CSC order)
+    :param workdir: directory of files
+    :param name: prefix of files
+    :param memory: memory budget in bytes
+    :param max_buckets: maximal number of partition files open at once (edges are read once for each group of
+                        max_buckets partitions)
+    :return: CSR with memory-mapped indices and data, list of row partitions (first row, last row + 1)
+    """
+    other = 'dst' if key == 'src' else 'src'
+    chunk = chunk_edges(memory)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    for start in range(0, len(rec), chunk):
+        indptr[1:] += np.bincount(rec[key][start:start + chunk], minlength=n)
+    indptr = np.cumsum(indptr)
+    partitions = row_partitions(indptr, chunk)
+    files = [os.path.join(workdir, '%s_%s.npy' % (name, column)) for column in ['indices', 'data']]
+    indices = np.lib.format.open_memmap(files[0], 'w+', np.int64, (len(rec), ))
+    data = np.lib.format.open_memmap(files[1], 'w+', 'd', (len(rec), ))
+    if len(partitions) > 1:  # edges are distributed to buckets of partitions (the order of edges is kept)
+        bounds = np.array([last for _, last in partitions])
+        for first_bucket in range(0, len(partitions), max(1, max_buckets)):
+            group = range(first_bucket, min(first_bucket + max(1, max_buckets), len(partitions)))
+            buckets = [NpyStream(os.path.join(workdir, '%s_bucket%d.npy' % (name, i)), EDGE_DTYPE) for i in group]
+            try:
+                for start in range(0, len(rec), chunk):
+                    part = np.asarray(rec[start:start + chunk])
+                    bucket = np.searchsorted(bounds, part[key], side='right') - group.start
+                    mask = (bucket >= 0) & (bucket < len(group))  # edges of other groups are skipped
+                    part, bucket = part[mask], bucket[mask]
+                    order = np.argsort(bucket, kind='stable')
+                    split = np.cumsum(np.bincount(bucket, minlength=len(group)))[:-1]
+                    for i, piece in enumerate(np.split(part[order], split)):
+                        if len(piece) > 0:
+                            buckets[i].write(piece)
+            finally:
+                for stream in buckets:
+                    stream.close()
+    for i, (first, last) in enumerate(partitions):
+        if len(partitions) > 1:
+            path = os.path.join(workdir, '%s_bucket%d.npy' % (name, i))
+            part = np.load(path)
+            os.remove(path)
+        else:
+            part = np.asarray(rec)
+        order = np.argsort(part[key], kind='stable')
+        indices[indptr[first]:indptr[last]] = part[other][order]
+        data[indptr[first]:indptr[last]] = part['weight'][order]
+    del indices, data
+    return CSR(indptr, np.load(files[0], mmap_mode='r'), np.load(files[1], mmap_mode='r')), partitions
+
+
+# Direct influence evaluated by partitions of targets, edges of the result are spilled to disk
+def disk_inf(g, method, solver=None, cache=None, engine='auto', profiler=None):
+    """
+    :param g: (DiskGraphQW) input graph with quotas and sizes
+    :param method: 'LRIC' or 'SRIC'
+    :param solver: (str/Solver, optional) 0-1 solver for LRIC: 'native' (default), 'glpk' or Solver instance
+    :param cache: (InfluenceCache, optional) cache of LRIC influence shared by nodes with the same neighborhood
+    :param engine: (str, optional) SRIC engine: 'enumerate', 'count' or 'auto'
+    :param profiler: (Profiler, optional) number of targets, partitions and solver calls are counted
+    :return: (DiskGraphQW) direct influence graph (CSR arrays are memory-mapped)
+    """
+    solver = get_solver(solver)
+    profiler = get_profiler(profiler)
+    counters = dict() if profiler else None
+    calls, time = solver.calls, solver.time
+    q = g.attr['q']
+    targets = (g.attr['indeg'] >= q) & (q > 0) if g.coal > 0 else np.zeros(len(g), dtype=bool)
+    path = os.path.join(g.workdir, 'direct.npy')
+    stream = NpyStream(path, EDGE_DTYPE)
+    try:
+        for first, last in g.partitions:
+            src, dst, w = [], [], []
+            for node in (np.flatnonzero(targets[first:last]) + first).tolist():
+                inf_list = di.individual_inf(g, node, method, solver, cache, engine, counters)
+                for node2 in inf_list:  # add results
+                    src.append(node2)
+                    dst.append(node)
+                    w.append(inf_list[node2])
+            rec = np.empty(len(src), dtype=EDGE_DTYPE)
+            rec['src'], rec['dst'], rec['weight'] = src, dst, w
+            stream.write(rec)
+    finally:
+        stream.close()
+    m, _ = sort_edges(np.load(path, mmap_mode='r'), len(g), 'src', g.workdir, 'direct', g.memory)
+    os.remove(path)
+    if profiler:
+        profiler.count('targets', int(targets.sum()))
+        profiler.count('partitions', len(g.partitions))
+        if method == 'LRIC':
+            profiler.count('ilp_solves', solver.calls - calls)
+            profiler.count('solver_time', solver.time - time)
+        profiler.merge(counters)
+    return g.with_edges(m)
+
+
+# Rows of edges [start, end) of CSR matrix
+def edge_rows(indptr, start, end):
+    return np.searchsorted(indptr, np.arange(start, end), side='right') - 1
+
+
+# Define row blocks of matrix a such that each block generates at most block_size values (a is read by chunks)
+def row_blocks(a, b, block_size, memory=2 ** 28):
+    n = len(a.indptr) - 1
+    if n == 0:
+        return []
+    cost = np.diff(a.indptr).astype('d')
+    degree = np.diff(b.indptr)
+    chunk = chunk_edges(memory)
+    for start in range(0, len(a.indices), chunk):
+        end = min(start + chunk, len(a.indices))
+        cost += np.bincount(edge_rows(a.indptr, start, end), weights=degree[a.indices[start:end]], minlength=n)
+    block_id = (np.cumsum(cost) - cost) // max(1, block_size)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(block_id)) + 1, [n]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+# Aggregate paths a -> b by blocks of rows, the result is written to workdir
+def disk_product(a, b, aggregation, criterion, workdir, name, memory=2 ** 28):
+    """
+    :param a: left CSR matrix (can be memory-mapped)
+    :param b: right CSR matrix (can be memory-mapped)
+    :param aggregation: 0 (maxPath), 1 (sumPaths)
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication)
+    :param workdir: directory of files
+    :param name: prefix of files
+    :param memory: memory budget in bytes
+    :return: CSR with memory-mapped indices and data
+    """
+    n = len(a.indptr) - 1
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    files = [os.path.join(workdir, '%s_%s.npy' % (name, column)) for column in ['indices', 'data']]
+    streams = [NpyStream(files[0], np.int64), NpyStream(files[1], 'd')]
+    try:
+        block_size = max(1, memory // VALUE_SIZE)
+        for start, end in row_blocks(a, b, block_size, memory):
+            rows, cols, w = product_block(a, b, start, end, aggregation, criterion)
+            indptr[start + 1:end + 1] = np.cumsum(np.bincount(rows - start, minlength=end - start))
+            indptr[start + 1:end + 1] += indptr[start]
+            streams[0].write(cols)
+            streams[1].write(w)
+    finally:
+        for stream in streams:
+            stream.close()
+    return CSR(indptr, np.load(files[0], mmap_mode='r'), np.load(files[1], mmap_mode='r'))
+
+
+# Remove files of memory-mapped CSR matrix
+def remove_matrix(m):
+    for arr in [m.indices, m.data]:
+        if isinstance(arr, np.memmap) and os.path.exists(arr.filename):
+            os.remove(arr.filename)
+
+
+# Find all paths of length <= path_lim over CSR arrays on disk (intermediate matrices are removed when used)
+def disk_paths(m, path_lim, aggregation, criterion, workdir, memory=2 ** 28, profiler=None, name='paths'):
+    """
+    :param m: CSR matrix of direct influence (can be memory-mapped)
+    :param path_lim: maximal path length
+    :param aggregation: 0 (maxPath), 1 (sumPaths)
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication)
+    :param workdir: directory of files
+    :param memory: memory budget in bytes
+    :param profiler: (Profiler, optional), number of edges created by each composition step is recorded
+    :param name: prefix of files of the result (matrix of the last step)
+    :return: CSR with memory-mapped indices and data
+    """
+    if path_lim <= 1:  # path length is 1
+        return m
+    if path_lim % 2 == 0:
+        res = disk_product(m, m, aggregation, criterion, workdir, '%s_%d' % (name, path_lim), memory)
+        if profiler:
+            profiler.record('path_edges_created', len(res.data) - len(m.data))
+        paths = disk_paths(res, path_lim // 2, aggregation, criterion, workdir, memory, profiler, name)
+        if paths is not res:
+            remove_matrix(res)
+        return paths
+    m0 = disk_paths(m, path_lim - 1, aggregation, criterion, workdir, memory, profiler, name)
+    res = disk_product(m0, m, aggregation, criterion, workdir, '%s_%d' % (name, path_lim), memory)
+    if profiler:
+        profiler.record('path_edges_created', len(res.data) - len(m0.data))
+    if m0 is not m:
+        remove_matrix(m0)
+    return res
+
+
+# Centrality of sources, sum of size(target) * weight over edges except self-loops (edges are read by chunks)
+def disk_aggregate(m, size, memory=2 ** 28):
+    n = len(m.indptr) - 1
+    pers = np.zeros(n)
+    chunk = chunk_edges(memory)
+    for start in range(0, len(m.indices), chunk):
+        end = min(start + chunk, len(m.indices))
+        rows, cols = edge_rows(m.indptr, start, end), np.asarray(m.indices[start:end])
+        mask = rows != cols
+        pers += np.bincount(rows[mask], weights=size[cols[mask]] * m.data[start:end][mask], minlength=n)
+    s = pers.sum()
+    if s != 0:
+        pers /= s
+    return pers
@@ -0,0 +1,134 @@
+from time import perf_counter
+import tracemalloc
+
+
+# Wall time and peak memory of calculation stages and counters of internal operations
+class Profiler:
+    stopped = False  # if True, evaluation of nodes and path composition are stopped (the result is partial)
+
+    def __init__(self, memory=True, callback=None):
+        """
+        :param memory: if True, peak memory of each stage is traced (tracemalloc slows down calculations)
+        :param callback: function callback(event) called at the end of each stage, where event is a dictionary
+                         with stage name, its time, peak memory and current counters
+        """
+        self.memory = memory
+        self.callback = callback
+        self.stages = dict()  # stage name: {'time', 'peak_memory', 'calls'}
+        self.counters = dict()  # counter name: value (or list of values)
+        self._stack = []  # active stages: [name, start time, traced memory at start, peak memory]
+        self._tracing = False  # tracemalloc is started by the profiler
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def start(self, name):
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if len(self._stack) > 0:  # peak of the outer stage is kept before reset
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            tracemalloc.reset_peak()
+            self._stack.append([name, perf_counter(), current, current])
+        else:
+            self._stack.append([name, perf_counter(), 0, 0])
+
+    def stop(self):
+        name, t, current, peak = self._stack.pop()
+        t = perf_counter() - t
+        if self.memory:
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if len(self._stack) > 0:
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            elif self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+        record = self.stages.setdefault(name, {'time': 0.0, 'peak_memory': 0, 'calls': 0})
+        record['time'] += t
+        record['peak_memory'] = max(record['peak_memory'], peak - current)
+        record['calls'] += 1
+        if self.callback is not None:
+            self.callback({'stage': name, 'time': t, 'peak_memory': peak - current, 'counters': dict(self.counters)})
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, name, value):
+        """
+        Append value to the list of values (e.g. number of edges after each composition step)
+        """
+        self.counters.setdefault(name, []).append(value)
+
+    def merge(self, counters):
+        for key in counters:
+            self.count(key, counters[key])
+
+    def progress(self, stage, done=None, total=None):
+        """
+        Progress of a stage: done of total nodes are processed, or a round of path composition is completed (done is
+        None). Returns False if calculation has to be stopped
+        """
+        return not self.stopped
+
+    def report(self):
+        return {'stages': dict((name, dict(record)) for name, record in self.stages.items()),
+                'counters': dict(self.counters)}
+
+    def __bool__(self):
+        return True
+
+
+# Profiler which records nothing (used when profiling is disabled)
+class NullProfiler(Profiler):
+    def __init__(self):
+        super().__init__(memory=False)
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def count(self, name, value=1):
+        pass
+
+    def record(self, name, value):
+        pass
+
+    def merge(self, counters):
+        pass
+
+    def __bool__(self):
+        return False
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        self.profiler.start(self.name)
+        return self.profiler
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.stop()
+
+
+class _NullStage:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+NULL_PROFILER = NullProfiler()
+
+
+# Get profiler [None (profiling is disabled), True (new profiler) or Profiler instance]
+def get_profiler(profiler):
+    if profiler is None or profiler is False:
+        return NULL_PROFILER
+    elif profiler is True:
+        return Profiler()
+    return profiler
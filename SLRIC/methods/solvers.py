@@ -0,0 +1,135 @@
+from bisect import bisect_left
+from math import isclose
+from time import perf_counter
+import numpy as np
+
+
+# Base class of 0-1 solvers for LRIC group search (counts solver calls and time spent in them)
+class Solver:
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+
+    def __call__(self, weights, min_value, max_value, group_size):
+        """
+        Find a group with minimal total weight: min_value <= weight <= max_value, group cardinality <= group_size
+        :param weights: weights of group candidates
+        :param min_value: minimal group weight (group is winning)
+        :param max_value: maximal group weight (node is pivotal)
+        :param group_size: maximal group size
+        :return: None (no winning group) or 0-1 vector of group members with an additional element which is equal to 1
+                 if there is no group with weight <= max_value
+        """
+        t = perf_counter()
+        try:
+            return self.solve(weights, min_value, max_value, group_size)
+        finally:
+            self.calls += 1
+            self.time += perf_counter() - t
+
+    def solve(self, weights, min_value, max_value, group_size):
+        raise NotImplementedError
+
+    def stats(self):
+        return {'calls': self.calls, 'time': self.time}
+
+    def merge(self, stats):
+        for key in stats:
+            setattr(self, key, getattr(self, key) + stats[key])
+
+
+# GLPK solver (cvxopt package)
+class GLPKSolver(Solver):
+    def solve(self, weights, min_value, max_value, group_size):
+        from .lric import ilp
+        return ilp(weights, min_value, max_value, group_size)
+
+
+# Branch-and-bound search of cardinality-bounded subset sum over weights sorted in decreasing order
+class SubsetSumSolver(Solver):
+    def __init__(self, max_nodes=10 ** 6, fallback=None):
+        """
+        :param max_nodes: maximal number of search nodes, after that the problem is passed to fallback solver
+        :param fallback: fallback solver (by default GLPK)
+        """
+        super().__init__()
+        self.max_nodes = max_nodes
+        self.fallback = fallback
+        self.fallback_calls = 0
+
+    def solve(self, weights, min_value, max_value, group_size):
+        weights = np.asarray(weights, dtype='d')
+        if weights.sum() < min_value:
+            return None
+        order = np.argsort(-weights, kind='stable')
+        w = weights[order].tolist()
+        res = branch_and_bound(w, min_value, max_value, int(group_size), self.max_nodes)
+        if res is False:  # search limit is exceeded
+            self.fallback_calls += 1
+            if self.fallback is None:
+                self.fallback = GLPKSolver()
+            return self.fallback.solve(weights, min_value, max_value, group_size)
+        solution = [0.0] * (len(w) + 1)
+        if res is None:  # there is no group with weight <= max_value
+            solution[-1] = 1.0
+        else:
+            for i in res:
+                solution[order[i]] = 1.0
+        return solution
+
+    def stats(self):
+        res = super().stats()
+        res['fallback_calls'] = self.fallback_calls
+        return res
+
+
+# Search for a group with minimal weight in [min_value, max_value] (w is sorted in decreasing order)
+def branch_and_bound(w, min_value, max_value, group_size, max_nodes):
+    """
+    :return: list of group members, None (no such group) or False (search limit is exceeded)
+    """
+    n = len(w)
+    asc = w[::-1]  # weights in increasing order (for search of a single member which completes the group)
+    prefix = [0.0]
+    for v in w:
+        prefix.append(prefix[-1] + v)
+    best, best_group = max_value, None  # current bound is updated with each found group
+    stack = [(0, 0.0, ())]  # (first candidate, group weight, group members)
+    visited = 0
+    while stack:
+        visited += 1
+        if visited > max_nodes:
+            return False
+        pos, s, group = stack.pop()
+        need = min_value - s
+        slots = group_size - len(group)
+        if slots <= 0 or pos >= n:
+            continue
+        j = n - bisect_left(asc, need, 0, n - pos) - 1  # last element with weight >= need
+        if j + 1 < n and isclose(w[j + 1], need):
+            j += 1
+        if j >= pos:  # single member completes the group
+            v = s + w[j]
+            if v < best and not isclose(v, best):  # in case of a tie the bound is kept (as GLPK does)
+                best, best_group = v, group + (j,)
+                if isclose(best, min_value):
+                    break
+        if slots > 1:
+            for i in range(n - 1, max(pos, j + 1) - 1, -1):  # add a member lighter than need
+                v = s + w[i]
+                top = v + prefix[min(n, i + slots)] - prefix[i + 1]  # maximal weight of extended group
+                if top < min_value and not isclose(top, min_value):
+                    continue  # group cannot be winning
+                if i + 1 < n and (v + w[-1] > best or isclose(v + w[-1], best)):
+                    continue  # group weight exceeds current bound
+                stack.append((i + 1, v, group + (i,)))
+    return best_group
+
+
+# Get solver by name
+def get_solver(solver):
+    if solver is None or solver == 'native':
+        return SubsetSumSolver()
+    elif solver == 'glpk':
+        return GLPKSolver()
+    return solver
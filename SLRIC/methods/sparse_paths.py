@@ -0,0 +1,590 @@
+from collections import namedtuple, deque
+import numpy as np
+from ..classes.GraphQW import GraphQW
+
+# Sparse matrix in CSR format (row pointers, column indices, values) over an ordered list of nodes
+CSR = namedtuple('CSR', ['indptr', 'indices', 'data'])
+
+# Path strength operators [criterion: 0 (sum), 1 (min), 2 (multiplication)]
+COMBINE = {0: np.add, 1: np.minimum, 2: np.multiply}
+
+# Path aggregation operators [aggregation: 0 (maxPath), 1 (sumPaths)]
+REDUCE = {0: np.maximum, 1: np.add}
+
+
+# Pruning of weak paths during composition (keeps statistics of dropped centrality mass)
+class Pruning:
+    def __init__(self, min_weight=0, top_k=None, rtol=0):
+        """
+        :param min_weight: paths with weight < min_weight are dropped
+        :param top_k: number of the strongest paths kept for each source (paths tied with the k-th path are kept)
+        :param rtol: paths with weight < rtol * (maximal path weight of the source) are dropped
+        """
+        self.min_weight, self.top_k, self.rtol = min_weight, top_k, rtol
+        self.size = None  # nodes size (by node id), used for evaluation of dropped mass
+        self.dropped_edges = 0
+        self.dropped_mass = 0.0  # sum of size(target) * weight over dropped paths (self-loops are excluded)
+
+    def keep(self, rows, w, mass):
+        """
+        :param rows: sources of paths (sorted)
+        :param w: path weights
+        :param mass: contribution of each path to centrality of its source
+        :return: mask of kept paths
+        """
+        mask = w >= self.min_weight
+        if len(w) > 0 and (self.rtol > 0 or self.top_k is not None):
+            first = np.flatnonzero(np.concatenate(([True], rows[1:] != rows[:-1])))
+            count = np.diff(np.append(first, len(rows)))
+            if self.rtol > 0:
+                mask &= w >= self.rtol * np.repeat(np.maximum.reduceat(w, first), count)
+            if self.top_k is not None:
+                order = np.lexsort((-w, rows))  # paths of each source in decreasing order of weight
+                kth = w[order][first + np.minimum(count, self.top_k) - 1]  # weight of the k-th path of each source
+                mask &= w >= np.repeat(kth, count)
+        self.dropped_edges += int(len(w) - mask.sum())
+        self.dropped_mass += float(mass[~mask].sum())
+        return mask
+
+    def stats(self, g=None):
+        """
+        :param g: resulting graph (GraphQW or CompactGraphQW), if defined, kept mass and share of dropped mass
+                  are evaluated
+        :return: dictionary of statistics
+        """
+        res = {'dropped_edges': self.dropped_edges, 'dropped_mass': self.dropped_mass}
+        if g is not None:
+            if hasattr(g, 'csr'):
+                rows = g.rows()
+                loop = rows != g.csr.indices
+                kept = float((np.nan_to_num(g.attr['size'])[g.csr.indices] * g.csr.data)[loop].sum())
+            else:
+                kept = sum(g.nodes[edge[1]].get('size', 0) * edge[2] for edge in g.edges(data='weight')
+                           if edge[0] != edge[1])
+            kept = float(kept)
+            res['kept_mass'] = kept
+            res['dropped_share'] = self.dropped_mass / (self.dropped_mass + kept) if self.dropped_mass > 0 else 0.0
+        return res
+
+
+# Worker processes which compute row blocks of path compositions. Operands are copied to shared memory once per
+# composition and workers attach to them by name, only block bounds and results are sent between processes
+class BlockPool:
+    def __init__(self, workers):
+        """
+        :param workers: number of worker processes. At most 2 * workers blocks are computed or waiting at once, so
+                        peak memory of results is bounded by the block size
+        """
+        from concurrent.futures import ProcessPoolExecutor  # process pool is loaded if workers are used
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+
+    def map(self, func, arrays, blocks, *args):
+        """
+        :param func: module level function func(arrays, *args, start, end) evaluated by workers
+        :param arrays: list of arrays shared with workers
+        :param blocks: list of (first row, last row + 1)
+        :return: generator of results in the order of blocks
+        """
+        shm, spec = share_arrays(arrays)
+        pending = deque()
+        try:
+            for start, end in blocks:
+                pending.append(self.executor.submit(_block_task, func, spec, args, start, end))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while len(pending) > 0:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)  # running blocks are finished
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Copy arrays to a block of shared memory (the same array is copied once)
+def share_arrays(arrays):
+    """
+    :param arrays: list of arrays
+    :return: shared memory block and its description (name and dtype, shape and offset of each array)
+    """
+    from multiprocessing import shared_memory
+    offsets, layout, size = dict(), [], 0
+    for arr in arrays:
+        if id(arr) not in offsets:
+            offsets[id(arr)] = size
+            size += -(-arr.nbytes // 8) * 8  # arrays are aligned to 8 bytes
+        layout.append((arr.dtype.str, arr.shape, offsets[id(arr)]))
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for arr, (dtype, shape, offset) in zip(arrays, layout):
+        np.ndarray(shape, dtype, shm.buf, offset)[...] = arr
+    return shm, (shm.name, layout)
+
+
+_shared = dict()  # shared memory block attached by a worker process: name -> (block, arrays)
+
+
+# Attach to arrays in shared memory (blocks of previous compositions are closed)
+def attach_arrays(spec):
+    from multiprocessing import shared_memory
+    name, layout = spec
+    if name not in _shared:
+        for old in list(_shared):
+            shm, arrays = _shared.pop(old)
+            del arrays
+            shm.close()
+        shm = shared_memory.SharedMemory(name)
+        _shared[name] = (shm, [np.ndarray(shape, dtype, shm.buf, offset) for dtype, shape, offset in layout])
+    return _shared[name][1]
+
+
+def _block_task(func, spec, args, start, end):
+    return func(attach_arrays(spec), *args, start, end)
+
+
+# Convert graph to CSR arrays
+def graph_to_csr(g, nodes=None, name='weight'):
+    """
+    :param g: input graph
+    :param nodes: ordered list of nodes (by default the order of g.nodes())
+    :param name: edge attribute name
+    :return: CSR matrix, list of nodes
+    """
+    if nodes is None:
+        nodes = list(g.nodes())
+    nodes_id = dict(zip(nodes, range(len(nodes))))
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    indices, data = [], []
+    for i, node in enumerate(nodes):
+        if node in g:
+            for node2, attr in g.adj[node].items():
+                indices.append(nodes_id[node2])
+                data.append(attr.get(name, 1))
+        indptr[i + 1] = len(indices)
+    return CSR(indptr, np.array(indices, dtype=np.int64), np.array(data, dtype='d')), nodes
+
+
+# Convert CSR arrays to graph (node attributes are copied from g)
+def csr_to_graph(m, nodes, g=None, name='weight'):
+    """
+    :param m: CSR matrix
+    :param nodes: ordered list of nodes
+    :param g: graph with node attributes
+    :param name: edge attribute name
+    :return: GraphQW
+    """
+    res = GraphQW()
+    if g is not None:
+        res.add_nodes_from(g.nodes(data=True))
+    res.add_nodes_from(nodes)
+    rows = np.repeat(np.arange(len(nodes)), np.diff(m.indptr))
+    res.add_edges_from((nodes[i], nodes[j], {name: w}) for i, j, w in zip(rows.tolist(), m.indices.tolist(),
+                                                                           m.data.tolist()))
+    return res
+
+
+# Define row blocks of matrix a such that each block generates at most block_size values
+def row_blocks(a, b, block_size):
+    """
+    :param a: left CSR matrix
+    :param b: right CSR matrix
+    :param block_size: maximal number of intermediate values per block
+    :return: list of (first row, last row + 1)
+    """
+    n = len(a.indptr) - 1
+    if n == 0:
+        return []
+    rows = np.repeat(np.arange(n), np.diff(a.indptr))
+    cost = np.bincount(rows, weights=np.diff(b.indptr)[a.indices], minlength=n) + np.diff(a.indptr)
+    block_id = (np.cumsum(cost) - cost) // max(1, block_size)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(block_id)) + 1, [n]))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+# Compose paths a -> b for rows [start, end) of a (semiring product merged with a)
+def product_block(a, b, start, end, aggregation, criterion, pruning=None):
+    """
+    :param a: left CSR matrix
+    :param b: right CSR matrix
+    :param start: first row
+    :param end: last row + 1
+    :param aggregation: 0 (maxPath), 1 (sumPaths)
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication) or list of criteria (values have a column per criterion)
+    :param pruning: (Pruning, optional), weak paths are dropped from the block
+    :return: rows, columns and values of the block (sorted by row and column)
+    """
+    n = len(b.indptr) - 1
+    s, e = a.indptr[start], a.indptr[end]
+    rows = np.repeat(np.arange(start, end), np.diff(a.indptr[start:end + 1]))
+    cols, vals = a.indices[s:e], a.data[s:e]
+    cnt = b.indptr[cols + 1] - b.indptr[cols]  # number of paths node -> node2 -> node3 for each edge
+    total = int(cnt.sum())
+    offs = np.repeat(b.indptr[cols] - (np.cumsum(cnt) - cnt), cnt) + np.arange(total)
+    left, right = np.repeat(vals, cnt, axis=0), b.data[offs]
+    if np.isscalar(criterion):
+        w = COMBINE[criterion](left, right)  # path weight
+    else:  # column of path weights for each criterion
+        w = np.column_stack([COMBINE[c](left[:, i], right[:, i]) for i, c in enumerate(criterion)])
+    key = np.concatenate(((rows - start) * n + cols, (np.repeat(rows, cnt) - start) * n + b.indices[offs]))
+    w = np.concatenate((vals, w))
+    order = np.argsort(key, kind='stable')
+    key, w = key[order], w[order]
+    if len(key) == 0:
+        return key, key, w
+    first = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1])))
+    w = REDUCE[aggregation].reduceat(w, first, axis=0)
+    key = key[first]
+    rows, cols = key // n + start, key % n
+    if pruning is not None:
+        mask = pruning.keep(rows, w, np.where(rows != cols, pruning.size[cols] * w, 0))
+        rows, cols, w = rows[mask], cols[mask], w[mask]
+    return rows, cols, w
+
+
+# Aggregate paths using a and b (sparse version of compute_path)
+def semiring_product(a, b, aggregation, criterion, block_size=2 ** 22, out=None, pruning=None, pool=None):
+    """
+    :param a: left CSR matrix
+    :param b: right CSR matrix
+    :param aggregation: 0 (maxPath), 1 (sumPaths)
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication) or list of criteria (values have a column per criterion)
+    :param block_size: maximal number of intermediate values kept in memory
+    :param out: function out(rows, cols, values) which receives each block of results instead of the matrix
+    :param pruning: (Pruning, optional), weak paths are dropped from each block
+    :param pool: (BlockPool, optional), if defined, blocks are computed by worker processes
+    :return: CSR matrix (None if out is defined)
+    """
+    n = len(a.indptr) - 1
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indices, data = [], []
+    blocks = row_blocks(a, b, block_size)
+    if pool is not None and len(blocks) > 1:
+        results = pool_product(pool, a, b, blocks, aggregation, criterion, pruning)
+    else:
+        results = (product_block(a, b, start, end, aggregation, criterion, pruning) for start, end in blocks)
+    for (start, end), (rows, cols, w) in zip(blocks, results):
+        if out is not None:
+            out(rows, cols, w)
+            continue
+        indptr[start + 1:end + 1] = np.cumsum(np.bincount(rows - start, minlength=end - start))
+        indptr[start + 1:end + 1] += indptr[start]
+        indices.append(cols)
+        data.append(w)
+    if out is not None:
+        return None
+    if len(indices) == 0:
+        return CSR(indptr, np.zeros(0, dtype=np.int64), np.zeros((0, ) + a.data.shape[1:], dtype='d'))
+    return CSR(indptr, np.concatenate(indices), np.concatenate(data))
+
+
+# Row blocks of semiring product computed by worker processes (statistics of pruning are merged into pruning). Rows
+# of a are split into blocks, workers attach to a and b in shared memory (graphs are not pickled) and results are
+# yielded in the order of blocks, so the product is the same as the serial one. At most 2 * workers blocks are in
+# progress at once (see BlockPool)
+def pool_product(pool, a, b, blocks, aggregation, criterion, pruning=None):
+    arrays = list(a) + list(b) + ([] if pruning is None else [pruning.size])
+    params = None if pruning is None else (pruning.min_weight, pruning.top_k, pruning.rtol)
+    for rows, cols, w, dropped in pool.map(_product_block, arrays, blocks, aggregation, criterion, params):
+        if pruning is not None:
+            pruning.dropped_edges += dropped[0]
+            pruning.dropped_mass += dropped[1]
+        yield rows, cols, w
+
+
+def _product_block(arrays, aggregation, criterion, params, start, end):
+    pruning = None
+    if params is not None:
+        pruning = Pruning(*params)
+        pruning.size = arrays[6]
+    rows, cols, w = product_block(CSR(*arrays[:3]), CSR(*arrays[3:6]), start, end, aggregation, criterion, pruning)
+    return rows, cols, w, None if pruning is None else (pruning.dropped_edges, pruning.dropped_mass)
+
+
+# Find all paths of length <= path_lim (sparse version of indirect_paths)
+def semiring_paths(a, path_lim, aggregation, criterion, block_size=2 ** 22, out=None, pruning=None, profiler=None,
+                   pool=None):
+    if path_lim <= 1 or (profiler and profiler.stopped):  # path length is 1 (or composition is stopped)
+        if out is not None:
+            out(np.repeat(np.arange(len(a.indptr) - 1), np.diff(a.indptr)), a.indices, a.data)
+            return None
+        return a
+    else:  # find all paths
+        if path_lim % 2 == 0:
+            m = semiring_product(a, a, aggregation, criterion, block_size, pruning=pruning, pool=pool)
+            if profiler:
+                profiler.record('path_edges_created', len(m.data) - len(a.data))
+                profiler.progress('paths')
+            return semiring_paths(m, path_lim // 2, aggregation, criterion, block_size, out, pruning, profiler, pool)
+        else:
+            m = semiring_paths(a, path_lim - 1, aggregation, criterion, block_size, pruning=pruning,
+                               profiler=profiler, pool=pool)
+            if profiler and profiler.stopped:
+                return semiring_paths(m, 1, aggregation, criterion, block_size, out)
+            res = semiring_product(m, a, aggregation, criterion, block_size, out, pruning, pool)
+            if profiler:
+                if res is not None:
+                    profiler.record('path_edges_created', len(res.data) - len(m.data))
+                profiler.progress('paths')
+            return res
+
+
+# Sorted keys (row * n + column) and values of CSR matrix, used for edge lookups
+def sorted_edges(m):
+    """
+    :param m: CSR matrix
+    :return: sorted keys, values and positions of edges in m
+    """
+    n = len(m.indptr) - 1
+    keys = np.repeat(np.arange(n), np.diff(m.indptr)) * n + m.indices
+    order = np.argsort(keys, kind='stable')
+    return keys[order], m.data[order], order
+
+
+# Find edges by keys in sorted edges
+def find_edges(edges, keys):
+    """
+    :param edges: sorted keys and values of edges
+    :param keys: keys of edges (row * n + column)
+    :return: mask of existing edges, their weights (0 if an edge does not exist) and positions in sorted edges
+    """
+    if len(edges[0]) == 0:
+        return np.zeros(len(keys), dtype=bool), np.zeros(len(keys)), np.zeros(len(keys), dtype=np.int64)
+    pos = np.minimum(np.searchsorted(edges[0], keys), len(edges[0]) - 1)
+    found = edges[0][pos] == keys
+    return found, np.where(found, edges[1][pos], 0), pos
+
+
+# Merge values into sorted edges by maximum (keys may repeat)
+def max_merge(edges, keys, vals):
+    """
+    :param edges: sorted keys and values
+    :param keys: keys of new values
+    :param vals: new values
+    :return: sorted keys and values
+    """
+    keys, vals = np.concatenate((edges[0], keys)), np.concatenate((edges[1], vals))
+    order = np.argsort(keys, kind='stable')
+    keys, vals = keys[order], vals[order]
+    if len(keys) == 0:
+        return keys, vals
+    first = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[first], np.maximum.reduceat(vals, first)
+
+
+# Positions of row entries in the iteration order of Python set of their node names (order of compute_bipath)
+def set_positions(m, nodes):
+    """
+    :param m: CSR matrix
+    :param nodes: ordered list of nodes
+    :return: position of each entry of m in its row
+    """
+    pos = np.zeros(len(m.indices), dtype=np.int64)
+    indptr = m.indptr.tolist()
+    for i in np.flatnonzero(np.diff(m.indptr) > 1).tolist():
+        row = [nodes[j] for j in m.indices[indptr[i]:indptr[i + 1]].tolist()]
+        order = dict(zip(set(row), range(len(row))))
+        pos[indptr[i]:indptr[i + 1]] = [order[node] for node in row]
+    return pos
+
+
+# Bi-path strengths of layers a and b merged into quality (array version of create_quality)
+def bipath_quality(a, b, quality):
+    """
+    :param a: influence layer (CSR matrix)
+    :param b: dependence layer (CSR matrix)
+    :param quality: sorted keys and values of quality graph
+    :return: sorted keys and values of quality graph
+    """
+    n = len(a.indptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(a.indptr))
+    v = a.data - find_edges(sorted_edges(b), a.indices * n + rows)[1]  # a(x, y) - b(y, x)
+    keys = np.where(v > 0, rows * n + a.indices, a.indices * n + rows)
+    keys, v = keys[v != 0], np.abs(v[v != 0])
+    # edges y -> x of b without edge x -> y of a (x has adjacent nodes in a)
+    rows_b = np.repeat(np.arange(n), np.diff(b.indptr))
+    mask = (np.diff(a.indptr)[b.indices] > 0) & (b.data > 0)
+    mask[mask] = ~find_edges(sorted_edges(a), b.indices[mask] * n + rows_b[mask])[0]
+    return max_merge(quality, np.concatenate((keys, rows_b[mask] * n + b.indices[mask])),
+                     np.concatenate((v, b.data[mask])))
+
+
+# Updates of bi-paths for rows [start, end) of one layer (events of update_bipath in the order of compute_bipath)
+def bipath_block(first, second, other_first, other_second, positions, start, end, criterion):
+    """
+    :param first: first edges of paths (CSR matrix)
+    :param second: second edges of paths (CSR matrix)
+    :param other_first: sorted edges of the first layer in the other layer
+    :param other_second: sorted edges of the second layer in the other layer
+    :param positions: positions of entries of first in the order of processing (set or adjacency order)
+    :param start: first row
+    :param end: last row + 1
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication)
+    :return: dictionary of arrays: sources (x), targets (y), path weight in the layer (w0) and in the other layer
+             (w1), set position of the middle node and position of the target in the row of the middle node
+    """
+    n = len(first.indptr) - 1
+    s, e = first.indptr[start], first.indptr[end]
+    x = np.repeat(np.arange(start, end), np.diff(first.indptr[start:end + 1]))
+    mid = first.indices[s:e]
+    cnt = second.indptr[mid + 1] - second.indptr[mid]
+    offs = np.repeat(second.indptr[mid] - (np.cumsum(cnt) - cnt), cnt) + np.arange(int(cnt.sum()))
+    x, mid, y = np.repeat(x, cnt), np.repeat(mid, cnt), second.indices[offs]
+    res = {'x': x, 'y': y, 'w0': COMBINE[criterion](np.repeat(first.data[s:e], cnt), second.data[offs]),
+           'set_pos': np.repeat(positions[s:e], cnt), 'adj_pos': offs - second.indptr[mid]}
+    found1, w1 = find_edges(other_first, mid * n + x)[:2]
+    found2, w2 = find_edges(other_second, y * n + mid)[:2]
+    res['w1'] = np.where(found1 & found2, COMBINE[criterion](w1, w2), 0)
+    mask = x != y
+    return dict((key, arr[mask]) for key, arr in res.items())
+
+
+# Last written value and the first write of each edge (writes are ordered by sequence numbers)
+def last_writes(keys, seq, vals):
+    order = np.lexsort((seq, keys))
+    keys, seq, vals = keys[order], seq[order], vals[order]
+    if len(keys) == 0:
+        return keys, seq, vals
+    first = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    last = np.append(first[1:], len(keys)) - 1
+    return keys[first], seq[first], vals[last]
+
+
+# Apply writes to CSR matrix (new edges are appended to rows in the order of their first write)
+def apply_writes(m, writes):
+    """
+    :param m: CSR matrix (rows in adjacency order)
+    :param writes: keys, sequence numbers of the first write and last values (output of last_writes)
+    :return: CSR matrix
+    """
+    n = len(m.indptr) - 1
+    keys, seq, vals = last_writes(*writes)
+    edges = sorted_edges(m)
+    found, _, pos = find_edges(edges, keys)
+    data = m.data.copy()
+    data[edges[2][pos[found]]] = vals[found]
+    rows = np.concatenate((np.repeat(np.arange(n), np.diff(m.indptr)), keys[~found] // n))
+    new = np.concatenate((np.zeros(len(m.indices), dtype=np.int64), np.ones(int((~found).sum()), dtype=np.int64)))
+    order = np.lexsort((np.concatenate((np.arange(len(m.indices)), seq[~found])), new, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(rows, minlength=n))
+    return CSR(indptr, np.concatenate((m.indices, keys[~found] % n))[order],
+               np.concatenate((data, vals[~found]))[order])
+
+
+# Aggregate bi-paths using layers g0 and g1 (array version of compute_bipath)
+def compute_bipath_arrays(g0, g1, quality, criterion, nodes, block_size=2 ** 22, pool=None, adjacency=False):
+    """
+    :param g0: influence and dependence layers (CSR matrices with rows in adjacency order)
+    :param g1: influence and dependence layers (CSR matrices with rows in adjacency order)
+    :param quality: sorted keys and values of quality graph
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication)
+    :param nodes: ordered list of nodes
+    :param block_size: maximal number of paths processed at once
+    :param pool: (BlockPool, optional), if defined, paths of blocks are found by worker processes (quality and
+                 layers are updated in the order of blocks)
+    :param adjacency: if True, entries of rows are processed in adjacency order instead of set order
+    :return: new layers, quality
+    """
+    n = len(nodes)
+    edges0, edges1 = [sorted_edges(m) for m in g0], [sorted_edges(m) for m in g1]
+    positions = [np.arange(len(m.indices)) if adjacency else set_positions(m, nodes) for m in g0]
+    cost = sum(np.bincount(np.repeat(np.arange(n), np.diff(g0[i].indptr)),
+                           weights=np.diff(g1[i].indptr)[g0[i].indices], minlength=n) for i in range(2))
+    block_id = (np.cumsum(cost) - cost) // max(1, block_size)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(block_id)) + 1, [n])).tolist() if n > 0 else [0]
+    blocks = list(zip(bounds[:-1], bounds[1:]))
+    if pool is not None and len(blocks) > 1:
+        arrays = [arr for m in list(g0) + list(g1) for arr in m] + [edges[j] for edges in edges0 + edges1
+                                                                     for j in range(2)]
+        events = pool.map(_bipath_blocks, arrays + positions, blocks, criterion)
+    else:
+        events = ([bipath_block(g0[i], g1[i], edges0[1 - i], edges1[1 - i], positions[i], start, end, criterion)
+                   for i in range(2)] for start, end in blocks)
+    writes = [[], []]  # keys, sequence numbers and values written to layers
+    seq = 0
+    for ev in events:
+        x, y = np.concatenate((ev[0]['x'], ev[1]['x'])), np.concatenate((ev[0]['y'], ev[1]['y']))
+        w0, w1 = np.concatenate((ev[0]['w0'], ev[1]['w0'])), np.concatenate((ev[0]['w1'], ev[1]['w1']))
+        index = np.repeat([0, 1], [len(ev[0]['x']), len(ev[1]['x'])])
+        time = np.empty(len(x), dtype=np.int64)  # order of updates in compute_bipath
+        time[np.lexsort((np.concatenate((ev[0]['adj_pos'], ev[1]['adj_pos'])),
+                         np.concatenate((ev[0]['set_pos'], ev[1]['set_pos'])), index, x))] = np.arange(len(x))
+
+        # quality is updated if the difference of paths is greater than its current value
+        d = w0 - w1
+        key = np.where(d >= 0, x * n + y, y * n + x)
+        v = np.where(d >= 0, d, w1 - w0)
+        order = np.lexsort((time, key))
+        key, v = key[order], v[order]
+        if len(key) == 0:
+            continue
+        first = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1])))
+        seg = np.repeat(np.arange(len(first)), np.diff(np.append(first, len(key))))
+        found, current = find_edges(quality, key[first])[:2]
+        current = np.where(found, current, -1)  # -1 if there is no edge in quality
+        values, ranks = np.unique(np.concatenate((current, np.where(v > 0, v, -1))), return_inverse=True)
+        ranks = ranks.reshape(-1)
+        head = first + np.arange(len(first))  # current value is placed before updates of each edge
+        ranked = np.empty(len(key) + len(first), dtype=np.int64)
+        ranked[head] = ranks[:len(first)]
+        ranked[np.arange(len(key)) + seg + 1] = ranks[len(first):]
+        seg_all = np.repeat(np.arange(len(first)), np.diff(np.append(head, len(ranked))))
+        acc = np.maximum.accumulate(seg_all * len(values) + ranked) - seg_all * len(values)
+        prior = values[acc[np.arange(len(key)) + seg]]
+        success = np.empty(len(x), dtype=bool)
+        success[order] = v > prior
+        last = values[acc[np.append(head[1:], len(ranked)) - 1]]
+        quality = max_merge(quality, key[first][last > 0], last[last > 0])
+
+        # layers: path weights of successful updates are written (x -> y in the layer, y -> x in the other layer)
+        forward = index == 0
+        for i, keys, vals in [(0, np.where(forward, x * n + y, y * n + x), np.where(forward, w0, w1)),
+                              (1, np.where(forward, y * n + x, x * n + y), np.where(forward, w1, w0))]:
+            mask = success & (vals > 0)
+            writes[i].append(last_writes(keys[mask], seq + time[mask], vals[mask]))
+        seq += len(x)
+    layers = []
+    for m, w in zip([g0[0], g1[1]], writes):
+        w = [np.concatenate([block[j] for block in w]) if len(w) > 0 else np.zeros(0) for j in range(3)]
+        layers.append(apply_writes(m, (w[0].astype(np.int64), w[1].astype(np.int64), w[2].astype('d'))))
+    return layers, quality
+
+
+def _bipath_blocks(arrays, criterion, start, end):
+    g0, g1 = [CSR(*arrays[0:3]), CSR(*arrays[3:6])], [CSR(*arrays[6:9]), CSR(*arrays[9:12])]
+    edges0, edges1 = [arrays[12:14], arrays[14:16]], [arrays[16:18], arrays[18:20]]
+    return [bipath_block(g0[i], g1[i], edges0[1 - i], edges1[1 - i], arrays[20 + i], start, end, criterion)
+            for i in range(2)]
+
+
+# Find all bi-paths of length <= path_lim (array version of indirect_bipath)
+def bipath_arrays(layers, quality, path_lim, criterion, nodes, block_size=2 ** 22, pool=None, adjacency=False):
+    """
+    :param layers: influence and dependence layers (CSR matrices with rows in adjacency order)
+    :param quality: sorted keys and values of quality graph
+    :param path_lim: maximal path length
+    :param criterion: 0 (sum), 1 (min), 2 (multiplication)
+    :param nodes: ordered list of nodes
+    :param block_size: maximal number of paths processed at once
+    :param pool: (BlockPool, optional), if defined, paths of blocks are found by worker processes
+    :param adjacency: if True, entries of rows are processed in adjacency order instead of set order
+    :return: layers, quality
+    """
+    if path_lim == 1:  # path length is 1
+        return layers, bipath_quality(layers[0], layers[1], quality)
+    else:  # find all paths
+        if path_lim % 2 == 0:
+            res = compute_bipath_arrays(layers, layers, quality, criterion, nodes, block_size, pool, adjacency)
+            return bipath_arrays(res[0], res[1], path_lim // 2, criterion, nodes, block_size, pool, adjacency)
+        else:
+            res = bipath_arrays(layers, quality, path_lim - 1, criterion, nodes, block_size, pool, adjacency)
+            return compute_bipath_arrays(res[0], layers, res[1], criterion, nodes, block_size, pool, adjacency)
@@ -1,10 +1,12 @@
 from math import isclose
+import numpy as np
 
 
 # Calculate SRIC influence through all winning groups of fixed size (nodes: "weight, inf, id", matr: SRIC intensities)
-def define_sric(nodes, q, group_size, matr):
+def define_sric(nodes, q, group_size, matr, counters=None):
     coal = list(range(group_size))  # generate group
     n = len(nodes)  # number of adjacent nodes
+    count = 0  # number of considered groups
     if group_size == 1:  # group contains only one node
         min_element = binary_search(0, n - 1, nodes[:, 0], q)  # find element for group to be winning
         while min_element != -1 and min_element < n:
@@ -12,6 +14,7 @@ def define_sric(nodes, q, group_size, matr):
             min_element += 1
     else:  # group contains several nodes
         while coal[0] <= n - group_size:  # until all groups are not considered
+            count += 1
             w = sum(nodes[coal[:-1], 0])
             if not isclose(w, q) and w < q:  # check if group can be pivotal
                 min_value = q - w  # define minimal value for group to be winning
@@ -30,7 +33,9 @@ def define_sric(nodes, q, group_size, matr):
                             nodes[min_element, 1] += matr[nodes[min_element, 2]].get(nodes[coal[i], 2], 0) / group_size
                         min_element += 1
             coal = next_coal(coal, n - 2, group_size - 2)  # generate next group
-        nodes = define_sric(nodes, q, group_size - 1, matr)
+        if counters is not None:
+            counters['coalitions'] = counters.get('coalitions', 0) + count
+        nodes = define_sric(nodes, q, group_size - 1, matr, counters)
     return nodes
 
 
@@ -70,16 +75,93 @@ def next_coal(coal, lim, j):
 
 # Binary search of the first element '>=weight' in [left, right] segment
 def binary_search(left, right, nodes_tuple, weight):
-    v = 0
-    if left == right:
-        if nodes_tuple[left] >= weight:
-            v = left
-        else:
-            v = -1  # element not found
-    else:
+    while left < right:
         mid = left + (right - left) // 2
         if nodes_tuple[mid] >= weight:
-            v = binary_search(left, mid, nodes_tuple, weight)  # search left
+            right = mid  # search left
         else:
-            v = binary_search(mid + 1, right, nodes_tuple, weight)  # search right
-    return v
+            left = mid + 1  # search right
+    if nodes_tuple[left] >= weight:
+        return left
+    return -1  # element not found
+
+
+# Calculate SRIC influence by counting winning groups instead of enumerating them
+def count_sric(nodes, q, group_size, matr, block_size=2 ** 20):
+    """
+    Member i of a group S is pivotal if sum(S) >= q and sum(S) - w_i < q. For each group size k influence of i is
+    (matr[i][i] * N_i + sum_j matr[i][j] * N_ij) / k, where N_i (N_ij) is the number of groups of size k in which
+    i is pivotal (and which contain j). Counts are found by binary search over sorted weights and sorted sums of pairs
+    :param nodes: nodes data "weight, inf, id" sorted by weight
+    :param q: quota
+    :param group_size: maximal group size
+    :param matr: SRIC intensities
+    :param block_size: maximal number of queries evaluated at once
+    :return: nodes data with SRIC influence
+    """
+    n = len(nodes)
+    w = nodes[:, 0]
+    ids = nodes[:, 2].astype(int)
+    pos = dict(zip(ids.tolist(), range(n)))
+    pairs = np.sort((w[:, None] + w[None, :])[np.triu_indices(n, 1)]) if group_size > 2 else None
+    tol = q * 1e-9  # group weight which is close to q is treated as equal to q
+    high = q - tol  # group without pivotal member must have weight < q (and not close to q)
+    rows, cols, vals = [], [], []  # intensities between different members
+    for i in range(n):
+        for j, v in matr[ids[i]].items():
+            if j != ids[i] and j in pos:
+                rows.append(i)
+                cols.append(pos[j])
+                vals.append(v)
+    rows, cols, vals = np.array(rows, dtype=int), np.array(cols, dtype=int), np.array(vals, dtype='d')
+    diag = np.array([matr[ids[i]].get(ids[i], 0) for i in range(n)], dtype='d')
+    for k in range(group_size, 1, -1):
+        num_i = count_excluding(w, pairs, k - 1, q - tol - w, np.full(n, high), [w], block_size)
+        num_ij = count_excluding(w, pairs, k - 2, q - tol - w[rows] - w[cols], high - w[cols], [w[rows], w[cols]],
+                                 block_size)
+        nodes[:, 1] += (diag * num_i + np.bincount(rows, weights=vals * num_ij, minlength=n)) / k
+    min_element = int(np.searchsorted(w, q, side='left'))  # groups of size 1
+    for i in range(min_element, n):
+        nodes[i, 1] += matr[i][i]
+    return nodes
+
+
+# Number of groups of 'size' elements with weight in [low, high) that do not contain excluded elements
+def count_excluding(w, pairs, size, low, high, excluded, block_size=2 ** 20):
+    """
+    Inclusion-exclusion: N(V - {i}, s, R) = sum_t (-1)^t N(V, s - t, R - t * w_i)
+    :param w: sorted weights
+    :param pairs: sorted sums of pairs of weights
+    :param size: group size
+    :param low: lower bounds of group weight (array of queries)
+    :param high: upper bounds of group weight (array of queries)
+    :param excluded: list of arrays with weights of excluded elements (for each query)
+    :param block_size: maximal number of queries evaluated at once
+    :return: array of counts
+    """
+    if len(excluded) == 0:
+        return count_groups(w, pairs, size, low, high, block_size)
+    res = np.zeros(len(low))
+    for t in range(size + 1):
+        res += (-1) ** t * count_excluding(w, pairs, size - t, low - t * excluded[0], high - t * excluded[0],
+                                           excluded[1:], block_size)
+    return res
+
+
+# Number of groups of 'size' elements with weight in [low, high)
+def count_groups(w, pairs, size, low, high, block_size=2 ** 20):
+    if size == 0:
+        return ((low <= 0) & (0 < high)).astype('d')
+    elif size == 1:
+        return (np.searchsorted(w, high, side='left') - np.searchsorted(w, low, side='left')).astype('d')
+    elif size == 2:
+        return (np.searchsorted(pairs, high, side='left') - np.searchsorted(pairs, low, side='left')).astype('d')
+    res = np.zeros(len(low))
+    step = max(1, block_size // max(1, len(w)))
+    for start in range(0, len(low), step):  # N(V, s, R) = sum_x N(V - {x}, s - 1, R - w_x) / s
+        lo = (low[start:start + step, None] - w[None, :]).ravel()
+        hi = (high[start:start + step, None] - w[None, :]).ravel()
+        excl = np.tile(w, len(lo) // len(w))
+        res[start:start + step] = count_excluding(w, pairs, size - 1, lo, hi, [excl], block_size)\
+            .reshape(-1, len(w)).sum(axis=1)
+    return np.rint(res / size)
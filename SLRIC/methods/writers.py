@@ -0,0 +1,307 @@
+import gzip
+import os
+import shutil
+import tempfile
+import zipfile
+import numpy as np
+import networkx as nx
+
+# Record of binary edge list (node ids refer to the list of nodes stored with the edges)
+EDGE_DTYPE = np.dtype([('src', np.int64), ('dst', np.int64), ('weight', 'd')])
+
+NPY_HEADER_SIZE = 128  # fixed header size of streamed .npy files (the shape is written when the file is closed)
+
+
+# Define output format by filename [csv, csv.gz, npz, npy, parquet]
+def get_format(filename, format=None):
+    if format is not None:
+        return format
+    if filename.endswith('.gz'):
+        return 'csv.gz'
+    ext = os.path.splitext(filename)[1]
+    if ext in ['.npz', '.npy']:
+        return ext[1:]
+    if ext in ['.parquet', '.pq']:
+        return 'parquet'
+    return 'csv'
+
+
+# Open text file (gzip compressed if compress is True)
+def open_text(filename, mode='a+', compress=False):
+    if compress:
+        return gzip.open(filename, mode.replace('+', '')[0] + 't')
+    return open(filename, mode)
+
+
+# Header of .npy file with a given number of records (padded to NPY_HEADER_SIZE bytes)
+def npy_header(dtype, count):
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (np.lib.format.dtype_to_descr(dtype), count)
+    header = header.ljust(NPY_HEADER_SIZE - 10 - 1) + '\n'
+    return np.lib.format.MAGIC_PREFIX + b'\x01\x00' + np.uint16(len(header)).tobytes() + header.encode('latin1')
+
+
+# Name of the file with nodes of a binary edge list
+def nodes_filename(filename):
+    return os.path.splitext(filename)[0] + '_nodes.npy'
+
+
+# One-dimensional array written to .npy file by chunks
+class NpyStream:
+    def __init__(self, filename, dtype):
+        self.dtype = np.dtype(dtype)
+        self.count = 0
+        self.f = open(filename, 'wb')
+        self.f.write(npy_header(self.dtype, 0))
+
+    def write(self, arr):
+        np.ascontiguousarray(arr, dtype=self.dtype).tofile(self.f)
+        self.count += len(arr)
+
+    def close(self):
+        if not self.f.closed:
+            self.f.seek(0)
+            self.f.write(npy_header(self.dtype, self.count))
+            self.f.close()
+
+
+# Base class of edge list writers (edges are written by chunks of at most chunk_size rows)
+class EdgeWriter:
+    def __init__(self, filename, nodes=None, chunk_size=2 ** 20):
+        """
+        :param filename: filename
+        :param nodes: list of nodes (node ids of write_block refer to this list). Can be defined later
+        :param chunk_size: maximal number of rows written at once
+        """
+        self.filename = filename
+        self.nodes = nodes
+        self.chunk_size = chunk_size
+        self.count = 0  # number of written edges
+
+    def write_edges(self, edges):
+        """
+        :param edges: iterable of tuples (from, to, weight)
+        """
+        index = dict(zip(self.nodes, range(len(self.nodes))))
+        src, dst, w = [], [], []
+        for edge in edges:
+            src.append(index[edge[0]])
+            dst.append(index[edge[1]])
+            w.append(edge[2])
+            if len(src) >= self.chunk_size:
+                self.write_block(src, dst, w)
+                src, dst, w = [], [], []
+        self.write_block(src, dst, w)
+
+    def write_block(self, src, dst, w):
+        """
+        :param src: ids of sources
+        :param dst: ids of targets
+        :param w: weights
+        """
+        src, dst, w = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64), np.asarray(w, dtype='d')
+        for start in range(0, len(src), self.chunk_size):
+            end = start + self.chunk_size
+            self.write_chunk(src[start:end], dst[start:end], w[start:end])
+            self.count += len(src[start:end])
+
+    def write_chunk(self, src, dst, w):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Edge list in text format (the same as GraphQW.write_edgelist), optionally gzip compressed
+class CSVEdgeWriter(EdgeWriter):
+    def __init__(self, filename, nodes=None, chunk_size=2 ** 16, separator=';', mode='a+', compress=False,
+                 edge_name='weight', additional_attr=[], additional_headers=[]):
+        super().__init__(filename, nodes, chunk_size)
+        self.separator, self.edge_name, self.additional_attr = separator, edge_name, additional_attr
+        self.f = open_text(filename, mode, compress)
+        self.f.write(separator.join(additional_headers + ['From', 'To', 'Edge Type', 'Value']) + '\n')
+
+    def write_chunk(self, src, dst, w):
+        prefix = self.separator.join(self.additional_attr + [''])
+        self.f.write(''.join(prefix + self.separator.join([str(self.nodes[i]), str(self.nodes[j]), self.edge_name,
+                                                           str(v)]) + '\n'
+                             for i, j, v in zip(src.tolist(), dst.tolist(), w.tolist())))
+
+    def close(self):
+        self.f.close()
+
+
+# Edge list as memory-mappable .npy array of EDGE_DTYPE records (nodes are stored in nodes_filename(filename))
+class NpyEdgeWriter(EdgeWriter):
+    def __init__(self, filename, nodes=None, chunk_size=2 ** 20):
+        super().__init__(filename, nodes, chunk_size)
+        self.stream = NpyStream(filename, EDGE_DTYPE)
+
+    def write_chunk(self, src, dst, w):
+        rec = np.empty(len(src), dtype=EDGE_DTYPE)
+        rec['src'], rec['dst'], rec['weight'] = src, dst, w
+        self.stream.write(rec)
+
+    def close(self):
+        self.stream.close()
+        np.save(nodes_filename(self.filename), np.asarray(self.nodes))
+
+
+# Edge list as .npz archive of arrays src, dst, weight and nodes (columns are streamed to temporary files)
+class NpzEdgeWriter(EdgeWriter):
+    def __init__(self, filename, nodes=None, chunk_size=2 ** 20, compress=False):
+        super().__init__(filename, nodes, chunk_size)
+        self.compress = compress
+        self.tmp = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(filename)))
+        self.streams = dict((name, NpyStream(os.path.join(self.tmp, name + '.npy'), EDGE_DTYPE[name]))
+                            for name in EDGE_DTYPE.names)
+
+    def write_chunk(self, src, dst, w):
+        for name, arr in zip(EDGE_DTYPE.names, [src, dst, w]):
+            self.streams[name].write(arr)
+
+    def close(self):
+        if self.tmp is None:
+            return
+        try:
+            compression = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+            with zipfile.ZipFile(self.filename, 'w', compression=compression, allowZip64=True) as zf:
+                for name, stream in self.streams.items():
+                    stream.close()
+                    zf.write(os.path.join(self.tmp, name + '.npy'), arcname=name + '.npy')
+                with zf.open('nodes.npy', 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, np.asarray(self.nodes))
+        finally:
+            for stream in self.streams.values():
+                stream.close()
+            shutil.rmtree(self.tmp)
+            self.tmp = None
+
+
+# Edge list in Parquet format (pyarrow package), sources and targets are stored by names
+class ParquetEdgeWriter(EdgeWriter):
+    def __init__(self, filename, nodes=None, chunk_size=2 ** 20):
+        super().__init__(filename, nodes, chunk_size)
+        import pyarrow.parquet
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.writer = None
+        self.names = None
+
+    def write_chunk(self, src, dst, w):
+        if self.names is None:
+            self.names = np.asarray(self.nodes)
+        table = self.pa.table({'src': self.names[src], 'dst': self.names[dst], 'weight': w})
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.filename, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is None:  # empty edge list
+            self.write_chunk(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype='d'))
+        self.writer.close()
+
+
+# Create edge writer for a given format [csv, csv.gz, npz, npy, parquet]
+def edge_writer(filename, nodes=None, format=None, chunk_size=None, separator=';', mode='a+', edge_name='weight',
+                additional_attr=[], additional_headers=[]):
+    """
+    :param filename: filename
+    :param nodes: list of nodes (can be defined later, e.g. by indirect_paths)
+    :param format: output format (by default it is defined by file extension)
+    :param chunk_size: maximal number of rows written at once
+    :param separator: column separator (text formats)
+    :param mode: mode while opening a file (text formats)
+    :param edge_name: name of written edge attribute
+    :param additional_attr: list of additional parameters which will be appended to each line (text formats)
+    :param additional_headers: headers of additional parameters (text formats)
+    :return: EdgeWriter
+    """
+    format = get_format(filename, format)
+    if format in ['csv', 'csv.gz']:
+        return CSVEdgeWriter(filename, nodes, chunk_size or 2 ** 16, separator, mode, format == 'csv.gz', edge_name,
+                             additional_attr, additional_headers)
+    elif format == 'npy':
+        return NpyEdgeWriter(filename, nodes, chunk_size or 2 ** 20)
+    elif format == 'npz':
+        return NpzEdgeWriter(filename, nodes, chunk_size or 2 ** 20)
+    elif format == 'parquet':
+        return ParquetEdgeWriter(filename, nodes, chunk_size or 2 ** 20)
+    raise ValueError('Unknown format "%s"' % format)
+
+
+# Read binary edge list [npz, npy, parquet]
+def read_edges(filename, format=None, mmap_mode='r'):
+    """
+    :param filename: filename
+    :param format: file format (by default it is defined by file extension)
+    :param mmap_mode: memory-map mode of .npy arrays
+    :return: sources, targets, weights (node ids) and list of nodes
+    """
+    format = get_format(filename, format)
+    if format == 'npy':
+        rec = np.load(filename, mmap_mode=mmap_mode)
+        return rec['src'], rec['dst'], rec['weight'], np.load(nodes_filename(filename)).tolist()
+    elif format == 'npz':
+        with np.load(filename) as data:
+            return data['src'], data['dst'], data['weight'], data['nodes'].tolist()
+    elif format == 'parquet':
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(filename)
+        src, dst = table.column('src').to_numpy(), table.column('dst').to_numpy()
+        nodes, ids = np.unique(np.concatenate((src, dst)), return_inverse=True)
+        return ids[:len(src)], ids[len(src):], table.column('weight').to_numpy(), nodes.tolist()
+    raise ValueError('Unknown format "%s"' % format)
+
+
+# Read graph from edge list [csv, csv.gz (the layout of write_edgelist), npz, npy, parquet]
+def read_graph(filename, format=None, separator=';', edge_name='weight'):
+    """
+    :param filename: filename
+    :param format: file format (by default it is defined by file extension)
+    :param separator: column separator (text formats)
+    :param edge_name: edge attribute name (rows of other attributes are skipped in text formats)
+    :return: DiGraph (in text formats node names are strings and isolated nodes are not stored)
+    """
+    format = get_format(filename, format)
+    g = nx.DiGraph()
+    if format in ['csv', 'csv.gz']:
+        with open_text(filename, 'r', format == 'csv.gz') as f:
+            columns = None
+            for line in f:
+                row = line.rstrip('\n').split(separator)
+                if 'From' in row and 'Value' in row:  # header (repeated if several graphs were appended)
+                    columns = [row.index(name) for name in ['From', 'To', 'Edge Type', 'Value']]
+                elif columns is not None and len(row) > max(columns) and row[columns[2]] == edge_name:
+                    g.add_edge(row[columns[0]], row[columns[1]], **{edge_name: float(row[columns[3]])})
+    else:
+        src, dst, w, nodes = read_edges(filename, format)
+        g.add_nodes_from(nodes)
+        g.add_edges_from((nodes[i], nodes[j], {edge_name: v}) for i, j, v in zip(src.tolist(), dst.tolist(),
+                                                                                  w.tolist()))
+    return g
+
+
+# Write node attributes as columns [npz, parquet]
+def write_columns(filename, nodes, columns, format=None):
+    """
+    :param filename: filename
+    :param nodes: list of nodes
+    :param columns: dictionary of columns (attribute name: values aligned with nodes)
+    :param format: output format (by default it is defined by file extension)
+    """
+    format = get_format(filename, format)
+    columns = dict([('node', np.asarray(nodes))] + [(name, np.asarray(col)) for name, col in columns.items()])
+    if format == 'npz':
+        np.savez(filename, **columns)
+    elif format == 'parquet':
+        import pyarrow
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(pyarrow.table(columns), filename)
+    else:
+        raise ValueError('Format "%s" is not supported for node attributes' % format)
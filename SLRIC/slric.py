@@ -1,10 +1,20 @@
-from classes.GraphQW import GraphQW, nx
-import methods.indirect_influence as ii
-import methods.direct_influence as di
-import methods.netsim as ns
+import numpy as np
+from .classes.GraphQW import GraphQW, nx
+from .classes.CompactGraphQW import CompactGraphQW
+from .methods import indirect_influence as ii
+from .methods import direct_influence as di
+from .methods import netsim as ns
+from .methods import sparse_paths as sp
+from .methods import writers
+from .methods.lric import SampledLRIC
+from .methods.solvers import get_solver
+from .methods.profiler import Profiler, get_profiler
 
 
-def lric(graph, q=50, dq=None, group_size=None, size=None, limpath=3, models='max', data=False):
+def lric(graph, q=50, dq=None, group_size=None, size=None, limpath=3, models='max', data=False,
+         workers=None, chunk_size=None, backend='networkx', pagerank_block=None, solver=None, cache=None,
+         compact=False, min_weight=0, top_k=None, rtol=0, report=None, profiler=None, approx=False,
+         approx_degree=1000, eps=0.05, delta=0.05, graph_cache=None, path_workers=None):
     """
     LRIC centrality
     :param graph: (Graph/DiGraph), input graph (NetworkX package)
@@ -19,32 +29,279 @@ def lric(graph, q=50, dq=None, group_size=None, size=None, limpath=3, models='ma
                                       By default models = "max"
     :param data: (bool): logical scalar. If the data arguments is False, then nodes centrality is returned.
                                     Otherwise, centrality and LRIC graph is returned. By default data = false.
+    :param workers: (int, optional), number of worker processes for direct influence calculation.
+                                     By default nodes are processed serially.
+    :param chunk_size: (int, optional), number of nodes in a batch sent to a worker process.
+    :param backend: (str, optional), indirect paths implementation: 'networkx' or 'sparse' (CSR arrays).
+    :param solver: (str/Solver, optional), 0-1 solver for group search: 'native' (default) or 'glpk'.
+                                           A Solver instance keeps the number of calls and time spent in them.
+    :param cache: (InfluenceCache, optional), cache of direct influence for nodes with the same neighborhood
+                                              (can be shared by several calls).
+    :param pagerank_block: (int, optional), if defined, LRIC PageRank is computed for blocks of pagerank_block
+                                            sources at once (batched power iterations).
+    :param compact: (bool, optional), if True, graphs are stored in arrays (CompactGraphQW) instead of NetworkX
+                                      dictionaries and indirect paths are found by the sparse backend.
+    :param min_weight: (float, optional), paths weaker than min_weight are dropped during composition.
+    :param top_k: (int, optional), number of the strongest paths kept for each node during composition.
+    :param rtol: (float, optional), paths weaker than rtol * (strongest path of the node) are dropped during
+                                    composition.
+    :param report: (dict, optional), if defined, statistics of pruning (number of dropped paths, dropped and kept
+                                     centrality mass) are stored for each model.
+    :param profiler: (bool/Profiler, optional), if defined, wall time and peak memory of calculation stages and
+                                               counters of internal operations are recorded. The profiler is
+                                               returned as the last element if data = True.
+    :param approx: (bool/SampledLRIC, optional), if True, direct influence on nodes with more than approx_degree
+                                                 neighbors is estimated by sampled groups (other nodes are exact).
+                                                 Lower bounds of influence are used, maximal widths of confidence
+                                                 intervals are stored in report['approx'].
+    :param approx_degree: (int, optional), minimal in-degree of approximately evaluated nodes.
+    :param eps: (float, optional), with probability 1 - delta, less than eps of random orders of neighbors lead
+                                   to a lighter pivotal group than the found one.
+    :param delta: (float, optional), see eps.
+    :param graph_cache: (GraphCache, optional), on-disk cache of direct influence graphs. The direct influence graph
+                                               is loaded from the cache if it was evaluated for the same graph, quotas,
+                                               group size and solver (can be shared by several calls and processes).
+    :param path_workers: (int, optional), number of worker processes for composition of indirect paths (sparse
+                                          backend or compact graphs). Each composition step is split into blocks of
+                                          rows, graphs are passed to workers through shared memory.
     :return:
             ranking (dict): nodes LRIC centrality (dictionary)
-            g (GraphQW) - LRIC graph
+            g (GraphQW/CompactGraphQW) - LRIC graph
     """
     if isinstance(models, str):
         models = [models]
     if group_size is None:
         group_size = len(graph.nodes()) - 1
     ranking = dict()
-    g = di.pairwise_inf(GraphQW(graph, q, dq, group_size, size), method='LRIC')  # evaluate direct influence
+    prof = get_profiler(profiler)
+    graph_type = CompactGraphQW if compact else GraphQW
+    if approx is True:
+        approx = SampledLRIC(approx_degree, eps, delta)
+    with prof.stage('graph'):  # graph construction, quotas and sizes
+        g = graph_type(graph, q, dq, group_size, size)
+    with prof.stage('direct'):  # evaluate direct influence
+        g = di.pairwise_inf(g, method='LRIC', workers=workers, chunk_size=chunk_size, solver=solver, cache=cache,
+                            profiler=prof, approx=approx or None, graph_cache=graph_cache)
+    if approx and report is not None:
+        report['approx'] = approx.bounds
     if 'pagerank' in models:  # calculate LRIC PageRank
-        ranking = ii.indirect_pagerank(g).aggregate()
-        g.set_param('lric_pagerank', ranking)
-    if 'max' in models:  # calculate LRIC_Max
-        ranking = ii.indirect_paths(g, limpath, 0, 2).aggregate()
-        g.set_param('lric_max', ranking)
-    if 'maxmin' in models:
-        ranking = ii.indirect_paths(g, limpath, 0, 1).aggregate()
-        g.set_param('lric_maxmin', ranking)
-    if data:
-        return ranking, g
+        with prof.stage('pagerank'):
+            ranking = ii.indirect_pagerank(g.to_networkx() if compact else g, pagerank_block is not None,
+                                           block_size=pagerank_block, profiler=prof).aggregate()
+            g.set_param('lric_pagerank', ranking)
+    for model, ranking in path_models(g, models, limpath, backend, min_weight, top_k, rtol, report, prof,
+                                      path_workers):
+        g.set_param('lric_' + model, ranking)
+    return result(ranking, g, data, prof)
+
+
+# LRIC_Max and LRIC_MaxMin rankings (paths of both models are composed in one traversal if there is no pruning)
+def path_models(g, models, limpath, backend, min_weight=0, top_k=None, rtol=0, report=None, prof=None,
+                workers=None):
+    prof = get_profiler(prof)
+    criteria = [(model, criterion) for model, criterion in [('max', 2), ('maxmin', 1)] if model in models]
+    res = []
+    if len(criteria) > 1 and get_pruning(min_weight, top_k, rtol) is None:
+        with prof.stage('paths'):
+            paths = ii.indirect_paths(g, limpath, 0, [criterion for _, criterion in criteria], backend,
+                                      profiler=prof, workers=workers)
+        for (model, _), model_paths in zip(criteria, paths):
+            with prof.stage('aggregate'):
+                res.append((model, model_paths.aggregate()))
+        return res
+    for model, criterion in criteria:
+        pruning = get_pruning(min_weight, top_k, rtol)
+        with prof.stage('paths_' + model):
+            paths = ii.indirect_paths(g, limpath, 0, criterion, backend, pruning=pruning, profiler=prof,
+                                      workers=workers)
+        with prof.stage('aggregate'):
+            res.append((model, paths.aggregate()))
+        if pruning is not None and report is not None:
+            report[model] = pruning.stats(paths)
+    return res
+
+
+def lric_sweep(graph, qs=None, dqs=None, group_size=None, size=None, limpath=3, models='max', workers=None,
+               backend='networkx', solver=None, cache=None, skip=True, profiler=None):
+    """
+    LRIC centrality for several quotas (the graph and sorted neighbors of nodes are prepared once)
+    :param graph: (Graph/DiGraph), input graph (NetworkX package)
+    :param qs: (array, optional), quotas (share of weighted in-degree). Quotas are evaluated in increasing order.
+    :param dqs: (array, optional), predefined fixed thresholds (float/array/dict for each element) used instead of qs.
+    :param group_size: (int, optional), maximal group size (cardinality of coalition).
+    :param size: (float/array/dict, optional), nodes size. By default node size is equal to weighted out-degree.
+    :param limpath: (int, optional), maximal length of influence.
+    :param models: (str/array, optional), type of LRIC centrality (max, maxmin, pagerank).
+    :param workers: (int, optional), number of worker processes. Each process evaluates a range of neighboring
+                                     quotas. By default quotas are processed serially.
+    :param backend: (str, optional), indirect paths implementation: 'networkx' or 'sparse' (CSR arrays).
+    :param solver: (str/Solver, optional), 0-1 solver for group search: 'native' (default) or 'glpk'.
+    :param cache: (InfluenceCache, optional), cache of direct influence for nodes with the same neighborhood.
+    :param skip: (bool, optional), if True, direct influence on a node is reused if it cannot change between
+                                   neighboring quotas.
+    :param profiler: (bool/Profiler, optional), if defined, calculation stages and counters are recorded.
+    :return: list of rankings (one per quota). If several models are given, each element is a dictionary
+             {model: ranking}.
+    """
+    if isinstance(models, str):
+        models = [models]
+    if group_size is None:
+        group_size = len(graph.nodes()) - 1
+    if dqs is not None:
+        quotas = [(50, dq) for dq in dqs]
+        order = list(range(len(quotas)))
+    else:
+        quotas = [(q, None) for q in (qs if qs is not None else [50])]
+        order = sorted(range(len(quotas)), key=lambda i: quotas[i][0])  # neighboring quotas are evaluated in turn
+    prof = get_profiler(profiler)
+    params = (group_size, size, limpath, models, backend, solver, cache, skip)
+    if workers is None or workers <= 1 or len(order) < 2:
+        rankings = _sweep(graph, [quotas[i] for i in order], params, prof)
     else:
-        return ranking
+        chunk = -(-len(order) // workers)
+        chunks = [[quotas[i] for i in order[j:j + chunk]] for j in range(0, len(order), chunk)]
+        from concurrent.futures import ProcessPoolExecutor  # process pool is loaded if workers are used
+        rankings = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for res, report in executor.map(_sweep_batch, [graph] * len(chunks), chunks, [params] * len(chunks),
+                                            [bool(prof)] * len(chunks)):
+                rankings.extend(res)
+                for key, value in report['counters'].items():
+                    if isinstance(value, list):
+                        for v in value:
+                            prof.record(key, v)
+                    else:
+                        prof.count(key, value)
+    res = [None] * len(order)
+    for i, ranking in zip(order, rankings):
+        res[i] = ranking if len(models) > 1 else ranking[models[0]]
+    return res
+
+
+# LRIC rankings for a list of quotas evaluated in turn
+def _sweep(graph, quotas, params, prof):
+    group_size, size, limpath, models, backend, solver, cache, skip = params
+    with prof.stage('graph'):  # graph construction and sizes
+        g = GraphQW(graph, quotas[0][0], quotas[0][1], group_size, size)
+    rankings = []
+    direct = di.sweep_inf(g, quotas, solver=get_solver(solver), cache=cache, skip=skip, profiler=prof)
+    for _ in quotas:
+        with prof.stage('direct'):
+            dirgraph = next(direct)
+        ranking = dict()
+        if 'pagerank' in models:
+            with prof.stage('pagerank'):
+                ranking['pagerank'] = ii.indirect_pagerank(dirgraph).aggregate()
+        ranking.update(path_models(dirgraph, models, limpath, backend, prof=prof))
+        rankings.append(ranking)
+    return rankings
 
 
-def sric(graph, q=50, dq=None, group_size=4, size=None, data=False):
+def _sweep_batch(graph, quotas, params, profiling):
+    prof = Profiler(memory=False) if profiling else None
+    rankings = _sweep(graph, quotas, params, get_profiler(prof))
+    return rankings, prof.report() if prof else {'counters': dict()}
+
+
+def lric_disk(filename, q=50, dq=None, group_size=None, size=None, limpath=3, models='max', data=False, workdir=None,
+              memory=2 ** 28, format=None, separator=';', edge_name='weight', solver=None, cache=None, profiler=None):
+    """
+    LRIC centrality of a graph which does not fit into memory (edges are read from file and kept on disk).
+    Incoming edges are sorted and partitioned by targets in memory-mapped arrays (see DiskGraphQW), direct influence
+    is evaluated one partition at a time and spilled to disk, and paths are composed and aggregated by blocks of rows
+    within the memory budget.
+    :param filename: (str), edge list (csv, csv.gz, npz, npy or parquet, see GraphQW.write_edgelist).
+    :param q: (float, optional), quota (share of weighted in-degree). By default q = 50%.
+    :param dq: (float/array/dict, optional), predefined fixed threshold value for each node.
+    :param group_size: (int, optional), maximal group size (cardinality of coalition).
+    :param size: (float/array/dict, optional), nodes size. By default node size is equal to weighted out-degree.
+    :param limpath: (int, optional), maximal length of influence.
+    :param models: (str/array, optional), type of LRIC centrality (max, maxmin).
+    :param data: (bool), if True, centrality and DiskGraphQW of direct influence are returned (the graph keeps
+                         its files until close() is called).
+    :param workdir: (str, optional), directory of memory-mapped arrays. By default a temporary directory is used.
+    :param memory: (int, optional), memory budget in bytes. Incoming edges are split into partitions of targets
+                                    and paths are composed by blocks of rows within the budget.
+    :param format: (str, optional), file format. By default format is defined by file extension.
+    :param separator: (str, optional), column separator of text formats.
+    :param edge_name: (str, optional), edge attribute of text formats.
+    :param solver: (str/Solver, optional), 0-1 solver for group search: 'native' (default) or 'glpk'.
+    :param cache: (InfluenceCache, optional), cache of direct influence for nodes with the same neighborhood.
+    :param profiler: (bool/Profiler, optional), if defined, calculation stages and counters are recorded.
+    :return:
+            ranking (dict): nodes LRIC centrality (dictionary)
+            g (DiskGraphQW) - LRIC graph
+    """
+    if isinstance(models, str):
+        models = [models]
+    for model in models:
+        if model not in ['max', 'maxmin']:
+            raise ValueError('Model "%s" cannot be evaluated out of core' % model)
+    ranking = dict()
+    from .classes.DiskGraphQW import DiskGraphQW  # out-of-core modules are loaded on demand
+    from .methods import out_of_core as ooc
+    prof = get_profiler(profiler)
+    with prof.stage('graph'):  # partitions of incoming edges, quotas and sizes
+        g = DiskGraphQW(filename, q, dq, group_size, size, workdir, memory, format, separator, edge_name)
+    try:
+        if group_size is None:
+            g.coal = len(g) - 1
+        with prof.stage('direct'):  # evaluate direct influence by partitions
+            g = ooc.disk_inf(g, 'LRIC', solver=solver, cache=cache, profiler=prof)
+        for model, criterion in [('max', 2), ('maxmin', 1)]:
+            if model in models:  # calculate LRIC_Max and LRIC_MaxMin
+                with prof.stage('paths_' + model):
+                    m = ooc.disk_paths(g.csr, limpath, 0, criterion, g.workdir, memory, prof, 'lric_' + model)
+                with prof.stage('aggregate'):
+                    ranking = g.with_edges(m).aggregate()
+                    g.set_param('lric_' + model, ranking)
+                if m is not g.csr:
+                    ooc.remove_matrix(m)
+    finally:
+        if not data:
+            g.close()
+    return result(ranking, g, data, prof)
+
+
+def sric_disk(filename, q=50, dq=None, group_size=4, size=None, data=False, workdir=None, memory=2 ** 28,
+              format=None, separator=';', edge_name='weight', engine='auto', profiler=None):
+    """
+    SRIC centrality of a graph which does not fit into memory (see lric_disk)
+    :param filename: (str), edge list (csv, csv.gz, npz, npy or parquet, see GraphQW.write_edgelist).
+    :param q: (float, optional), quota (share of weighted in-degree). By default q = 50%.
+    :param dq: (float/array/dict, optional), predefined fixed threshold value for each node.
+    :param group_size: (int, optional), maximal group size (cardinality of coalition). By default group_size = 4.
+    :param size: (float/array/dict, optional), nodes size. By default node size is equal to weighted out-degree.
+    :param data: (bool), if True, centrality and DiskGraphQW of SRIC graph are returned.
+    :param workdir: (str, optional), directory of memory-mapped arrays. By default a temporary directory is used.
+    :param memory: (int, optional), memory budget in bytes.
+    :param format: (str, optional), file format. By default format is defined by file extension.
+    :param separator: (str, optional), column separator of text formats.
+    :param edge_name: (str, optional), edge attribute of text formats.
+    :param engine: (str, optional), SRIC engine: 'enumerate', 'count' or 'auto'.
+    :param profiler: (bool/Profiler, optional), if defined, calculation stages and counters are recorded.
+    :return:
+            ranking (dict): nodes SRIC centrality (dictionary)
+            g (DiskGraphQW) - SRIC graph
+    """
+    from .classes.DiskGraphQW import DiskGraphQW  # out-of-core modules are loaded on demand
+    from .methods import out_of_core as ooc
+    prof = get_profiler(profiler)
+    with prof.stage('graph'):  # partitions of incoming edges, quotas and sizes
+        g = DiskGraphQW(filename, q, dq, group_size, size, workdir, memory, format, separator, edge_name)
+    try:
+        with prof.stage('direct'):  # calculate SRIC graph by partitions
+            g = ooc.disk_inf(g, 'SRIC', engine=engine, profiler=prof)
+        with prof.stage('aggregate'):
+            ranking = g.aggregate(name='sric')  # calculate centrality of each node
+    finally:
+        if not data:
+            g.close()
+    return result(ranking, g, data, prof)
+
+
+def sric(graph, q=50, dq=None, group_size=4, size=None, data=False, workers=None, chunk_size=None, engine='auto',
+         compact=False, profiler=None, graph_cache=None):
     """
     SRIC centrality
     :param graph: (Graph/DiGraph), input graph (NetworkX package)
@@ -56,19 +313,36 @@ def sric(graph, q=50, dq=None, group_size=4, size=None, data=False):
                                           By default node size is equal to weighted out-degree.
     :param data: (bool): logical scalar. If the data arguments is False, then nodes centrality is returned.
                                     Otherwise, centrality and LRIC graph is returned. By default data = false.
+    :param workers: (int, optional), number of worker processes for direct influence calculation.
+                                     By default nodes are processed serially.
+    :param chunk_size: (int, optional), number of nodes in a batch sent to a worker process.
+    :param engine: (str, optional), 'enumerate' (all groups are considered), 'count' (groups are counted by their
+                                    weights) or 'auto' (the cheapest method for each node). By default engine = 'auto'.
+    :param compact: (bool, optional), if True, graphs are stored in arrays (CompactGraphQW).
+    :param profiler: (bool/Profiler, optional), if defined, wall time and peak memory of calculation stages and
+                                               counters of internal operations are recorded. The profiler is
+                                               returned as the last element if data = True.
+    :param graph_cache: (GraphCache, optional), on-disk cache of direct influence graphs. The direct influence graph
+                                               is loaded from the cache if it was evaluated for the same graph, quotas
+                                               and group size (can be shared by several calls and processes).
     :return:
             ranking (dict): nodes SRIC centrality (dictionary)
-            g (GraphQW) - SRIC graph
+            g (GraphQW/CompactGraphQW) - SRIC graph
     """
-    g = di.pairwise_inf(GraphQW(graph, q, dq, group_size, size), method='SRIC')  # calculate SRIC graph
-    ranking = g.aggregate(name='sric')  # calculate centrality of each node
-    if data:
-        return ranking, g
-    else:
-        return ranking
+    prof = get_profiler(profiler)
+    graph_type = CompactGraphQW if compact else GraphQW
+    with prof.stage('graph'):  # graph construction, quotas and sizes
+        g = graph_type(graph, q, dq, group_size, size)
+    with prof.stage('direct'):  # calculate SRIC graph
+        g = di.pairwise_inf(g, method='SRIC', workers=workers, chunk_size=chunk_size, engine=engine, profiler=prof,
+                            graph_cache=graph_cache)
+    with prof.stage('aggregate'):
+        ranking = g.aggregate(name='sric')  # calculate centrality of each node
+    return result(ranking, g, data, prof)
 
 
-def graphsim(graph1, graph2, r1=None, r2=None, eps=0.05, eps_method=1, edge_name="weight", topology_type=0):
+def graphsim(graph1, graph2, r1=None, r2=None, eps=0.05, eps_method=1, edge_name="weight", topology_type=0,
+             profiler=None, graph_cache=None):
     """
     :param graph1: graph 1
     :param graph2: graph 2
@@ -78,20 +352,84 @@ def graphsim(graph1, graph2, r1=None, r2=None, eps=0.05, eps_method=1, edge_name
     :param eps_method: method for interval construction (o - absolute, 1 - relative)
     :param edge_name: compared edge attribute
     :param topology_type: topology distance normalization method
+    :param profiler: (bool/Profiler, optional), if defined, time and memory of stages are recorded and the profiler
+                                               is returned as the last element
+    :param graph_cache: (GraphCache, optional), on-disk cache of LRIC direct influence graphs of graph1 and graph2
     :return: topology and ranking distance
     """
+    prof = get_profiler(profiler)
     if r1 is None or r2 is None:
-        res1 = lric(graph1, data=True)
-        res2 = lric(graph2, data=True)
-        rank_dist = ns.rank_dist(res1[0], res2[0], eps, eps_method)
-        top_dist = ns.top_dist(res1[1], res2[1], edge_name, topology_type)
+        with prof.stage('lric'):
+            res1 = lric(graph1, data=True, profiler=prof or None, graph_cache=graph_cache)[:2]
+            res2 = lric(graph2, data=True, profiler=prof or None, graph_cache=graph_cache)[:2]
+        with prof.stage('rank_dist'):
+            rank_dist = ns.rank_dist(res1[0], res2[0], eps, eps_method)
+        with prof.stage('top_dist'):
+            top_dist = ns.top_dist(res1[1], res2[1], edge_name, topology_type)
     else:
-        rank_dist = ns.rank_dist(r1, r2, eps, eps_method)
-        top_dist = ns.top_dist(graph1, graph2, edge_name, topology_type)
+        with prof.stage('rank_dist'):
+            rank_dist = ns.rank_dist(r1, r2, eps, eps_method)
+        with prof.stage('top_dist'):
+            top_dist = ns.top_dist(graph1, graph2, edge_name, topology_type)
+    if prof:
+        return top_dist, rank_dist, prof
     return top_dist, rank_dist
 
 
-def interdependence(graph, q=50, dq=None, group_size=None, size=None, limpath=3, model=3, data=False):
+def graphsim_batch(graphs, rankings=None, eps=0.05, eps_method=1, edge_name="weight", topology_type=0,
+                   consecutive=False, workers=None, chunk_size=None, lric_params=None, profiler=None):
+    """
+    Topology and ranking distances between graph snapshots
+    :param graphs: list of graphs or snapshot files (edge lists, see writers.read_graph)
+    :param rankings: (list, optional), rankings of graphs. If not defined, LRIC ranking and graph of each snapshot
+                                       are calculated once and compared instead of input graphs.
+    :param eps: measurement error
+    :param eps_method: method for interval construction (o - absolute, 1 - relative)
+    :param edge_name: compared edge attribute
+    :param topology_type: topology distance normalization method
+    :param consecutive: (bool, optional), if True, only consecutive snapshots are compared.
+    :param workers: (int, optional), number of worker processes for comparison of pairs of snapshots.
+    :param chunk_size: (int, optional), number of pairs in a batch sent to a worker process.
+    :param lric_params: (dict, optional), parameters of lric (e.g. q, group_size, limpath, models, workers).
+    :param profiler: (bool/Profiler, optional), if defined, time and memory of stages are recorded and the profiler
+                                               is returned as the last element
+    :return: topology and ranking distance matrices (k x k), or arrays of k - 1 distances between consecutive
+             snapshots if consecutive = True
+    """
+    prof = get_profiler(profiler)
+    results = []  # ranking and graph of each snapshot
+    with prof.stage('lric'):
+        for i, graph in enumerate(graphs):
+            if isinstance(graph, str):
+                graph = writers.read_graph(graph, edge_name=edge_name)
+            if rankings is None:
+                results.append(lric(graph, data=True, profiler=prof or None, **(lric_params or dict()))[:2])
+            else:
+                results.append((rankings[i], graph))
+    k = len(results)
+    if consecutive:
+        pairs = [(i, i + 1) for i in range(k - 1)]
+    else:
+        pairs = [(i, j) for i in range(k) for j in range(i + 1, k)]
+    with prof.stage('distances'):
+        dist = ns.pairwise_dist(results, pairs, eps, eps_method, edge_name, topology_type, workers, chunk_size)
+    prof.count('pairs', len(pairs))
+    if consecutive:
+        top_dist, rank_dist = np.array([d[0] for d in dist]), np.array([d[1] for d in dist])
+    else:
+        top_dist, rank_dist = np.zeros((k, k)), np.zeros((k, k))
+        for (i, j), d in zip(pairs, dist):
+            top_dist[i, j] = top_dist[j, i] = d[0]
+            rank_dist[i, j] = rank_dist[j, i] = d[1]
+    if prof:
+        return top_dist, rank_dist, prof
+    return top_dist, rank_dist
+
+
+def interdependence(graph, q=50, dq=None, group_size=None, size=None, limpath=3, model=3, data=False,
+                    workers=None, chunk_size=None, backend='networkx', solver=None, cache=None, min_weight=0,
+                    top_k=None, rtol=0, report=None, profiler=None, graph_cache=None, path_workers=None,
+                    adjacency=False):
     """
     Interdependence centrality
     :param graph: (Graph/DiGraph), input graph (NetworkX package)
@@ -105,6 +443,32 @@ def interdependence(graph, q=50, dq=None, group_size=None, size=None, limpath=3,
     :param model: model of indirect influence (according to the paper), By default model = 4.
     :param data: (bool): logical scalar. If the data arguments is False, then nodes centrality is returned.
                                     Otherwise, centrality and LRIC graph is returned. By default data = false.
+    :param workers: (int, optional), number of worker processes for direct influence calculation.
+                                     By default nodes are processed serially.
+    :param chunk_size: (int, optional), number of nodes in a batch sent to a worker process.
+    :param backend: (str, optional), indirect paths implementation: 'networkx' or 'sparse' (CSR arrays, for model 3
+                                     influence and dependence layers and quality graph are updated by row blocks).
+    :param solver: (str/Solver, optional), 0-1 solver for group search: 'native' (default) or 'glpk'.
+    :param cache: (InfluenceCache, optional), cache of direct influence for nodes with the same neighborhood.
+    :param min_weight: (float, optional), paths weaker than min_weight are dropped during composition
+                                          (models 1 and 2).
+    :param top_k: (int, optional), number of the strongest paths kept for each node during composition
+                                   (models 1 and 2).
+    :param rtol: (float, optional), paths weaker than rtol * (strongest path of the node) are dropped during
+                                    composition (models 1 and 2).
+    :param report: (dict, optional), if defined, statistics of pruning (number of dropped paths, dropped and kept
+                                     centrality mass) are stored.
+    :param profiler: (bool/Profiler, optional), if defined, wall time and peak memory of calculation stages and
+                                               counters of internal operations are recorded. The profiler is
+                                               returned as the last element if data = True.
+    :param graph_cache: (GraphCache, optional), on-disk cache of direct influence graphs. Direct influence and
+                                               dependence graphs are loaded from the cache if they were evaluated
+                                               for the same graph, quotas, group size and solver.
+    :param path_workers: (int, optional), number of worker processes for composition of indirect paths and bi-paths
+                                          (sparse backend). Graphs are passed to workers through shared memory.
+    :param adjacency: (bool, optional), if True, bi-paths of model 3 are updated in adjacency order of neighbors
+                                        (the result does not depend on hashes of node labels). By default neighbors
+                                        are processed in the order of Python sets.
     :return:
             ranking (dict): nodes interdependence centrality (dictionary)
             g (GraphQW) - interdependence graph
@@ -119,43 +483,123 @@ def interdependence(graph, q=50, dq=None, group_size=None, size=None, limpath=3,
         dq = [dq, dq]
     if isinstance(size, dict)or isinstance(size, float) or isinstance(size, int) or size is None:
         size = [size, size]
-    inf_g = di.pairwise_inf(GraphQW(graph, q[0], dq[0], group_size, size[0]), method='LRIC')  # define direct influence
-    dep_g = di.pairwise_inf(GraphQW(nx.reverse(graph), q[1], dq[1],
-                                    group_size, size[1]), method='LRIC')  # define direct dependence
-
-    if model == 1:  # model 1: nodes interdependence as aggregation of indirect influences
-        indirect1 = ii.indirect_paths(inf_g, limpath, 0, 2)
-        indirect2 = ii.indirect_paths(dep_g, limpath, 0, 2)
-        for edge in indirect2.edges(data=True):
-            if indirect1.has_edge(edge[0], edge[1]) and edge[2][edge_name] > indirect1[edge[0]][edge[1]][edge_name]:
-                indirect1[edge[0]][edge[1]][edge_name] = edge[2][edge_name]
-            else:
-                indirect1.add_edge(edge[0], edge[1], weight=edge[2][edge_name])
-        g = indirect1.copy()
-    elif model == 2:  # model 2: nodes interdependence based on difference of direct influences
-        for edge in dep_g.edges(data=True):
-            if inf_g.has_edge(edge[0], edge[1]):
-                inf_g[edge[0]][edge[1]][edge_name] += edge[2][edge_name]
-            else:
-                inf_g.add_edge(edge[0], edge[1], weight=edge[2][edge_name])
-        for edge in inf_g.edges(data=True):
-            v = edge[2][edge_name]
-            if inf_g.has_edge(edge[1], edge[0]):
-                v -= inf_g[edge[1]][edge[0]][edge_name]
-            if v >= 0:
-                inf_g[edge[0]][edge[1]][edge_name] = v
+    solver = get_solver(solver)  # solver statistics are collected for both layers
+    prof = get_profiler(profiler)
+    with prof.stage('graph'):  # graph construction, quotas and sizes
+        inf_g = GraphQW(graph, q[0], dq[0], group_size, size[0])
+        dep_g = GraphQW(nx.reverse(graph), q[1], dq[1], group_size, size[1])
+    with prof.stage('direct'):
+        inf_g = di.pairwise_inf(inf_g, method='LRIC', workers=workers, chunk_size=chunk_size, solver=solver,
+                                cache=cache, profiler=prof, graph_cache=graph_cache)  # define direct influence
+        dep_g = di.pairwise_inf(dep_g, method='LRIC', workers=workers, chunk_size=chunk_size, solver=solver,
+                                cache=cache, profiler=prof, graph_cache=graph_cache)  # define direct dependence
+
+    pruning = get_pruning(min_weight, top_k, rtol)
+    with prof.stage('indirect'):
+        if model == 1:  # model 1: nodes interdependence as aggregation of indirect influences
+            indirect1 = ii.indirect_paths(inf_g, limpath, 0, 2, backend, pruning=pruning, profiler=prof,
+                                          workers=path_workers)
+            indirect2 = ii.indirect_paths(dep_g, limpath, 0, 2, backend, pruning=pruning, profiler=prof,
+                                          workers=path_workers)
+            for edge in indirect2.edges(data=True):
+                if indirect1.has_edge(edge[0], edge[1]) and edge[2][edge_name] > indirect1[edge[0]][edge[1]][edge_name]:
+                    indirect1[edge[0]][edge[1]][edge_name] = edge[2][edge_name]
+                else:
+                    indirect1.add_edge(edge[0], edge[1], weight=edge[2][edge_name])
+            g = indirect1.copy()
+        elif model == 2:  # model 2: nodes interdependence based on difference of direct influences
+            for edge in dep_g.edges(data=True):
+                if inf_g.has_edge(edge[0], edge[1]):
+                    inf_g[edge[0]][edge[1]][edge_name] += edge[2][edge_name]
+                else:
+                    inf_g.add_edge(edge[0], edge[1], weight=edge[2][edge_name])
+            for edge in inf_g.edges(data=True):
+                v = edge[2][edge_name]
                 if inf_g.has_edge(edge[1], edge[0]):
-                    inf_g[edge[1]][edge[0]][edge_name] = 0
+                    v -= inf_g[edge[1]][edge[0]][edge_name]
+                if v >= 0:
+                    inf_g[edge[0]][edge[1]][edge_name] = v
+                    if inf_g.has_edge(edge[1], edge[0]):
+                        inf_g[edge[1]][edge[0]][edge_name] = 0
+                else:
+                    inf_g[edge[0]][edge[1]]['weight'] = 0
+                    inf_g[edge[1]][edge[0]]['weight'] = (-1 * v)
+                if inf_g[edge[0]][edge[1]]['weight'] > 1:
+                    inf_g[edge[0]][edge[1]]['weight'] = 1
+            g = ii.indirect_paths(inf_g, limpath, 0, 2, backend, pruning=pruning, profiler=prof,
+                                  workers=path_workers)
+        elif model == 3:  # model 3: nodes interdependence as a search for influential paths
+            if backend == 'sparse':
+                g = ii.indirect_bipath_arrays(inf_g, dep_g, limpath, workers=path_workers, adjacency=adjacency)
             else:
-                inf_g[edge[0]][edge[1]]['weight'] = 0
-                inf_g[edge[1]][edge[0]]['weight'] = (-1 * v)
-            if inf_g[edge[0]][edge[1]]['weight'] > 1:
-                inf_g[edge[0]][edge[1]]['weight'] = 1
-        g = ii.indirect_paths(inf_g, limpath, 0, 2)
-    elif model == 3:  # model 3: nodes interdependence as a search for influential paths
-        g = ii.indirect_bipath([inf_g, dep_g], ii.create_quality(inf_g, dep_g), limpath)[1]
+                g = ii.indirect_bipath([inf_g, dep_g], ii.create_quality(inf_g, dep_g), limpath,
+                                       adjacency=adjacency)[1]
+    if pruning is not None and report is not None and model in [1, 2]:
+        report.update(pruning.stats(g))
+    with prof.stage('aggregate'):
+        ranking = g.aggregate()
+    return result(ranking, g, data, prof)
+
+
+async def lric_async(graph, callback=None, timeout=None, batch_size=100, executor=None, **params):
+    """
+    LRIC centrality calculated in an executor (asyncio coroutine)
+    :param graph: (Graph/DiGraph), input graph (NetworkX package)
+    :param callback: (function, optional), callback(event) called in the event loop at the end of each stage and
+                                           after each batch of nodes and round of path composition (event contains
+                                           stage, done, total and elapsed time).
+    :param timeout: (float, optional), time budget in seconds. If it runs out, evaluation of nodes and path
+                                       composition are stopped and a partial result is returned (nodes which are
+                                       not evaluated have no incoming influence, paths are shorter than limpath).
+    :param batch_size: (int, optional), number of nodes between progress events. Cancellation of the coroutine
+                                        stops the calculation after the current batch of nodes.
+    :param executor: (ThreadPoolExecutor, optional), executor of the calculation. By default the default executor of
+                                                     the event loop is used.
+    :param params: parameters of lric (except data and profiler, TypeError is raised for them).
+    :return: (JobResult) ranking, partial (True if the time budget ran out), interrupted stage, progress of stages
+                         and profiling report
+    """
+    from .methods.jobs import run_job  # asyncio is loaded on demand
+    params = job_params(params)
+    return await run_job(lambda job: lric(graph, profiler=job, **params), callback, timeout, batch_size, executor)
+
+
+async def sric_async(graph, callback=None, timeout=None, batch_size=100, executor=None, **params):
+    """
+    SRIC centrality calculated in an executor (asyncio coroutine)
+    :param graph: (Graph/DiGraph), input graph (NetworkX package)
+    :param callback: (function, optional), callback(event) called in the event loop (see lric_async).
+    :param timeout: (float, optional), time budget in seconds. If it runs out, evaluation of nodes is stopped and
+                                       a partial result is returned.
+    :param batch_size: (int, optional), number of nodes between progress events and cancellation checks.
+    :param executor: (ThreadPoolExecutor, optional), executor of the calculation.
+    :param params: parameters of sric (except data and profiler, TypeError is raised for them).
+    :return: (JobResult) ranking, partial flag, interrupted stage, progress of stages and profiling report
+    """
+    from .methods.jobs import run_job
+    params = job_params(params)
+    return await run_job(lambda job: sric(graph, profiler=job, **params), callback, timeout, batch_size, executor)
+
+
+# Check parameters of an asynchronous job (the job defines the profiler and returns only the ranking)
+def job_params(params):
+    for name in ['data', 'profiler']:
+        if name in params:
+            raise TypeError('Parameter "%s" cannot be passed to an asynchronous job' % name)
+    return params
+
 
+# Return centrality, graph and profiler depending on data argument
+def result(ranking, g, data, profiler):
     if data:
-        return g.aggregate(), g
-    else:
-        return g.aggregate()
+        if profiler:
+            return ranking, g, profiler
+        return ranking, g
+    return ranking
+
+
+# Create pruning of weak paths (None if all paths are kept)
+def get_pruning(min_weight=0, top_k=None, rtol=0):
+    if min_weight > 0 or top_k is not None or rtol > 0:
+        return sp.Pruning(min_weight, top_k, rtol)
+    return None
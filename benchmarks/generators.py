@@ -0,0 +1,76 @@
+import random
+import networkx as nx
+
+
+# Seeded generators of weighted directed graphs for benchmarks
+
+def weights(g, seed, low=1, high=10, integer=True):
+    """
+    Assign uniform weights to edges of g
+    :param g: graph
+    :param seed: random seed
+    :param low: minimal weight
+    :param high: maximal weight
+    :param integer: if True, weights are integer
+    :return: g
+    """
+    rnd = random.Random(seed)
+    for u, v in g.edges():
+        g[u][v]['weight'] = rnd.randint(low, high) if integer else rnd.uniform(low, high)
+    return g
+
+
+def scale_free(n, seed=0):
+    """
+    Scale-free directed graph (in-degree of hubs grows with n)
+    :param n: number of nodes
+    :param seed: random seed
+    :return: DiGraph
+    """
+    g = nx.DiGraph(nx.scale_free_graph(n, seed=seed))  # parallel edges are merged
+    g.remove_edges_from(list(nx.selfloop_edges(g)))
+    return weights(g, seed)
+
+
+def erdos_renyi(n, avg_degree=4, seed=0):
+    """
+    Erdos-Renyi directed graph
+    :param n: number of nodes
+    :param avg_degree: expected in-degree of a node
+    :param seed: random seed
+    :return: DiGraph
+    """
+    g = nx.gnp_random_graph(n, min(1.0, avg_degree / max(1, n - 1)), seed=seed, directed=True)
+    return weights(g, seed)
+
+
+def heavy_tailed(n, avg_degree=4, alpha=1.5, seed=0):
+    """
+    Erdos-Renyi directed graph with Pareto-distributed edge weights
+    :param n: number of nodes
+    :param avg_degree: expected in-degree of a node
+    :param alpha: shape of Pareto distribution
+    :param seed: random seed
+    :return: DiGraph
+    """
+    g = nx.gnp_random_graph(n, min(1.0, avg_degree / max(1, n - 1)), seed=seed, directed=True)
+    rnd = random.Random(seed)
+    for u, v in g.edges():
+        g[u][v]['weight'] = rnd.paretovariate(alpha)
+    return g
+
+
+def star(n, seed=0, integer=True):
+    """
+    n sources linked to one target (node n), used for individual influence of a node
+    :param n: in-degree of the target
+    :param seed: random seed
+    :param integer: if True, weights are integer
+    :return: DiGraph
+    """
+    g = nx.DiGraph()
+    g.add_edges_from((i, n) for i in range(n))
+    return weights(g, seed, 1, 20, integer)
+
+
+GENERATORS = {'scale_free': scale_free, 'erdos_renyi': erdos_renyi, 'heavy_tailed': heavy_tailed}
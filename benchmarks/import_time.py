@@ -0,0 +1,103 @@
+"""
+Import time of the package (each case is run in a new interpreter)
+
+    python benchmarks/import_time.py --output imports.json
+    python benchmarks/import_time.py --compare imports.json --check
+
+A case imports the package and accesses some of its names. Modules which are loaded by the case are compared with
+the modules which the case must not load (the run fails with --check if such a module is loaded).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HEAVY = ['numpy', 'networkx', 'cvxopt', 'concurrent.futures.process', 'SLRIC.methods.out_of_core']
+
+# Benchmark cases: name -> (statement executed after "import SLRIC as slric", modules which must not be loaded)
+CASES = {
+    'package': ('pass', HEAVY),
+    'sric': ('slric.sric', ['cvxopt', 'concurrent.futures.process', 'SLRIC.methods.out_of_core']),
+    'lric': ('slric.lric', ['cvxopt', 'concurrent.futures.process', 'SLRIC.methods.out_of_core']),
+    'graphsim': ('slric.graphsim', ['cvxopt', 'concurrent.futures.process', 'SLRIC.methods.out_of_core']),
+    'worker': ('import SLRIC.methods.direct_influence', ['cvxopt', 'SLRIC.methods.out_of_core']),
+    'lric_disk': ('slric.lric_disk', ['cvxopt']),
+    'all': ('[getattr(slric, name) for name in dir(slric)]', ['cvxopt']),
+}
+
+CHILD = """
+import sys, time, json
+t = time.perf_counter()
+import SLRIC as slric
+%s
+t = time.perf_counter() - t
+print(json.dumps({'time': t, 'loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+
+# Run a case in a new interpreter (import time and loaded heavy modules)
+def run_case(statement):
+    out = subprocess.run([sys.executable, '-c', CHILD % (statement, HEAVY)], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def run(names=None, repeat=5, log=True):
+    """
+    :param names: list of cases (by default all cases)
+    :param repeat: number of runs of each case
+    :param log: if True, results are printed
+    :return: list of results
+    """
+    results = []
+    for name in names or list(CASES):
+        statement, forbidden = CASES[name]
+        runs = [run_case(statement) for _ in range(repeat)]
+        loaded = runs[0]['loaded']
+        res = {'case': name, 'time_min': min(r['time'] for r in runs), 'loaded': loaded,
+               'violations': [m for m in loaded if m in forbidden]}
+        results.append(res)
+        if log:
+            print('%-10s %10.4fs  loaded: %-60s %s' % (name, res['time_min'], ', '.join(loaded) or '-',
+                                                       'FAIL: ' + ', '.join(res['violations'])
+                                                       if res['violations'] else ''), flush=True)
+    return results
+
+
+# Print ratio of import times of two runs
+def compare(new, old):
+    old = dict((res['case'], res) for res in old['results'])
+    for res in new['results']:
+        if res['case'] in old:
+            print('%-10s time x%.2f' % (res['case'], res['time_min'] / max(old[res['case']]['time_min'], 1e-9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SLRIC import time')
+    parser.add_argument('--cases', nargs='*', choices=list(CASES), help='cases (default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs of each case')
+    parser.add_argument('--output', help='JSON file with results')
+    parser.add_argument('--compare', help='JSON file with results of a previous run')
+    parser.add_argument('--check', action='store_true', help='exit with an error if a case loads forbidden modules')
+    args = parser.parse_args()
+
+    results = run(args.cases, args.repeat)
+    data = {'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                     'time': time.strftime('%Y-%m-%d %H:%M:%S')},
+            'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(data, json.load(f))
+    if args.check and any(res['violations'] for res in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
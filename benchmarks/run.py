@@ -0,0 +1,265 @@
+"""
+Benchmarks of SRIC/LRIC calculation on synthetic graphs
+
+    python benchmarks/run.py --sizes 100 300 --output results.json
+    python benchmarks/run.py --output new.json --compare results.json
+
+Each case is run 'repeat' times (wall time), peak memory is measured by an additional run under tracemalloc.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import networkx as nx
+import numpy as np
+import SLRIC as slric
+from SLRIC.classes.GraphQW import GraphQW
+import SLRIC.methods.direct_influence as di
+import SLRIC.methods.indirect_influence as ii
+import SLRIC.methods.netsim as ns
+import SLRIC.methods.writers as writers
+from SLRIC.methods.lric import find_lp
+from SLRIC.methods.sric import define_sric, generate_sric_matrix
+from SLRIC.methods.solvers import get_solver
+from generators import GENERATORS, star
+
+SIZES = [100, 300, 1000]  # number of nodes of synthetic graphs
+DEGREES = [10, 20, 40]  # in-degree of a node for individual influence
+INDIVIDUAL = ['individual_lric', 'find_lp', 'define_sric']  # cases which use a single target instead of a graph
+
+
+# Input of individual_lric and find_lp (quota is a half of total weight of group_size strongest neighbors)
+def lric_input(n, group_size, seed):
+    g = star(n, seed, integer=False)
+    adj_links = list(g.in_edges(n, data=True))
+    quota = sum(sorted(link[2]['weight'] for link in adj_links)[-group_size:]) / 2
+    nodes_tuple = sorted([link[2]['weight'], i, quota - link[2]['weight'], quota, 0, 0]
+                         for i, link in enumerate(adj_links))
+    nodes_tuple = np.asarray(nodes_tuple)
+    nodes_tuple[:, 5] = range(len(nodes_tuple))
+    return adj_links, quota, nodes_tuple
+
+
+# Input of define_sric (sorted neighbors of a star target with complete graph between them)
+def sric_input(n, seed):
+    g = star(n, seed)
+    for i in range(n):
+        for j in range(i + 1, n):
+            g.add_edge(i, j, weight=1)
+    indeg = g.in_degree(n, weight='weight')
+    nodes_tuple = sorted([g[i][n]['weight'], 0, i] for i in range(n))
+    nodes_id = dict(zip(range(n), range(n)))
+    matr = generate_sric_matrix(g.subgraph(range(n + 1)), nodes_id, n, indeg)
+    return np.array(nodes_tuple, dtype='d'), indeg / 2, matr
+
+
+def direct_graph(g, group_size=3):
+    return di.pairwise_inf(GraphQW(g, 50, None, group_size, None), 'LRIC')
+
+
+# Benchmark cases: name -> (sizes, function which returns a callable without arguments, list of parameters)
+def cases(sizes, degrees):
+    res = dict()
+    res['lric'] = (sizes, lambda g, p: lambda: slric.lric(g, group_size=p['group_size'], models=p['models'],
+                                                          limpath=p['limpath']),
+                   [{'models': 'max', 'limpath': 2, 'group_size': 3}, {'models': 'max', 'limpath': 3, 'group_size': 3},
+                    {'models': 'max', 'limpath': 4, 'group_size': 3}, {'models': 'max', 'limpath': 3, 'group_size': 5},
+                    {'models': 'maxmin', 'limpath': 3, 'group_size': 3},
+                    {'models': ['max', 'maxmin'], 'limpath': 3, 'group_size': 3},
+                    {'models': 'pagerank', 'limpath': 3, 'group_size': 3}])
+    res['lric_sweep'] = (sizes, lambda g, p: lambda: slric.lric_sweep(g, qs=p['qs'], group_size=3, skip=p['skip']),
+                         [{'qs': [30, 40, 50, 60, 70], 'skip': True}, {'qs': [30, 40, 50, 60, 70], 'skip': False}])
+    res['lric_approx'] = (sizes, lambda g, p: lambda: slric.lric(g, q=10, group_size=p['group_size'], approx=True,
+                                                                 approx_degree=p['approx_degree']),
+                          [{'group_size': 3, 'approx_degree': 20}, {'group_size': 5, 'approx_degree': 20}])
+    res['graph_cache'] = (sizes, lambda g, p: graph_cache(g, p['models']), [{'models': 'max'}, {'models': 'maxmin'}])
+    res['lric_disk'] = (sizes, lambda g, p: lric_disk(g, p['memory']), [{'memory': 2 ** 16}, {'memory': 2 ** 24}])
+    res['sric'] = (sizes, lambda g, p: lambda: slric.sric(g, group_size=p['group_size']),
+                   [{'group_size': 3}, {'group_size': 4}])
+    res['interdependence'] = (sizes, lambda g, p: lambda: slric.interdependence(g, group_size=3, model=p['model'],
+                                                                                backend=p['backend']),
+                              [{'model': 1, 'backend': 'networkx'}, {'model': 2, 'backend': 'networkx'},
+                               {'model': 3, 'backend': 'networkx'}, {'model': 3, 'backend': 'sparse'}])
+    res['graphsim'] = (sizes, lambda g, p: graphsim(g), [{}])
+    res['compute_path'] = (sizes, lambda g, p: compute_path(g, p['criterion']), [{'criterion': 2}, {'criterion': 1}])
+    res['path_workers'] = (sizes, lambda g, p: path_workers(g, p['workers']),
+                           [{'workers': None}, {'workers': 2}, {'workers': 4}])
+    res['indirect_pagerank'] = (sizes, lambda g, p: pagerank(g), [{}])
+    res['rank_dist'] = (sizes, lambda g, p: rank_dist(g, p['engine']), [{'engine': 'sorted'}, {'engine': 'sets'}])
+    res['top_dist'] = (sizes, lambda g, p: top_dist(g, p['topology_type'], p['engine']),
+                       [{'topology_type': 0, 'engine': 'sparse'}, {'topology_type': 1, 'engine': 'sparse'},
+                        {'topology_type': 0, 'engine': 'neighbors'}])
+    res['individual_lric'] = (degrees, lambda n, p: individual_lric(n, p['group_size'], p['solver']),
+                              [{'group_size': 3, 'solver': 'native'}, {'group_size': 5, 'solver': 'native'},
+                               {'group_size': 3, 'solver': 'glpk'}])
+    res['find_lp'] = (degrees, lambda n, p: lp(n, p['group_size'], p['solver']),
+                      [{'group_size': 3, 'solver': 'native'}, {'group_size': 3, 'solver': 'glpk'}])
+    res['define_sric'] = (degrees, lambda n, p: sric_groups(n, p['group_size']), [{'group_size': 3},
+                                                                                   {'group_size': 4}])
+    return res
+
+
+def second(g):  # the same graph with 10% of edges removed
+    g2 = g.copy()
+    g2.remove_edges_from(list(g.edges())[::10])
+    return g2
+
+
+def graphsim(g):  # rankings are given (graphsim evaluates LRIC with unbounded group size otherwise)
+    g2 = second(g)
+    r1, r2 = slric.lric(g, group_size=3), slric.lric(g2, group_size=3)
+    return lambda: slric.graphsim(g, g2, r1, r2)
+
+
+def compute_path(g, criterion):
+    g = direct_graph(g)
+    return lambda: ii.compute_path(g, g, 0, criterion)
+
+
+def path_workers(g, workers):  # paths are composed by blocks of 2 ** 16 values (several blocks per step)
+    g = direct_graph(g)
+    return lambda: ii.indirect_paths(g, 3, 0, 2, 'sparse', block_size=2 ** 16, workers=workers)
+
+
+def pagerank(g):
+    g = direct_graph(g)
+    return lambda: ii.indirect_pagerank(g)
+
+
+def graph_cache(g, models):  # direct influence graph is stored in a temporary cache by the first call
+    cache = slric.GraphCache(tempfile.mkdtemp())
+    slric.lric(g, group_size=3, graph_cache=cache)
+    return lambda: slric.lric(g, group_size=3, models=models, graph_cache=cache)
+
+
+def lric_disk(g, memory):  # edge list is written to a temporary .npy file
+    filename = os.path.join(tempfile.mkdtemp(), 'edges.npy')
+    with writers.edge_writer(filename, list(g.nodes())) as writer:
+        writer.write_edges(g.edges(data='weight'))
+    return lambda: slric.lric_disk(filename, group_size=3, memory=memory)
+
+
+def rank_dist(g, engine):
+    r1 = slric.lric(g, group_size=3)
+    r2 = slric.lric(second(g), group_size=3)
+    return lambda: ns.rank_dist(r1, r2, 0.05, 1, engine)
+
+
+def top_dist(g, topology_type, engine):
+    g1, g2 = direct_graph(g), direct_graph(second(g))
+    return lambda: ns.top_dist(g1, g2, 'weight', topology_type, engine)
+
+
+def individual_lric(n, group_size, solver):
+    adj_links, quota, _ = lric_input(n, group_size, 0)
+    solver = get_solver(solver)
+    return lambda: di.individual_lric(adj_links, quota, group_size, solver)
+
+
+def lp(n, group_size, solver):
+    _, _, nodes_tuple = lric_input(n, group_size, 0)
+    solver = get_solver(solver)
+    return lambda: find_lp(nodes_tuple.copy(), len(nodes_tuple) // 2, group_size - 1, dict(), solver)
+
+
+def sric_groups(n, group_size):
+    nodes_tuple, q, matr = sric_input(n, 0)
+    return lambda: define_sric(nodes_tuple.copy(), q, group_size, matr)
+
+
+# Measure wall time (repeat runs) and peak memory (one run under tracemalloc)
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'time_min': min(times), 'time_median': statistics.median(times), 'peak_memory': peak}
+
+
+def run(names=None, generators=None, sizes=None, degrees=None, repeat=3, seed=0, log=True):
+    """
+    :param names: list of benchmark cases (by default all cases)
+    :param generators: list of graph generators (by default all generators)
+    :param sizes: numbers of nodes of synthetic graphs
+    :param degrees: in-degrees of a node (individual influence cases)
+    :param repeat: number of runs for wall time
+    :param seed: random seed of generators
+    :param log: if True, results are printed
+    :return: list of results
+    """
+    all_cases = cases(sizes or SIZES, degrees or DEGREES)
+    results = []
+    for name in names or list(all_cases):
+        case_sizes, setup, params = all_cases[name]
+        graph_case = name not in INDIVIDUAL
+        for gen in (generators or list(GENERATORS)) if graph_case else ['star']:
+            for n in case_sizes:
+                for p in params:
+                    func = setup(GENERATORS[gen](n, seed=seed) if graph_case else n, p)
+                    res = {'case': name, 'generator': gen, 'n': n, 'params': p, 'seed': seed}
+                    res.update(measure(func, repeat))
+                    results.append(res)
+                    if log:
+                        print('%-18s %-13s n=%-6d %-40s %10.4fs %10.1fKB' % (
+                            name, gen, n, json.dumps(p), res['time_min'], res['peak_memory'] / 1024), flush=True)
+    return results
+
+
+def key(res):
+    return res['case'], res['generator'], res['n'], json.dumps(res['params'], sort_keys=True)
+
+
+# Print ratio of times and memory of two runs
+def compare(new, old):
+    old = dict((key(res), res) for res in old['results'])
+    for res in new['results']:
+        if key(res) in old:
+            base = old[key(res)]
+            print('%-18s %-13s n=%-6d %-40s time x%.2f memory x%.2f' % (
+                res['case'], res['generator'], res['n'], json.dumps(res['params']),
+                res['time_min'] / max(base['time_min'], 1e-9), res['peak_memory'] / max(base['peak_memory'], 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SRIC/LRIC benchmarks')
+    parser.add_argument('--cases', nargs='*', help='benchmark cases (default: all)')
+    parser.add_argument('--generators', nargs='*', choices=list(GENERATORS), help='graph generators (default: all)')
+    parser.add_argument('--sizes', nargs='*', type=int, help='numbers of nodes (default: %s)' % SIZES)
+    parser.add_argument('--degrees', nargs='*', type=int, help='in-degrees of a node (default: %s)' % DEGREES)
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs for wall time')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of generators')
+    parser.add_argument('--output', help='JSON file with results')
+    parser.add_argument('--compare', help='JSON file with results of a previous run')
+    args = parser.parse_args()
+
+    results = run(args.cases, args.generators, args.sizes, args.degrees, args.repeat, args.seed)
+    data = {'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                     'numpy': np.__version__, 'networkx': nx.__version__,
+                     'time': time.strftime('%Y-%m-%d %H:%M:%S')},
+            'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(data, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,8 @@ import SLRIC
 setup(
     name='slric',
     version=SLRIC.__version__,
-    packages=find_packages(),
+    packages=['slric'] + ['slric.' + p for p in find_packages('SLRIC')],
+    package_dir={'slric': 'SLRIC'},
     url='https://github.com/SergSHV/slric',
     license='BSD 3-clause "New" or "Revised License"',
     author='Fuad Aleskerov, Natalia Meshcheryahkova, Sergey Shvydun(*)',
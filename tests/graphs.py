@@ -0,0 +1,47 @@
+import numpy as np
+import networkx as nx
+
+
+# Random weighted graph with integer weights (seeded)
+def weighted_graph(n=12, m=30, seed=0, directed=True, low=1, high=10):
+    """
+    :param n: number of nodes
+    :param m: number of edges
+    :param seed: random seed
+    :param directed: if True, DiGraph is returned
+    :param low: minimal weight
+    :param high: maximal weight
+    :return: graph with 'weight' edge attribute
+    """
+    g = nx.gnm_random_graph(n, m, seed=seed, directed=directed)
+    rng = np.random.default_rng(seed)
+    for u, v in g.edges():
+        g[u][v]['weight'] = int(rng.integers(low, high + 1))
+    return g
+
+
+# Check that two rankings are equal up to rounding errors
+def assert_ranking(res, expected, tol=1e-9):
+    assert set(res) == set(expected)
+    for node in expected:
+        assert abs(res[node] - expected[node]) <= tol, (node, res[node], expected[node])
+
+
+# Edges of a graph and their weights
+def edge_weights(g, name='weight'):
+    return dict(((edge[0], edge[1]), edge[2]) for edge in g.edges(data=name))
+
+
+# Check that two graphs have the same edges and weights
+def assert_edges(res, expected, tol=1e-9):
+    res, expected = edge_weights(res), edge_weights(expected)
+    assert set(res) == set(expected)
+    for edge in expected:
+        assert abs(res[edge] - expected[edge]) <= tol, (edge, res[edge], expected[edge])
+
+
+# LRIC direct influence graph of a random graph
+def lric_graph(n=20, m=70, seed=0, group_size=3):
+    from SLRIC.classes.GraphQW import GraphQW
+    import SLRIC.methods.direct_influence as di
+    return di.pairwise_inf(GraphQW(weighted_graph(n, m, seed), 50, None, group_size, None), 'LRIC')
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import SLRIC as slric
+import SLRIC.methods.direct_influence as di
+from SLRIC.methods.lric import SampledLRIC
+from .graphs import weighted_graph, assert_ranking
+
+
+# Incoming links of a node with many random neighbors
+def star_links(n, seed):
+    rng = np.random.default_rng(seed)
+    return [(i, n, {'weight': float(w)}) for i, w in enumerate(rng.uniform(1, 10, n))]
+
+
+@pytest.mark.parametrize('group_size', [2, 3, 4])
+@pytest.mark.parametrize('share', [0.05, 0.2, 0.5])
+@pytest.mark.parametrize('seed', range(5))
+def test_bounds(group_size, share, seed):
+    links = star_links(14, seed)
+    quota = share * sum(link[2]['weight'] for link in links)
+    exact = di.individual_lric(links, quota, group_size)
+    approx, width = di.approx_lric(links, quota, group_size, SampledLRIC(min_degree=1, eps=0.2))
+    assert set(approx) <= set(exact)
+    for node, value in exact.items():  # found values are lower bounds, the exact value is within the interval
+        assert approx.get(node, 0) <= value + 1e-12
+        assert value <= approx.get(node, 0) + width + 1e-12
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_exact_nodes(seed):
+    g = weighted_graph(15, 80, seed)
+    report = dict()
+    res = slric.lric(g, q=10, group_size=3, approx=True, approx_degree=len(g), report=report)
+    assert_ranking(res, slric.lric(g, q=10, group_size=3))
+    assert report['approx'] == dict()
+
+
+def test_workers():
+    g = weighted_graph(15, 120, 5)
+    params = {'q': 10, 'group_size': 3, 'approx': True, 'approx_degree': 5}
+    report1, report2 = dict(), dict()
+    assert_ranking(slric.lric(g, workers=2, report=report2, **params), slric.lric(g, report=report1, **params))
+    assert report1['approx'] == report2['approx'] and len(report1['approx']) > 0
@@ -0,0 +1,54 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import SLRIC as slric
+from .graphs import weighted_graph, assert_ranking
+
+
+@pytest.mark.parametrize('models', ['max', ['max', 'maxmin'], 'pagerank'])
+def test_lric(models):
+    g = weighted_graph(20, 70, 1)
+    res = asyncio.run(slric.lric_async(g, models=models, group_size=3))
+    assert not res.partial and res.interrupted is None
+    assert_ranking(res.ranking, slric.lric(g, models=models, group_size=3))
+    done, total = res.progress['direct']
+    assert done == total
+
+
+def test_sric():
+    g = weighted_graph(20, 70, 2)
+    events = []
+    res = asyncio.run(slric.sric_async(g, callback=events.append, batch_size=5))
+    assert_ranking(res.ranking, slric.sric(g))
+    assert 'direct' in res.report['stages']
+    progress = [event for event in events if event.get('stage') == 'direct' and 'done' in event]
+    assert len(progress) >= 2 and progress[-1]['done'] == progress[-1]['total']
+
+
+@pytest.mark.parametrize('name', ['data', 'profiler'])
+def test_job_params(name):
+    with pytest.raises(TypeError):
+        asyncio.run(slric.lric_async(weighted_graph(), **{name: True}))
+    with pytest.raises(TypeError):
+        asyncio.run(slric.sric_async(weighted_graph(), **{name: True}))
+
+
+def test_timeout():
+    g = weighted_graph(20, 70, 3)
+    res = asyncio.run(slric.lric_async(g, timeout=0, batch_size=1))
+    assert res.partial and res.interrupted is not None
+    assert set(res.ranking) == set(g)  # nodes which are not evaluated have no incoming influence
+
+
+def test_cancel():
+    g = weighted_graph(40, 400, 4)
+    executor = ThreadPoolExecutor(1)
+
+    async def cancelled():
+        task = asyncio.ensure_future(slric.lric_async(g, callback=lambda event: task.cancel(), batch_size=1,
+                                                      executor=executor))
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled())
+    executor.shutdown(wait=True)  # the calculation stops after the current batch of nodes
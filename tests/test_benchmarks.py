@@ -0,0 +1,33 @@
+import importlib.util
+import os
+import networkx as nx
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks')
+
+
+# Load module of benchmarks directory (benchmarks are not a package)
+def load(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(BENCHMARKS, name + '.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('name', ['scale_free', 'erdos_renyi', 'heavy_tailed', 'star'])
+def test_generators(name):
+    generators = load('generators')
+    generator = generators.GENERATORS.get(name, generators.star)
+    g1, g2 = generator(50, seed=1), generator(50, seed=1)
+    assert nx.utils.graphs_equal(g1, g2)  # the same seed gives the same graph
+    assert all(w > 0 for _, _, w in g1.edges(data='weight'))
+
+
+def test_run():
+    pytest.importorskip('cvxopt')  # glpk solver cases
+    run = load('run')
+    results = run.run(sizes=[30], degrees=[6], repeat=1, log=False)
+    assert set(res['case'] for res in results) == set(run.cases([30], [6]))
+    for res in results:
+        assert res['time_min'] >= 0 and res['peak_memory'] > 0
+    assert sorted(run.key(res) for res in results) == sorted(set(run.key(res) for res in results))
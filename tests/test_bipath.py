@@ -0,0 +1,70 @@
+import networkx as nx
+import pytest
+import SLRIC as slric
+import SLRIC.methods.direct_influence as di
+import SLRIC.methods.indirect_influence as ii
+from SLRIC.classes.GraphQW import GraphQW
+from .graphs import weighted_graph, assert_edges, assert_ranking
+
+# Interdependence (model 3) of weighted_graph(12, 40, seed) with group_size=3, calculated by version 1.1.6 (neighbors
+# of bi-paths are processed in the order of Python sets of integer labels)
+BASELINE = {
+    0: {0: 0.055918632262508, 1: 0.08518150356064, 2: 0.034074690444141, 3: 0.080921201505275, 4: 0.151588293582153,
+        5: 0.096720990062826, 6: 0.021201808614318, 7: 0.096864711766288, 8: 0.138419278925073, 9: 0.138462260406924,
+        10: 0.027551865031983, 11: 0.07309476383787},
+    1: {0: 0.130795413820648, 1: 0.074453301227681, 2: 0.063205827864536, 3: 0.144419120832206, 4: 0.095506786677351,
+        5: 0.046541518543465, 6: 0.043828584834193, 7: 0.078207296155666, 8: 0.04174656746478, 9: 0.092126172473393,
+        10: 0.09448042174066, 11: 0.094688988365421},
+    2: {0: 0.0, 1: 0.0, 2: 0.124447473784072, 3: 0.060239432651065, 4: 0.045671059120573, 5: 0.147166191011906,
+        6: 0.031908178339509, 7: 0.103318918646046, 8: 0.18961766614766, 9: 0.066100510072223, 10: 0.142655640969881,
+        11: 0.088874929257066},
+    3: {0: 0.063330662465501, 1: 0.033929381976341, 2: 0.068113522629561, 3: 0.177283628290246, 4: 0.082119165334514,
+        5: 0.055694528555929, 6: 0.061348836930038, 7: 0.104661164640733, 8: 0.043480502861153, 9: 0.142641225534606,
+        10: 0.074574919409511, 11: 0.092822461371867},
+    4: {0: 0.030438265380038, 1: 0.094947370236278, 2: 0.062858116860134, 3: 0.12705229218318, 4: 0.130347308142077,
+        5: 0.070245954489623, 6: 0.109656555363502, 7: 0.055437880686774, 8: 0.053375320581817, 9: 0.099287887481377,
+        10: 0.051624877009101, 11: 0.114728171586099},
+}
+
+
+# Influence and dependence layers of a random graph (the same as in interdependence)
+def layers(seed, n=15, m=45):
+    g = weighted_graph(n, m, seed)
+    return [di.pairwise_inf(GraphQW(graph, 50, None, 3, None), 'LRIC') for graph in [g, nx.reverse(g)]]
+
+
+@pytest.mark.parametrize('criterion', [0, 1, 2])
+@pytest.mark.parametrize('path_lim', [1, 2, 3, 4])
+@pytest.mark.parametrize('block_size', [1, 2 ** 22])
+@pytest.mark.parametrize('seed', range(3))
+def test_arrays(criterion, path_lim, block_size, seed):
+    inf_g, dep_g = layers(seed)
+    res = ii.indirect_bipath_arrays(inf_g, dep_g, path_lim, criterion, block_size=block_size)
+    expected = ii.indirect_bipath([inf_g.copy(), dep_g.copy()], ii.create_quality(inf_g, dep_g), path_lim,
+                                  criterion)[1]
+    assert_edges(res, expected)
+
+
+@pytest.mark.parametrize('limpath', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(3))
+def test_interdependence(limpath, seed):
+    g = weighted_graph(15, 45, seed + 10)
+    assert_ranking(slric.interdependence(g, group_size=3, limpath=limpath, model=3, backend='sparse'),
+                   slric.interdependence(g, group_size=3, limpath=limpath, model=3))
+
+
+@pytest.mark.parametrize('backend', ['networkx', 'sparse'])
+@pytest.mark.parametrize('seed', sorted(BASELINE))
+def test_baseline(backend, seed):
+    res = slric.interdependence(weighted_graph(12, 40, seed), group_size=3, backend=backend)
+    assert_ranking(res, BASELINE[seed], tol=1e-12)
+
+
+@pytest.mark.parametrize('path_lim', [2, 3, 4])
+@pytest.mark.parametrize('seed', range(3))
+def test_adjacency_order(path_lim, seed):
+    inf_g, dep_g = layers(seed)
+    res = ii.indirect_bipath_arrays(inf_g, dep_g, path_lim, block_size=7, adjacency=True)
+    expected = ii.indirect_bipath([inf_g.copy(), dep_g.copy()], ii.create_quality(inf_g, dep_g), path_lim,
+                                  adjacency=True)[1]
+    assert_edges(res, expected)
@@ -0,0 +1,24 @@
+import pytest
+import SLRIC as slric
+import SLRIC.methods.direct_influence as di
+from SLRIC.classes.GraphQW import GraphQW
+from .graphs import weighted_graph, assert_ranking, edge_weights
+
+
+@pytest.mark.parametrize('maxsize', [1, 100000])
+@pytest.mark.parametrize('workers', [None, 2])
+def test_influence_cache(maxsize, workers):
+    g = GraphQW(weighted_graph(30, 120, 10, high=2), 50, None, 3, None)  # equal neighborhoods are frequent
+    cache = slric.InfluenceCache(maxsize)
+    res = di.pairwise_inf(g, 'LRIC', cache=cache, workers=workers)
+    assert edge_weights(res) == edge_weights(di.pairwise_inf(g, 'LRIC'))
+    assert len(cache) <= maxsize
+    if maxsize > 1:
+        assert cache.stats()['hits'] > 0  # hits of worker processes are merged
+
+
+def test_shared_cache():
+    cache = slric.InfluenceCache()
+    for seed in range(3):  # the cache is shared by calls for different graphs
+        g = weighted_graph(20, 60, seed, high=3)
+        assert_ranking(slric.lric(g, group_size=3, cache=cache), slric.lric(g, group_size=3))
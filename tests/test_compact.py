@@ -0,0 +1,35 @@
+import networkx as nx
+import pytest
+import SLRIC as slric
+from .graphs import weighted_graph, assert_ranking
+
+
+# Random graph with edges inserted in order of their ends (compact graphs store incoming edges sorted by sources,
+# and SRIC of single-member groups depends on the order of neighbors)
+def sorted_graph(n, m, seed):
+    g = weighted_graph(n, m, seed)
+    res = nx.DiGraph()
+    res.add_nodes_from(sorted(g))
+    res.add_edges_from(sorted(g.edges(data=True)))
+    return res
+
+
+@pytest.mark.parametrize('models', ['max', 'maxmin', 'pagerank', ['max', 'maxmin']])
+@pytest.mark.parametrize('seed', range(3))
+def test_lric(models, seed):
+    g = sorted_graph(20, 70, seed)
+    assert_ranking(slric.lric(g, q=50, models=models, compact=True), slric.lric(g, q=50, models=models))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_sric(seed):
+    g = sorted_graph(20, 70, seed)
+    assert_ranking(slric.sric(g, q=50, compact=True), slric.sric(g, q=50))
+    assert_ranking(slric.sric(g, dq=5, size=1, compact=True), slric.sric(g, dq=5, size=1))
+
+
+def test_string_labels():
+    g = sorted_graph(15, 50, 4)
+    g = nx.relabel_nodes(g, dict((node, 'n%02d' % node) for node in g))
+    assert_ranking(slric.lric(g, compact=True), slric.lric(g))
+    assert_ranking(slric.sric(g, compact=True), slric.sric(g))
@@ -0,0 +1,21 @@
+import pytest
+import SLRIC as slric
+import SLRIC.methods.direct_influence as di
+from SLRIC.classes.GraphQW import GraphQW
+from .graphs import weighted_graph, assert_ranking, edge_weights
+
+
+@pytest.mark.parametrize('method', ['LRIC', 'SRIC'])
+@pytest.mark.parametrize('chunk_size', [None, 1])
+def test_workers(method, chunk_size):
+    g = GraphQW(weighted_graph(20, 70, 1), 50, None, 3, None)
+    serial = di.pairwise_inf(g, method)
+    parallel = di.pairwise_inf(g, method, workers=2, chunk_size=chunk_size)
+    assert edge_weights(parallel) == edge_weights(serial)
+    assert list(parallel.edges()) == list(serial.edges())  # results are collected in the order of nodes
+
+
+def test_workers_centrality():
+    g = weighted_graph(20, 70, 2)
+    assert_ranking(slric.lric(g, group_size=3, workers=2), slric.lric(g, group_size=3), tol=0)
+    assert_ranking(slric.sric(g, workers=2), slric.sric(g), tol=0)
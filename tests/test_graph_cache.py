@@ -0,0 +1,90 @@
+import os
+import time
+import networkx as nx
+import numpy as np
+import pytest
+import SLRIC as slric
+import SLRIC.methods.direct_influence as di
+from SLRIC.classes.GraphQW import GraphQW
+from SLRIC.classes.CompactGraphQW import CompactGraphQW
+from SLRIC.methods.solvers import GLPKSolver, SubsetSumSolver
+from .graphs import weighted_graph, assert_ranking
+
+
+# The same graph with nodes and edges inserted in another order
+def shuffled(g, seed):
+    rng = np.random.default_rng(seed)
+    res = nx.DiGraph()
+    nodes, edges = list(g.nodes()), list(g.edges(data=True))
+    res.add_nodes_from([nodes[i] for i in rng.permutation(len(nodes))])
+    res.add_edges_from([edges[i] for i in rng.permutation(len(edges))])
+    return res
+
+
+@pytest.mark.parametrize('compact', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_lric(tmp_path, compact, seed):
+    g = weighted_graph(20, 70, seed)
+    cache = slric.GraphCache(str(tmp_path))
+    expected = slric.lric(g, models=['max', 'maxmin'], compact=compact)
+    assert_ranking(slric.lric(g, models=['max', 'maxmin'], compact=compact, graph_cache=cache), expected)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert_ranking(slric.lric(g, models=['max', 'maxmin'], compact=compact, graph_cache=cache), expected)
+    assert_ranking(slric.lric(shuffled(g, seed), models=['max', 'maxmin'], compact=compact, graph_cache=cache),
+                   expected)
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_sric_interdependence(tmp_path):
+    g = weighted_graph(15, 50, 3)
+    cache = slric.GraphCache(str(tmp_path))
+    for _ in range(2):
+        assert_ranking(slric.sric(g, graph_cache=cache), slric.sric(g))
+        assert_ranking(slric.interdependence(g, group_size=3, graph_cache=cache),
+                       slric.interdependence(g, group_size=3))
+    assert cache.hits == 3 and cache.misses == 3  # SRIC graph, influence and dependence layers
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_key(tmp_path, seed):
+    g = weighted_graph(15, 50, seed)
+    cache = slric.GraphCache(str(tmp_path))
+    key = di.graph_key(GraphQW(g, 50, None, 3, None), 'LRIC', cache)[0]
+    assert di.graph_key(GraphQW(shuffled(g, seed), 50, None, 3, None), 'LRIC', cache)[0] == key
+    assert di.graph_key(CompactGraphQW(shuffled(g, seed), 50, None, 3, None), 'LRIC', cache)[0] == key
+    assert di.graph_key(GraphQW(g, 50, None, 3, None), 'SRIC', cache)[0] != key
+    assert di.graph_key(GraphQW(g, 40, None, 3, None), 'LRIC', cache)[0] != key
+    assert di.graph_key(GraphQW(g, 50, None, 4, None), 'LRIC', cache)[0] != key
+    h = g.copy()
+    u, v = list(h.edges())[0]
+    h[u][v]['weight'] += 1
+    assert di.graph_key(GraphQW(h, 50, None, 3, None), 'LRIC', cache)[0] != key
+
+
+def test_solver_key(tmp_path):
+    g = GraphQW(weighted_graph(15, 50, 0), 50, None, 3, None)
+    cache = slric.GraphCache(str(tmp_path))
+    native = di.graph_key(g, 'LRIC', cache, SubsetSumSolver())[0]
+    assert di.graph_key(g, 'LRIC', cache, GLPKSolver())[0] != native
+    assert di.graph_key(g, 'LRIC', cache, SubsetSumSolver(max_nodes=10))[0] == native
+    assert di.graph_key(g, 'SRIC', cache, SubsetSumSolver())[0] == di.graph_key(g, 'SRIC', cache, GLPKSolver())[0]
+    slric.lric(weighted_graph(15, 50, 0), graph_cache=cache, solver='native')
+    pytest.importorskip('cvxopt')
+    slric.lric(weighted_graph(15, 50, 0), graph_cache=cache, solver='glpk')
+    assert cache.hits == 0 and cache.misses == 2  # results of solvers are stored separately
+
+
+def test_eviction(tmp_path):
+    cache = slric.GraphCache(str(tmp_path))
+    edges = [np.arange(100), np.arange(100), np.ones(100)]
+    cache.put('a', *edges)
+    size = cache.size()
+    cache.maxsize = 2 * size
+    cache.put('b', *edges)
+    past = time.time() - 100
+    os.utime(cache.filename('a'), (past, past))
+    os.utime(cache.filename('b'), (past + 1, past + 1))
+    assert cache.get('a') is not None  # the access makes 'a' the most recently used file
+    cache.put('c', *edges)
+    assert cache.get('b') is None and cache.get('a') is not None and cache.get('c') is not None
+    assert cache.size() <= cache.maxsize
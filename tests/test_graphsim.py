@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+import SLRIC as slric
+from SLRIC.methods.writers import edge_writer
+from .graphs import weighted_graph
+
+
+# Snapshots of an evolving graph (edges are removed and added at each step)
+def snapshots(k=4, seed=0):
+    rng = np.random.default_rng(seed)
+    g = weighted_graph(12, 30, seed)
+    res = [g]
+    for _ in range(k - 1):
+        g = g.copy()
+        g.remove_edges_from([edge for edge in list(g.edges()) if rng.random() < 0.2])
+        for _ in range(6):
+            u, v = rng.choice(15, 2, replace=False).tolist()
+            g.add_edge(u, v, weight=int(rng.integers(1, 10)))
+        res.append(g)
+    return res
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+@pytest.mark.parametrize('seed', range(2))
+def test_matrix(workers, seed):
+    graphs = snapshots(seed=seed)
+    top, rank = slric.graphsim_batch(graphs, workers=workers, chunk_size=2)
+    assert np.all(np.diag(top) == 0) and np.all(np.diag(rank) == 0)
+    for i in range(len(graphs)):
+        for j in range(i + 1, len(graphs)):
+            assert (top[i, j], rank[i, j]) == pytest.approx(slric.graphsim(graphs[i], graphs[j]), abs=1e-12)
+            assert (top[j, i], rank[j, i]) == (top[i, j], rank[i, j])
+
+
+def test_consecutive():
+    graphs = snapshots(5, seed=3)
+    top, rank = slric.graphsim_batch(graphs, consecutive=True)
+    expected = [slric.graphsim(graphs[i], graphs[i + 1]) for i in range(len(graphs) - 1)]
+    assert top.tolist() == pytest.approx([d[0] for d in expected], abs=1e-12)
+    assert rank.tolist() == pytest.approx([d[1] for d in expected], abs=1e-12)
+
+
+def test_rankings_and_files(tmp_path):
+    graphs = snapshots(3, seed=4)
+    rankings = [slric.lric(g, group_size=3) for g in graphs]
+    top, rank = slric.graphsim_batch(graphs, rankings)
+    for i, j in [(0, 1), (0, 2), (1, 2)]:
+        expected = slric.graphsim(graphs[i], graphs[j], rankings[i], rankings[j])
+        assert (top[i, j], rank[i, j]) == pytest.approx(expected, abs=1e-12)
+    files = []
+    for i, g in enumerate(graphs):
+        files.append(str(tmp_path / ('snapshot%d.npz' % i)))
+        with edge_writer(files[-1], list(g.nodes())) as writer:
+            writer.write_edges(g.edges(data='weight'))
+    res = slric.graphsim_batch(files, lric_params={'group_size': 3})
+    expected = slric.graphsim_batch(graphs, lric_params={'group_size': 3})
+    assert np.allclose(res[0], expected[0], atol=1e-12) and np.allclose(res[1], expected[1], atol=1e-12)
@@ -0,0 +1,84 @@
+from bisect import bisect_left, bisect_right
+from itertools import combinations
+from math import isclose
+import numpy as np
+import pytest
+import SLRIC.methods.direct_influence as di
+import SLRIC.methods.netsim as ns
+from SLRIC.methods.solvers import get_solver
+from SLRIC.methods.sric import binary_search
+
+
+# LRIC influence by enumeration of groups: influence of a neighbor is w / (w + f), where f is the minimal weight of
+# other members (at most group_size - 1) with which the neighbor is pivotal
+def enumerated_lric(w, quota, group_size):
+    res = dict()
+    for i in range(len(w)):
+        if w[i] >= quota:
+            res[i] = 1
+            continue
+        best = None
+        others = [j for j in range(len(w)) if j != i and w[j] < quota]
+        for k in range(1, group_size):
+            for group in combinations(others, k):
+                f = sum(w[j] for j in group)
+                if (f >= quota - w[i] or isclose(f, quota - w[i])) and f < quota and not isclose(f, quota):
+                    best = f if best is None else min(best, f)
+        if best is not None:
+            res[i] = w[i] / (w[i] + best)
+    return res
+
+
+@pytest.mark.parametrize('solver', ['native', 'glpk'])
+@pytest.mark.parametrize('seed', range(150))
+def test_individual_lric(solver, seed):
+    if solver == 'glpk':
+        pytest.importorskip('cvxopt')
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 9))
+    w = rng.integers(1, 10, n).astype('d') if seed % 2 else rng.uniform(1, 10, n)  # ties and distinct weights
+    quota, group_size = float(rng.uniform(0.2, 0.9) * w.sum()), int(rng.integers(2, 5))
+    links = [(i, n, {'weight': float(v)}) for i, v in enumerate(w)]
+    res = di.individual_lric(links, quota, group_size, get_solver(solver))
+    expected = enumerated_lric(w.tolist(), quota, group_size)
+    assert set(res) == set(expected)
+    for node in expected:
+        assert res[node] == pytest.approx(expected[node], rel=1e-9)
+
+
+def test_hub():  # the group search does not recurse over neighbors (2000 neighbors exceed the recursion limit)
+    rng = np.random.default_rng(0)
+    weights = rng.integers(1, 10, 2000).tolist()
+    res = di.individual_lric([(i, -1, {'weight': float(v)}) for i, v in enumerate(weights)], 15, 3)
+    assert set(res) == set(range(len(weights)))
+    for w in set(weights):  # neighbors with the same weight have the same influence
+        values = [res[i] for i in range(len(weights)) if weights[i] == w]
+        assert max(values) == pytest.approx(min(values)) and 0 < values[0] <= 1
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_binary_searches(seed):
+    rng = np.random.default_rng(seed)
+    values = np.sort(rng.integers(-5, 6, int(rng.integers(1, 30)))).tolist()  # sorted values with duplicates
+    tuples = [(i, v) for i, v in enumerate(values)]
+    for left in range(len(values)):
+        for right in range(left, len(values)):
+            for weight in np.arange(-6, 7, 0.5).tolist():
+                pos = bisect_left(values, weight, left, right + 1)
+                assert binary_search(left, right, values, weight) == (pos if pos <= right else -1)
+                assert ns.search_high(left, right, tuples, weight) == bisect_right(values, weight, left, right + 1)
+                if pos > right:
+                    low = right
+                elif pos == 0 and weight < 0:
+                    low = -2
+                else:
+                    low = pos - 1
+                assert ns.search_low(left, right, tuples, weight) == low
+
+
+@pytest.mark.parametrize('run', [0, 1, 5, 20])
+def test_search_value(run):
+    d = dict((i, [7 if i < run else i + 100]) for i in range(20))  # the first 'run' keys have value 7
+    keys = list(range(20))
+    for left in range(20):
+        assert ns.search_value(left, 19, keys, d, 7) == max(left, run)  # position after the run of equal values
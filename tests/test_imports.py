@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+from importlib import import_module
+import pytest
+import SLRIC as slric
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+# Modules loaded by a statement in a new interpreter
+def loaded_modules(statement):
+    code = 'import sys; %s; import json; print(json.dumps(sorted(sys.modules)))' % statement
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return set(json.loads(out))
+
+
+def test_lazy_import():
+    modules = loaded_modules('import SLRIC')
+    assert not modules & {'numpy', 'networkx', 'cvxopt', 'scipy'}
+    assert not any(name.startswith('SLRIC.') for name in modules)
+
+
+def test_entry_point():
+    modules = loaded_modules('import SLRIC; SLRIC.lric')
+    assert {'numpy', 'networkx'} <= modules
+    assert 'cvxopt' not in modules and 'concurrent.futures.process' not in modules
+
+
+@pytest.mark.parametrize('name', sorted(slric._exports))
+def test_exports(name):
+    value = getattr(slric, name)
+    assert value is getattr(import_module(slric._exports[name], 'SLRIC'), name)
+    assert name in dir(slric)
+
+
+def test_missing_name():
+    with pytest.raises(AttributeError):
+        slric.missing_function
@@ -0,0 +1,35 @@
+import pytest
+import SLRIC as slric
+import SLRIC.methods.indirect_influence as ii
+from .graphs import weighted_graph, lric_graph, assert_edges, assert_ranking
+
+
+@pytest.mark.parametrize('aggregation', [0, 1])
+@pytest.mark.parametrize('criteria', [[2, 1], [1, 2], [0, 1, 2]])
+@pytest.mark.parametrize('seed', range(3))
+def test_compute_paths(aggregation, criteria, seed):
+    g = lric_graph(seed=seed)
+    res = ii.compute_paths([g] * len(criteria), [g] * len(criteria), aggregation, criteria)
+    for criterion, paths in zip(criteria, res):
+        assert_edges(paths, ii.compute_path(g, g, aggregation, criterion))
+
+
+@pytest.mark.parametrize('path_lim', [1, 2, 3, 4, 5])
+@pytest.mark.parametrize('backend', ['networkx', 'sparse'])
+def test_indirect_paths(path_lim, backend):
+    g = lric_graph(seed=path_lim)
+    res = ii.indirect_paths(g, path_lim, 0, [2, 1], backend)
+    for criterion, paths in zip([2, 1], res):
+        assert_edges(paths, ii.indirect_paths(g, path_lim, 0, criterion))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+@pytest.mark.parametrize('backend', ['networkx', 'sparse'])
+@pytest.mark.parametrize('seed', range(3))
+def test_lric(compact, backend, seed):
+    g = weighted_graph(20, 70, seed)
+    _, res = slric.lric(g, models=['max', 'maxmin'], backend=backend, compact=compact, data=True)
+    res = res.to_networkx() if compact else res
+    for model in ['max', 'maxmin']:
+        ranking = dict((node, res.nodes[node]['lric_' + model]) for node in res.nodes())
+        assert_ranking(ranking, slric.lric(g, models=model, backend=backend, compact=compact))
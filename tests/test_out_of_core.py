@@ -0,0 +1,71 @@
+import os
+import tempfile
+import networkx as nx
+import numpy as np
+import pytest
+import SLRIC as slric
+import SLRIC.methods.out_of_core as ooc
+from SLRIC.classes.DiskGraphQW import DiskGraphQW
+from SLRIC.methods.writers import edge_writer, EDGE_DTYPE
+from .graphs import weighted_graph, assert_ranking
+
+
+# Random graph with edges inserted in order of their ends and its edge list file (edges are read in the same order,
+# so neighbors of nodes have the same order in both graphs)
+def graph_file(tmp_path, format, seed=0, n=20, m=70):
+    g = weighted_graph(n, m, seed)
+    res = nx.DiGraph()
+    res.add_nodes_from(sorted(g))
+    res.add_edges_from(sorted(g.edges(data=True)))
+    filename = str(tmp_path / ('edges.' + format))
+    with edge_writer(filename, list(res.nodes()), mode='w') as writer:
+        writer.write_edges(res.edges(data='weight'))
+    if format in ['csv', 'csv.gz']:  # node names are read as strings
+        res = nx.relabel_nodes(res, dict((node, str(node)) for node in res))
+    return res, filename
+
+
+@pytest.mark.parametrize('format', ['npy', 'npz', 'csv', 'csv.gz'])
+@pytest.mark.parametrize('memory', [2 ** 10, 2 ** 28])
+def test_lric(tmp_path, format, memory):
+    g, filename = graph_file(tmp_path, format)
+    _, res = slric.lric_disk(filename, group_size=3, models=['max', 'maxmin'], memory=memory, data=True)
+    try:
+        for model in ['max', 'maxmin']:
+            ranking = dict((res.names[i], res.attr['lric_' + model][i]) for i in range(len(res.names)))
+            assert_ranking(ranking, slric.lric(g, group_size=3, models=model))
+    finally:
+        res.close()
+
+
+@pytest.mark.parametrize('memory', [2 ** 10, 2 ** 28])
+@pytest.mark.parametrize('seed', range(3))
+def test_sric(tmp_path, memory, seed):
+    g, filename = graph_file(tmp_path, 'npy', seed)
+    assert_ranking(slric.sric_disk(filename, memory=memory), slric.sric(g))
+    assert_ranking(slric.sric_disk(filename, dq=5, size=1, memory=memory), slric.sric(g, dq=5, size=1))
+
+
+@pytest.mark.parametrize('key', ['src', 'dst'])
+@pytest.mark.parametrize('max_buckets', [1, 2, 3])
+def test_sort_edges(tmp_path, key, max_buckets):
+    n, m = 30, 200
+    rng = np.random.default_rng(0)
+    rec = np.zeros(m, dtype=EDGE_DTYPE)
+    rec['src'], rec['dst'], rec['weight'] = rng.integers(0, n, m), rng.integers(0, n, m), rng.random(m)
+    res, partitions = ooc.sort_edges(rec, n, key, str(tmp_path), 'bounded', 2 ** 10, max_buckets)
+    expected, expected_partitions = ooc.sort_edges(rec, n, key, str(tmp_path), 'single', 2 ** 28)
+    assert len(partitions) > max_buckets and len(expected_partitions) == 1
+    assert np.array_equal(res.indptr, expected.indptr)
+    assert np.array_equal(res.indices, expected.indices) and np.array_equal(res.data, expected.data)
+    assert sorted(os.listdir(str(tmp_path))) == sorted('%s_%s.npy' % (name, column) for name in ['bounded', 'single']
+                                                       for column in ['indices', 'data'])  # buckets are removed
+
+
+def test_cleanup(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        DiskGraphQW(str(tmp_path / 'missing.npy'))
+    with pytest.raises(FileNotFoundError):
+        slric.lric_disk(str(tmp_path / 'missing.npz'))
+    assert os.listdir(str(tmp_path)) == []
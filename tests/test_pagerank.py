@@ -0,0 +1,19 @@
+import pytest
+import SLRIC as slric
+import SLRIC.methods.indirect_influence as ii
+from .graphs import weighted_graph, lric_graph, assert_ranking, edge_weights
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 256])
+def test_batched_pagerank(block_size):
+    g = lric_graph(25, 90, 6)
+    expected = edge_weights(ii.indirect_pagerank(g))
+    res = edge_weights(ii.indirect_pagerank(g, batched=True, tol=1e-10, block_size=block_size))
+    for edge in set(expected) | set(res):  # power iterations stop at different tolerances
+        assert abs(res.get(edge, 0) - expected.get(edge, 0)) <= 1e-5, edge
+
+
+def test_pagerank_model():
+    g = weighted_graph(25, 90, 7)
+    assert_ranking(slric.lric(g, group_size=3, models='pagerank', pagerank_block=8),
+                   slric.lric(g, group_size=3, models='pagerank'), tol=1e-5)
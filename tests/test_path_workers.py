@@ -0,0 +1,53 @@
+import networkx as nx
+import numpy as np
+import pytest
+import SLRIC as slric
+import SLRIC.methods.direct_influence as di
+import SLRIC.methods.indirect_influence as ii
+from SLRIC.methods.sparse_paths import Pruning
+from SLRIC.classes.GraphQW import GraphQW
+from .graphs import weighted_graph, lric_graph, assert_ranking
+
+
+# Check that two CSR arrays are equal (blocks are merged in order, so results are identical)
+def assert_csr(res, expected):
+    for a, b in zip(res, expected):
+        assert np.array_equal(np.asarray(a), np.asarray(b))
+
+
+@pytest.mark.parametrize('criterion', [2, 1, [2, 1]])
+@pytest.mark.parametrize('workers', [2, 3])
+def test_paths(criterion, workers):
+    g = lric_graph(60, 300, seed=1)
+    for path_lim in [2, 3, 4]:  # small blocks, so each composition step is split into several blocks
+        res = ii.indirect_paths(g, path_lim, 0, criterion, 'sparse', matrix=True, block_size=200, workers=workers)[0]
+        assert_csr(res, ii.indirect_paths(g, path_lim, 0, criterion, 'sparse', matrix=True, block_size=200)[0])
+
+
+@pytest.mark.parametrize('params', [{'min_weight': 0.05}, {'top_k': 3}, {'rtol': 0.3}])
+def test_pruning(params):
+    g = lric_graph(60, 300, seed=2)
+    pruning, expected_pruning = Pruning(**params), Pruning(**params)
+    res = ii.indirect_paths(g, 3, 0, 2, 'sparse', matrix=True, block_size=100, pruning=pruning, workers=2)[0]
+    expected = ii.indirect_paths(g, 3, 0, 2, 'sparse', matrix=True, block_size=100, pruning=expected_pruning)[0]
+    assert_csr(res, expected)
+    assert pruning.stats() == expected_pruning.stats() and pruning.dropped_edges > 0
+
+
+@pytest.mark.parametrize('path_lim', [2, 3])
+def test_bipath(path_lim):
+    g = weighted_graph(60, 300, 3)
+    inf_g, dep_g = [di.pairwise_inf(GraphQW(graph, 50, None, 3, None), 'LRIC') for graph in [g, nx.reverse(g)]]
+    res = ii.indirect_bipath_arrays(inf_g, dep_g, path_lim, block_size=100, workers=2)
+    expected = ii.indirect_bipath_arrays(inf_g, dep_g, path_lim, block_size=100)
+    assert list(res.edges(data='weight')) == list(expected.edges(data='weight'))
+
+
+def test_api():
+    g = weighted_graph(40, 160, 4)
+    assert_ranking(slric.lric(g, group_size=3, models=['max', 'maxmin'], backend='sparse', path_workers=2),
+                   slric.lric(g, group_size=3, models=['max', 'maxmin'], backend='sparse'), tol=0)
+    assert_ranking(slric.lric(g, group_size=3, compact=True, path_workers=2), slric.lric(g, group_size=3, compact=True),
+                   tol=0)
+    assert_ranking(slric.interdependence(g, group_size=3, backend='sparse', model=3, path_workers=2),
+                   slric.interdependence(g, group_size=3, backend='sparse', model=3), tol=0)
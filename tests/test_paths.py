@@ -0,0 +1,32 @@
+import pytest
+import SLRIC as slric
+import SLRIC.methods.indirect_influence as ii
+import SLRIC.methods.sparse_paths as sp
+from .graphs import weighted_graph, lric_graph, assert_ranking, assert_edges
+
+
+@pytest.mark.parametrize('aggregation', [0, 1])
+@pytest.mark.parametrize('criterion', [0, 1, 2])
+@pytest.mark.parametrize('block_size', [1, 50, 2 ** 22])
+def test_semiring_product(aggregation, criterion, block_size):
+    g = lric_graph(25, 90, 3)
+    m, nodes = sp.graph_to_csr(g)
+    res = sp.csr_to_graph(sp.semiring_product(m, m, aggregation, criterion, block_size), nodes, g)
+    assert_edges(res, ii.compute_path(g, g, aggregation, criterion))
+
+
+@pytest.mark.parametrize('path_lim', [1, 2, 3, 4, 5])
+@pytest.mark.parametrize('criterion', [1, 2])
+def test_indirect_paths(path_lim, criterion):
+    g = lric_graph(25, 90, 4)
+    expected = ii.indirect_paths(g, path_lim, 0, criterion)
+    assert_edges(ii.indirect_paths(g, path_lim, 0, criterion, 'sparse', block_size=64), expected)
+    m, nodes = ii.indirect_paths(g, path_lim, 0, criterion, matrix=True)
+    assert_edges(sp.csr_to_graph(m, nodes, g), expected)
+
+
+def test_sparse_backend():
+    g = weighted_graph(25, 90, 5)
+    for models in ['max', 'maxmin']:
+        assert_ranking(slric.lric(g, group_size=3, models=models, backend='sparse'),
+                       slric.lric(g, group_size=3, models=models))
@@ -0,0 +1,45 @@
+import tracemalloc
+import pytest
+import SLRIC as slric
+from SLRIC.methods.profiler import Profiler
+from .graphs import weighted_graph, assert_ranking
+
+
+@pytest.mark.parametrize('func, stages', [(slric.lric, ['graph', 'direct', 'paths_max', 'aggregate']),
+                                          (slric.sric, ['graph', 'direct', 'aggregate']),
+                                          (slric.interdependence, ['graph', 'direct', 'indirect', 'aggregate'])])
+def test_results(func, stages):
+    g = weighted_graph(20, 70, 6)
+    ranking, _, profiler = func(g, data=True, profiler=True)
+    assert_ranking(ranking, func(g))
+    report = profiler.report()
+    assert sorted(report['stages']) == sorted(stages)
+    assert all(record['calls'] >= 1 and record['time'] >= 0 for record in report['stages'].values())
+    assert report['counters']['targets'] >= sum(1 for node in g if g.in_degree(node) > 0)  # nodes with neighbors
+    assert not tracemalloc.is_tracing()
+
+
+def test_lric_counters():
+    g = weighted_graph(20, 70, 7)
+    profiler = Profiler(memory=False)
+    slric.lric(g, models=['max', 'maxmin'], limpath=3, profiler=profiler)
+    report = profiler.report()
+    assert report['counters']['ilp_solves'] > 0
+    assert len(report['counters']['path_edges_created']) == 2  # one value per composition step
+    assert all(record['peak_memory'] == 0 for record in report['stages'].values())
+
+
+def test_graphsim():
+    g1, g2 = weighted_graph(15, 50, 8), weighted_graph(15, 50, 9)
+    res = slric.graphsim(g1, g2, profiler=True)
+    assert res[:-1] == pytest.approx(slric.graphsim(g1, g2))
+    assert len(res[-1].report()['stages']) > 0
+
+
+def test_callback():
+    events = []
+    g = weighted_graph(20, 70, 10)
+    slric.lric(g, profiler=Profiler(callback=events.append))
+    assert [event['stage'] for event in events] == ['graph', 'direct', 'paths_max', 'aggregate']
+    assert all(event['peak_memory'] >= 0 for event in events)
+    assert events[-1]['counters']['targets'] == sum(1 for node in g if g.in_degree(node) > 0)
@@ -0,0 +1,54 @@
+import pytest
+import SLRIC as slric
+import SLRIC.methods.indirect_influence as ii
+from SLRIC.methods.sparse_paths import Pruning
+from .graphs import weighted_graph, lric_graph, edge_weights, assert_edges, assert_ranking
+
+
+@pytest.mark.parametrize('criterion', [0, 1, 2])
+@pytest.mark.parametrize('params', [{'min_weight': 1e-300}, {'top_k': 10 ** 6}, {'rtol': 1e-300}])
+def test_no_op(criterion, params):
+    g = lric_graph(seed=3)
+    pruning = Pruning(**params)
+    res = ii.indirect_paths(g, 3, 0, criterion, 'sparse', pruning=pruning)
+    assert_edges(res, ii.indirect_paths(g, 3, 0, criterion))
+    assert pruning.stats()['dropped_edges'] == 0 and pruning.stats()['dropped_mass'] == 0
+
+
+@pytest.mark.parametrize('params', [{'min_weight': 0.05}, {'top_k': 3}, {'rtol': 0.2}])
+@pytest.mark.parametrize('seed', range(3))
+def test_pruned_paths(params, seed):
+    g = lric_graph(seed=seed)
+    pruning = Pruning(**params)
+    paths = ii.indirect_paths(g, 3, 0, 2, 'sparse', pruning=pruning)
+    res = edge_weights(paths)
+    expected = edge_weights(ii.indirect_paths(g, 3, 0, 2))
+    assert set(res) <= set(expected)
+    for edge, w in res.items():  # paths are only dropped, so kept paths are not stronger than exact ones
+        assert w <= expected[edge] + 1e-12
+    if 'min_weight' in params:
+        assert min(res.values()) >= params['min_weight']
+    if 'top_k' in params:
+        sources = [edge[0] for edge in res]
+        assert max(sources.count(node) for node in set(sources)) >= params['top_k']
+    stats = pruning.stats(paths)
+    assert stats['dropped_edges'] > 0
+    assert 0 < stats['dropped_share'] < 1
+
+
+def test_lric_report():
+    g = weighted_graph(20, 70, 5)
+    report = dict()
+    res = slric.lric(g, models=['max', 'maxmin'], min_weight=1e-300, report=report)
+    assert_ranking(res, slric.lric(g, models=['max', 'maxmin']))
+    assert report['max']['dropped_edges'] == 0 and report['maxmin']['dropped_edges'] == 0
+
+
+def test_kept_mass():
+    g = lric_graph(seed=4)
+    pruning = Pruning(min_weight=0.05)
+    res = ii.indirect_paths(g, 3, 0, 2, 'sparse', pruning=pruning)
+    stats = pruning.stats(res)
+    kept = sum(res.nodes[v]['size'] * w for u, v, w in res.edges(data='weight') if u != v)
+    assert stats['kept_mass'] == pytest.approx(kept, rel=1e-9)
+    assert stats['dropped_share'] == pytest.approx(stats['dropped_mass'] / (stats['dropped_mass'] + kept), rel=1e-9)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+import SLRIC as slric
+import SLRIC.methods.netsim as ns
+from .graphs import weighted_graph
+
+
+# Random ranking of a random subset of keys (values are rounded, so rankings have ties)
+def random_ranking(rng, n, low=0.0, decimals=1):
+    keys = rng.choice(n, size=int(rng.integers(2, n + 1)), replace=False)
+    return dict(zip(keys.tolist(), np.round(rng.uniform(low, 1, len(keys)), decimals).tolist()))
+
+
+@pytest.mark.parametrize('eps', [0, 0.05, 0.5])
+@pytest.mark.parametrize('method', [0, 1])
+@pytest.mark.parametrize('seed', range(30))
+def test_random_rankings(eps, method, seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 30))
+    r1, r2 = random_ranking(rng, n), random_ranking(rng, n)
+    assert ns.rank_dist(r1, r2, eps, method, 'sorted') == pytest.approx(ns.rank_dist(r1, r2, eps, method, 'sets'),
+                                                                          abs=1e-12)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_negative_values(seed):
+    rng = np.random.default_rng(seed)
+    r1, r2 = random_ranking(rng, 20, -1), random_ranking(rng, 20, -1)
+    for method in [0, 1]:
+        assert ns.rank_dist(r1, r2, 0.1, method, 'sorted') == pytest.approx(ns.rank_dist(r1, r2, 0.1, method, 'sets'),
+                                                                            abs=1e-12)
+
+
+def test_lric_rankings():
+    r1, r2 = slric.lric(weighted_graph(30, 100, 1)), slric.lric(weighted_graph(30, 100, 2))
+    assert ns.rank_dist(r1, r2, 0.05, 1) == pytest.approx(ns.rank_dist(r1, r2, 0.05, 1, 'sets'), abs=1e-12)
+    assert ns.rank_dist(r1, r1, 0.05, 1) == 0
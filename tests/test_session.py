@@ -0,0 +1,45 @@
+import numpy as np
+import networkx as nx
+import pytest
+import SLRIC as slric
+from .graphs import weighted_graph, assert_ranking
+
+
+# Random sequence of edge additions, removals and weight updates applied to the session and to a copy of the graph
+def random_updates(session, g, rng, steps):
+    for _ in range(steps):
+        u, v = rng.choice(len(g), 2, replace=False).tolist()
+        op = rng.integers(3)
+        if op == 0:
+            w = int(rng.integers(1, 4))
+            session.add_edges([(u, v, w)])
+            g.add_edge(u, v, weight=w)
+        elif op == 1 and g.number_of_edges() > 0:
+            u, v = list(g.edges())[rng.integers(g.number_of_edges())]
+            session.remove_edges([(u, v)])
+            g.remove_edge(u, v)
+        elif g.number_of_edges() > 0:
+            u, v = list(g.edges())[rng.integers(g.number_of_edges())]
+            w = int(rng.integers(1, 4))
+            session.update_weights([(u, v, w)])
+            g[u][v]['weight'] = w
+        yield g
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_sric_updates(seed):
+    rng = np.random.default_rng(seed)
+    g = weighted_graph(4, 6, seed, high=3)  # small graphs often lose all influence
+    session = slric.InfluenceSession(g, 'SRIC', q=50)
+    for g in random_updates(session, nx.DiGraph(g), rng, 8):
+        assert_ranking(session.ranking(), slric.sric(g, q=50))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_lric_updates(seed):
+    rng = np.random.default_rng(seed)
+    g = weighted_graph(7, 12, seed, high=3)
+    session = slric.InfluenceSession(g, 'LRIC', q=50, models=['max', 'maxmin'])
+    for g in random_updates(session, nx.DiGraph(g), rng, 6):
+        for model in ['max', 'maxmin']:
+            assert_ranking(session.ranking(model), slric.lric(g, q=50, models=model))
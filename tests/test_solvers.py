@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+import SLRIC as slric
+from SLRIC.methods.solvers import SubsetSumSolver, GLPKSolver
+from .graphs import weighted_graph, assert_ranking
+
+pytest.importorskip('cvxopt')
+
+
+# Objective of the group search (group weight, or max_value if there is no group with weight <= max_value)
+def objective(solution, weights, max_value):
+    if solution is None:
+        return None
+    x = np.asarray(solution, dtype='d').ravel()
+    return float(np.dot(x[:-1], weights) + x[-1] * max_value)
+
+
+@pytest.mark.parametrize('max_nodes', [10 ** 6, 1])
+def test_subset_sum_solver(max_nodes):
+    rng = np.random.default_rng(8)
+    native, glpk = SubsetSumSolver(max_nodes=max_nodes), GLPKSolver()
+    for _ in range(300):
+        weights = rng.integers(1, 20, rng.integers(1, 12)).astype('d')
+        min_value = float(rng.integers(1, weights.sum() + 5))
+        max_value = min_value + float(rng.integers(0, 15))
+        group_size = int(rng.integers(1, len(weights) + 1))
+        res = objective(native(weights, min_value, max_value, group_size), weights, max_value)
+        expected = objective(glpk(weights, min_value, max_value, group_size), weights, max_value)
+        assert res == pytest.approx(expected), (weights, min_value, max_value, group_size)
+    assert native.calls == glpk.calls == 300
+    if max_nodes == 1:
+        assert native.stats()['fallback_calls'] > 0
+
+
+def test_native_solver_centrality():
+    g = weighted_graph(20, 70, 9)
+    assert_ranking(slric.lric(g, group_size=3, solver='native'), slric.lric(g, group_size=3, solver='glpk'))
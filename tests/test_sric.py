@@ -0,0 +1,22 @@
+import pytest
+import SLRIC as slric
+import SLRIC.methods.direct_influence as di
+from SLRIC.classes.GraphQW import GraphQW
+from .graphs import weighted_graph, assert_ranking, edge_weights
+
+
+@pytest.mark.parametrize('group_size', [2, 3, 4, 5])
+@pytest.mark.parametrize('seed', range(4))
+def test_count_engine(group_size, seed):
+    g = GraphQW(weighted_graph(12, 80, seed), 50, None, group_size, None)  # dense graph, large neighborhoods
+    res = edge_weights(di.pairwise_inf(g, 'SRIC', engine='count'))
+    expected = edge_weights(di.pairwise_inf(g, 'SRIC', engine='enumerate'))
+    assert set(res) == set(expected)
+    for edge in expected:
+        assert res[edge] == pytest.approx(expected[edge], rel=1e-9)
+
+
+def test_count_engine_centrality():
+    g = weighted_graph(15, 90, 11)
+    assert_ranking(slric.sric(g, engine='count'), slric.sric(g, engine='enumerate'))
+    assert_ranking(slric.sric(g, engine='auto'), slric.sric(g, engine='enumerate'))
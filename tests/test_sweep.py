@@ -0,0 +1,32 @@
+import pytest
+import SLRIC as slric
+from .graphs import weighted_graph, assert_ranking
+
+QS = [70, 30, 50, 40, 60, 45]  # quotas are evaluated in increasing order, rankings are returned in input order
+
+
+@pytest.mark.parametrize('skip', [True, False])
+@pytest.mark.parametrize('workers', [None, 2])
+@pytest.mark.parametrize('seed', range(3))
+def test_quotas(skip, workers, seed):
+    g = weighted_graph(20, 70, seed)
+    res = slric.lric_sweep(g, qs=QS, group_size=3, skip=skip, workers=workers)
+    assert len(res) == len(QS)
+    for q, ranking in zip(QS, res):
+        assert_ranking(ranking, slric.lric(g, q=q, group_size=3))
+
+
+def test_thresholds():
+    g = weighted_graph(20, 70, 3)
+    dqs = [3, 5, {0: 1, 1: 20}, 8]
+    for dq, ranking in zip(dqs, slric.lric_sweep(g, dqs=dqs, group_size=3)):
+        assert_ranking(ranking, slric.lric(g, dq=dq, group_size=3))
+
+
+def test_models():
+    g = weighted_graph(20, 70, 4)
+    models = ['max', 'maxmin', 'pagerank']
+    res = slric.lric_sweep(g, qs=QS, group_size=3, models=models, backend='sparse', cache=slric.InfluenceCache())
+    for q, rankings in zip(QS, res):
+        for model in models:
+            assert_ranking(rankings[model], slric.lric(g, q=q, group_size=3, models=model))
@@ -0,0 +1,41 @@
+import networkx as nx
+import pytest
+import SLRIC.methods.direct_influence as di
+import SLRIC.methods.netsim as ns
+from SLRIC.classes.GraphQW import GraphQW
+from SLRIC.classes.CompactGraphQW import CompactGraphQW
+from .graphs import weighted_graph
+
+
+# Direct influence graphs of two snapshots which share a part of nodes and edges
+def snapshots(seed, compact=False):
+    g1 = weighted_graph(20, 70, seed)
+    g2 = weighted_graph(20, 70, seed + 100)
+    g2 = nx.relabel_nodes(g2, dict((node, node + 5) for node in g2))  # nodes 0..4 and 20..24 appear once
+    g2.add_edges_from(list(g1.edges(data=True))[::2])  # shared edges with the same weights
+    graph_type = CompactGraphQW if compact else GraphQW
+    return [di.pairwise_inf(graph_type(g, 50, None, 3, None), 'LRIC') for g in [g1, g2]]
+
+
+@pytest.mark.parametrize('topology_type', [0, 1])
+@pytest.mark.parametrize('block_size', [1, 5, 2 ** 22])
+@pytest.mark.parametrize('seed', range(5))
+def test_engines(topology_type, block_size, seed):
+    g1, g2 = snapshots(seed)
+    res = ns.top_dist(g1, g2, topology_type=topology_type, block_size=block_size)
+    assert type(res) is float
+    assert res == pytest.approx(ns.top_dist(g1, g2, topology_type=topology_type, engine='neighbors'), rel=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_compact(seed):
+    g1, g2 = snapshots(seed, compact=True)
+    expected = ns.top_dist(*[g.to_networkx() for g in [g1, g2]], engine='neighbors')
+    assert ns.top_dist(g1, g2) == pytest.approx(expected, rel=1e-9)
+
+
+def test_undirected():
+    g1, g2 = weighted_graph(15, 40, 1, directed=False), weighted_graph(15, 40, 2, directed=False)
+    res = ns.top_dist(g1, g2)
+    assert type(res) is float and res == ns.top_dist(g1, g2, engine='neighbors')
+    assert ns.top_dist(g1, g1) == 0
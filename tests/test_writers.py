@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+import SLRIC as slric
+import SLRIC.methods.indirect_influence as ii
+from SLRIC.methods.writers import edge_writer, read_edges, read_graph
+from .graphs import weighted_graph, lric_graph, edge_weights
+
+
+@pytest.mark.parametrize('format', ['csv', 'csv.gz', 'npz', 'npy', 'parquet'])
+@pytest.mark.parametrize('chunk_size', [None, 7])
+def test_edgelist(tmp_path, format, chunk_size):
+    if format == 'parquet':
+        pytest.importorskip('pyarrow')
+    g = lric_graph()
+    filename = str(tmp_path / ('edges.' + format))
+    g.write_edgelist(filename, mode='w', chunk_size=chunk_size)
+    res = edge_weights(read_graph(filename))
+    expected = edge_weights(g)
+    if format in ['csv', 'csv.gz']:  # node names are read as strings
+        expected = dict(((str(u), str(v)), w) for (u, v), w in expected.items())
+    assert set(res) == set(expected)
+    for edge in expected:
+        assert res[edge] == pytest.approx(expected[edge], rel=1e-12)
+
+
+@pytest.mark.parametrize('format', ['npz', 'npy'])
+def test_path_writer(tmp_path, format):
+    g = lric_graph(seed=1)
+    filename = str(tmp_path / ('paths.' + format))
+    with edge_writer(filename, chunk_size=5) as writer:
+        ii.indirect_paths(g, 3, 0, 2, block_size=3, writer=writer)
+    src, dst, w, nodes = read_edges(filename)
+    res = dict(((nodes[i], nodes[j]), v) for i, j, v in zip(src.tolist(), dst.tolist(), w.tolist()))
+    expected = edge_weights(ii.indirect_paths(g, 3, 0, 2))
+    assert set(res) == set(expected)
+    for edge in expected:
+        assert res[edge] == pytest.approx(expected[edge], rel=1e-12)
+
+
+def test_centrality_columns(tmp_path):
+    ranking, g = slric.lric(weighted_graph(15, 50, 2), models=['max', 'maxmin'], data=True)
+    filename = str(tmp_path / 'centrality.npz')
+    g.write_centrality(filename)
+    with np.load(filename) as data:
+        nodes = data['node'].tolist()
+        for model in ['lric_max', 'lric_maxmin']:
+            assert data[model].tolist() == [g.nodes[node][model] for node in nodes]